@@ -0,0 +1,167 @@
+"""
+Background dispatcher for the slow side of an alert.
+
+The trade path (trading_signals push) runs inline in the caller; human channels
+(Telegram, Telethon) and the record jobs (alert metadata, JSONL logging) are
+queued here on two lanes, each with its own worker thread. The Telegram throttle
+and retry backoff are applied by the workers, so a sleeping Telegram send never
+holds up the records and never blocks the caller.
+"""
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from app.logger_utils import log_process
+
+
+HUMAN_LANE = "human"
+RECORD_LANE = "records"
+
+
+class _Job:
+    __slots__ = ("name", "fn", "attempts", "throttled")
+
+    def __init__(self, name: str, fn: Callable[[], Any], attempts: int, throttled: bool):
+        self.name = name
+        self.fn = fn
+        self.attempts = attempts
+        self.throttled = throttled
+
+
+class _Lane:
+    __slots__ = ("name", "queue", "thread")
+
+    def __init__(self, name: str, max_queue: int):
+        self.name = name
+        self.queue: "queue.Queue[Optional[_Job]]" = queue.Queue(maxsize=max_queue)
+        self.thread: Optional[threading.Thread] = None
+
+
+class AlertDispatcher:
+    """
+    Bounded FIFO lanes of alert side-effects, one daemon worker per lane.
+
+    Human-channel sends go on HUMAN_LANE (throttled jobs always do); metadata
+    and logging go on RECORD_LANE. A job returning False or raising is retried
+    with exponential backoff up to its attempt limit. submit() never blocks:
+    when a lane is full its oldest queued job is dropped and counted.
+    """
+
+    def __init__(self, max_queue: int = 1000, max_retries: int = 3, min_interval_sec: float = 0.0, run_async: bool = True):
+        self.max_retries = max(1, int(max_retries))
+        self.min_interval_sec = max(0.0, float(min_interval_sec or 0))
+        self.run_async = run_async
+        size = max(1, int(max_queue))
+        self._lanes = {HUMAN_LANE: _Lane(HUMAN_LANE, size), RECORD_LANE: _Lane(RECORD_LANE, size)}
+        self._lock = threading.Lock()
+        self._last_human_send = 0.0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def submit(self, name: str, fn: Callable[[], Any], attempts: Optional[int] = None,
+               throttled: bool = False, lane: Optional[str] = None) -> None:
+        """Queue a side-effect; `throttled` jobs respect the human-channel min interval"""
+        job = _Job(name, fn, attempts or self.max_retries, throttled)
+        if not self.run_async:
+            self._run(job)
+            return
+        target = self._lanes[HUMAN_LANE if throttled else (lane or RECORD_LANE)]
+        self._ensure_worker(target)
+        try:
+            target.queue.put_nowait(job)
+            return
+        except queue.Full:
+            pass
+        # Full lane: the freshest alert matters most, so evict the oldest job
+        try:
+            evicted = target.queue.get_nowait()
+            target.queue.task_done()
+        except queue.Empty:
+            evicted = None
+        try:
+            target.queue.put_nowait(job)
+        except queue.Full:
+            evicted = job
+        if evicted is None:
+            return
+        self.dropped += 1
+        try:
+            log_process({"type": "alert_dispatch_dropped", "lane": target.name, "job": evicted.name,
+                         "queued": target.queue.qsize(), "dropped_total": self.dropped})
+        except Exception:
+            pass
+
+    def pending(self) -> int:
+        return sum(lane.queue.qsize() for lane in self._lanes.values())
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Wait until queued jobs on every lane have run; returns False on timeout"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if all(lane.thread is None or lane.queue.unfinished_tasks == 0 for lane in self._lanes.values()):
+                return True
+            time.sleep(0.05)
+        return False
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Drain the lanes and stop their workers"""
+        self.flush(timeout)
+        for lane in self._lanes.values():
+            if lane.thread is None:
+                continue
+            try:
+                lane.queue.put_nowait(None)
+            except queue.Full:
+                pass
+            lane.thread.join(timeout=1.0)
+            lane.thread = None
+
+    def _ensure_worker(self, lane: _Lane) -> None:
+        with self._lock:
+            if lane.thread is None or not lane.thread.is_alive():
+                lane.thread = threading.Thread(target=self._worker, args=(lane,), name=f"alert-dispatch-{lane.name}", daemon=True)
+                lane.thread.start()
+
+    def _worker(self, lane: _Lane) -> None:
+        while True:
+            job = lane.queue.get()
+            try:
+                if job is None:
+                    return
+                self._run(job)
+            finally:
+                lane.queue.task_done()
+
+    def _wait_throttle(self) -> None:
+        if self.min_interval_sec <= 0:
+            return
+        with self._lock:
+            delta = time.time() - self._last_human_send
+            wait_s = self.min_interval_sec - delta if self._last_human_send > 0 else 0
+        if wait_s > 0:
+            time.sleep(wait_s)
+        with self._lock:
+            self._last_human_send = time.time()
+
+    def _run(self, job: _Job) -> bool:
+        if job.throttled:
+            self._wait_throttle()
+        error: Optional[str] = None
+        for attempt in range(job.attempts):
+            try:
+                if job.fn() is not False:
+                    self.completed += 1
+                    return True
+                error = "returned False"
+            except Exception as e:
+                error = str(e)
+            if attempt < job.attempts - 1:
+                time.sleep(min(2 ** attempt, 8))
+        self.failed += 1
+        try:
+            log_process({"type": "alert_error", "channel": job.name, "error": error, "attempts": job.attempts})
+        except Exception:
+            pass
+        return False
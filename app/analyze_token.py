@@ -3,6 +3,8 @@ import time
 import os
 import json
 import threading
+import math
+from collections import OrderedDict
 from typing import Dict, Tuple, List, Any, Optional
 from app.config_unified import (
     CIELO_API_KEY,
@@ -92,37 +94,29 @@ def get_dexscreener_metadata(token_address: str) -> Dict[str, Any]:
     }
     """
     try:
-        url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-        result = request_json("GET", url, timeout=5)
-        
-        if result.get("status_code") == 200:
-            data = result.get("json") or {}
-            pairs = data.get("pairs") or []
+        pairs = _dexscreener_pairs(token_address, timeout=5, max_retries=1)
+        best = _dexscreener_best_pair(pairs or [])
+        if best:
+            # Calculate token age
+            age_hours = None
+            pair_created_at = best.get("pairCreatedAt")
+            if pair_created_at:
+                try:
+                    age_ms = int(time.time() * 1000) - pair_created_at
+                    age_hours = age_ms / (1000 * 60 * 60)
+                except Exception:
+                    pass
+            
+            # Check if boosted
+            boosts = best.get("boosts") or []
+            is_boosted = len(boosts) > 0
             
-            if pairs:
-                best = _dexscreener_best_pair(pairs)
-                if best:
-                    # Calculate token age
-                    age_hours = None
-                    pair_created_at = best.get("pairCreatedAt")
-                    if pair_created_at:
-                        try:
-                            import time
-                            age_ms = int(time.time() * 1000) - pair_created_at
-                            age_hours = age_ms / (1000 * 60 * 60)
-                        except Exception:
-                            pass
-                    
-                    # Check if boosted
-                    boosts = best.get("boosts") or []
-                    is_boosted = len(boosts) > 0
-                    
-                    return {
-                        'age_hours': age_hours,
-                        'is_boosted': is_boosted,
-                        'boost_count': len(boosts),
-                        'pair_address': best.get("pairAddress")
-                    }
+            return {
+                'age_hours': age_hours,
+                'is_boosted': is_boosted,
+                'boost_count': len(boosts),
+                'pair_address': best.get("pairAddress")
+            }
     except Exception:
         pass
     
@@ -134,62 +128,22 @@ def get_dexscreener_metadata(token_address: str) -> Dict[str, Any]:
     }
 
 
-def _get_token_stats_dexscreener(token_address: str) -> Dict[str, Any]:
+def _dexscreener_pairs(token_address: str, timeout: Optional[float] = None, max_retries: int = 3) -> Optional[List[Dict[str, Any]]]:
+    """
+    Raw DexScreener pairs for a mint ([] when none are listed, None on request failure).
+    Goes through the shared batcher so concurrent lookups share one HTTP call.
+    """
+    from app.config_unified import DEXSCREENER_BATCH_ENABLED
+    if DEXSCREENER_BATCH_ENABLED:
+        from app.dexscreener_batch import get_batcher
+        return get_batcher().get_pairs(token_address, timeout=timeout, max_retries=max_retries)
     url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-    max_retries = 3
     for attempt in range(max_retries):
-        result = request_json("GET", url, timeout=HTTP_TIMEOUT_STATS)
+        result = request_json("GET", url, timeout=timeout or HTTP_TIMEOUT_STATS)
         status = result.get("status_code")
         if status == 200:
             data = result.get("json") or {}
-            try:
-                pairs = data.get("pairs") or []
-                best = _dexscreener_best_pair(pairs)
-                if not best:
-                    return {}
-                base = best.get("baseToken") or {}
-                price_change = best.get("priceChange") or {}
-                volume = best.get("volume") or {}
-                liquidity = best.get("liquidity") or {}
-                # Prefer marketCap; do NOT substitute FDV to avoid misclassification
-                mc_val = best.get("marketCap")
-                market_cap: Any = None
-                try:
-                    if mc_val is not None:
-                        market_cap = float(mc_val)
-                except Exception:
-                    market_cap = None
-                price_usd = best.get("priceUsd")
-                try:
-                    price_usd = float(price_usd) if price_usd is not None else 0.0
-                except Exception:
-                    price_usd = 0.0
-                stats: Dict[str, Any] = {
-                    "market_cap_usd": market_cap,
-                    "price_usd": price_usd,
-                    "liquidity_usd": (liquidity.get("usd") or 0),
-                    "name": base.get("name") or None,
-                    "symbol": base.get("symbol") or None,
-                    "volume": {
-                        "24h": {
-                            "volume_usd": volume.get("h24") or 0,
-                            "unique_buyers": 0,
-                            "unique_sellers": 0,
-                        }
-                    },
-                    "change": {
-                        "1h": (price_change.get("h1") or 0),
-                        "24h": (price_change.get("h24") or 0),
-                    },
-                    # Unknown from DexScreener; leave empty so we don't penalize
-                    "security": {},
-                    "liquidity": {},
-                    "holders": {},
-                }
-                stats["_source"] = "dexscreener"
-                return stats
-            except Exception:
-                return {}
+            return data.get("pairs") or []
         elif status == 429:
             time.sleep(2 ** attempt)
             continue
@@ -197,7 +151,76 @@ def _get_token_stats_dexscreener(token_address: str) -> Dict[str, Any]:
             if attempt < max_retries - 1:
                 time.sleep(1)
                 continue
-    return {}
+    return None
+
+
+def _dexscreener_stats_from_pairs(pairs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    try:
+        best = _dexscreener_best_pair(pairs)
+        if not best:
+            return {}
+        base = best.get("baseToken") or {}
+        price_change = best.get("priceChange") or {}
+        volume = best.get("volume") or {}
+        liquidity = best.get("liquidity") or {}
+        # Prefer marketCap; do NOT substitute FDV to avoid misclassification
+        mc_val = best.get("marketCap")
+        market_cap: Any = None
+        try:
+            if mc_val is not None:
+                market_cap = float(mc_val)
+        except Exception:
+            market_cap = None
+        price_usd = best.get("priceUsd")
+        try:
+            price_usd = float(price_usd) if price_usd is not None else 0.0
+        except Exception:
+            price_usd = 0.0
+        stats: Dict[str, Any] = {
+            "market_cap_usd": market_cap,
+            "price_usd": price_usd,
+            "liquidity_usd": (liquidity.get("usd") or 0),
+            "name": base.get("name") or None,
+            "symbol": base.get("symbol") or None,
+            "volume": {
+                "24h": {
+                    "volume_usd": volume.get("h24") or 0,
+                    "unique_buyers": 0,
+                    "unique_sellers": 0,
+                }
+            },
+            "change": {
+                "1h": (price_change.get("h1") or 0),
+                "24h": (price_change.get("h24") or 0),
+            },
+            # Unknown from DexScreener; leave empty so we don't penalize
+            "security": {},
+            "liquidity": {},
+            "holders": {},
+        }
+        stats["_source"] = "dexscreener"
+        return stats
+    except Exception:
+        return {}
+
+
+def _get_token_stats_dexscreener(token_address: str) -> Dict[str, Any]:
+    return _dexscreener_stats_with_reason(token_address)[0]
+
+
+def _dexscreener_stats_with_reason(token_address: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    DexScreener stats plus the negative-cache reason when nothing usable came back:
+    "no_pairs" (mint not listed yet), "parse_error" (pairs we could not read), or
+    None for transient request failures, which are not negatively cached.
+    """
+    pairs = _dexscreener_pairs(token_address)
+    if pairs is None:
+        return {}, None
+    if not pairs:
+        return {}, "no_pairs"
+    stats = _dexscreener_stats_from_pairs(pairs)
+    return stats, (None if stats else "parse_error")
 
 
 # OPTIMIZED: In-memory only deny cache (removed file I/O bottleneck)
@@ -241,9 +264,20 @@ def deny_get_remaining_sec() -> int:
         return max(0, int(denied_until - now))
 
 
-_stats_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+# Two-tier stats cache.
+# L1: in-process LRU (bounded, TTL-evicted). Entries keep the original fetch time
+#     so the stale grace window applies, plus an L1 expiry; with Redis the L1 TTL
+#     is short so updates from other processes are picked up quickly.
+# L2: Redis, shared by the bot and the trading system, stored in a compact
+#     binary encoding (msgpack when installed, zlib-compressed JSON otherwise).
+_stats_cache: "OrderedDict[str, Tuple[float, Dict[str, Any], float]]" = OrderedDict()  # mint -> (cached_at, data, l1_until)
 _stats_lock = threading.Lock()
 _STATS_TTL_SEC = int(os.getenv("STATS_TTL_SEC", os.getenv("CALLSBOT_STATS_TTL", "900")))  # default 15 minutes
+_STATS_CACHE_MAX = int(os.getenv("STATS_CACHE_MAX_ENTRIES", "5000"))
+_STATS_STALE_GRACE_SEC = int(os.getenv("STATS_STALE_GRACE_SEC", "120"))  # 0 disables stale-while-revalidate
+_STATS_L1_TTL_SEC = int(os.getenv("STATS_L1_TTL_SEC", "30"))  # L1 lifetime when backed by Redis
+_stats_cache_counts = {"hit": 0, "miss": 0, "stale": 0, "evicted": 0, "negative_hit": 0, "l1_hit": 0, "l2_hit": 0}
+_refreshing: set = set()
 
 _REDIS_URL = os.getenv("REDIS_URL") or os.getenv("CALLSBOT_REDIS_URL") or ""
 _redis_client = None
@@ -254,54 +288,311 @@ if _REDIS_URL:
     except Exception:
         _redis_client = None
 
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional batch scoring
+    np = None  # type: ignore
+
+try:
+    import msgpack  # type: ignore
+except Exception:  # pragma: no cover - optional codec
+    msgpack = None  # type: ignore
+
+_CODEC_MSGPACK = b"\x01"
+_CODEC_ZLIB_JSON = b"\x02"
+
+
+def _encode_stats(data: Dict[str, Any]) -> bytes:
+    """Compact L2 payload: 1-byte codec tag + body"""
+    if msgpack is not None:
+        try:
+            return _CODEC_MSGPACK + msgpack.packb(data, use_bin_type=True)
+        except Exception:
+            pass
+    import zlib
+    return _CODEC_ZLIB_JSON + zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def _decode_stats(raw: bytes) -> Dict[str, Any]:
+    tag, body = raw[:1], raw[1:]
+    if tag == _CODEC_MSGPACK and msgpack is not None:
+        return msgpack.unpackb(body, raw=False)
+    if tag == _CODEC_ZLIB_JSON:
+        import zlib
+        return json.loads(zlib.decompress(body).decode("utf-8"))
+    # Plain JSON written before the binary encoding
+    return json.loads(raw.decode("utf-8"))
+
+
+def _l1_put(token_address: str, cached_at: float, data: Dict[str, Any]) -> int:
+    """Insert into L1 and evict LRU/expired entries; returns how many were evicted"""
+    now = time.time()
+    l1_until = now + _STATS_L1_TTL_SEC if _redis_client is not None else cached_at + _STATS_TTL_SEC + _STATS_STALE_GRACE_SEC
+    evicted = 0
+    with _stats_lock:
+        _stats_cache[token_address] = (cached_at, data, l1_until)
+        _stats_cache.move_to_end(token_address)
+        # Expired entries sit at the old end once they stop being read
+        while _stats_cache:
+            oldest_key, (_, _, until) = next(iter(_stats_cache.items()))
+            if len(_stats_cache) <= _STATS_CACHE_MAX and now <= until:
+                break
+            _stats_cache.pop(oldest_key, None)
+            evicted += 1
+    return evicted
+
+
+def _cache_lookup(token_address: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Returns (data, is_stale). Fresh entries are within the TTL; stale ones are
+    past it but inside the grace window and should be refreshed by the caller.
+    L1 is consulted first; an L2 hit repopulates L1.
+    """
+    now = time.time()
+    with _stats_lock:
+        item = _stats_cache.get(token_address)
+        if item:
+            cached_at, data, l1_until = item
+            age = now - cached_at
+            if now <= l1_until and age <= _STATS_TTL_SEC + _STATS_STALE_GRACE_SEC:
+                _stats_cache.move_to_end(token_address)
+                _stats_cache_counts["l1_hit"] += 1
+                return data, age > _STATS_TTL_SEC
+            _stats_cache.pop(token_address, None)
+    if _redis_client is None:
+        return None, False
+    try:
+        raw = _redis_client.get(f"stats:{token_address}")
+        if not raw:
+            return None, False
+        data = _decode_stats(raw)
+        cached_at = float(data.pop("_cached_at", None) or now)
+    except Exception as e:
+        try:
+            log_process({"type": "stats_cache_redis_get_error", "error": str(e)})
+        except Exception:
+            pass
+        return None, False
+    _count_cache("l2_hit")
+    _count_cache("evicted", _l1_put(token_address, cached_at, data))
+    return data, (now - cached_at) > _STATS_TTL_SEC
+
 
 def _cache_get(token_address: str) -> Optional[Dict[str, Any]]:
-    import time as _t
-    key = f"stats:{token_address}"
-    # Prefer Redis when available
+    """Fresh cached stats only (stale entries count as a miss)"""
+    data, stale = _cache_lookup(token_address)
+    return None if stale else data
+
+
+def _cache_set(token_address: str, data: Dict[str, Any]) -> None:
+    """Write through both tiers"""
+    now = time.time()
     if _redis_client is not None:
         try:
-            raw = _redis_client.get(key)
-            if raw:
-                return json.loads(raw.decode("utf-8"))
+            payload = _encode_stats(dict(data, _cached_at=now))
+            _redis_client.setex(f"stats:{token_address}", _STATS_TTL_SEC + _STATS_STALE_GRACE_SEC, payload)
         except Exception as e:
             try:
-                log_process({"type": "stats_cache_redis_get_error", "error": str(e)})
+                log_process({"type": "stats_cache_redis_set_error", "error": str(e)})
             except Exception:
                 pass
-    # Fallback in-memory
+    _count_cache("evicted", _l1_put(token_address, now, data))
+    try:
+        from app.metrics import set_cache_size
+        set_cache_size("stats", len(_stats_cache))
+    except Exception:
+        pass
+
+
+def invalidate_token_stats(token_address: str) -> None:
+    """Drop a mint from both cache tiers (and the negative cache)"""
     with _stats_lock:
-        item = _stats_cache.get(token_address)
+        _stats_cache.pop(token_address, None)
+    if _redis_client is not None:
+        try:
+            _redis_client.delete(f"stats:{token_address}")
+        except Exception:
+            pass
+    _negative_clear(token_address)
+
+
+def get_cached_token_stats(token_address: str) -> Optional[Dict[str, Any]]:
+    """Cache-only read (L1, then shared L2); never triggers an upstream fetch"""
+    if not token_address:
+        return None
+    data, _ = _cache_lookup(token_address)
+    return data
+
+
+def _count_cache(kind: str, n: int = 1) -> None:
+    if n <= 0:
+        return
+    with _stats_lock:
+        _stats_cache_counts[kind] = _stats_cache_counts.get(kind, 0) + n
+
+
+def get_stats_cache_info() -> Dict[str, int]:
+    """Size and hit/miss/stale/evicted counts for the in-memory stats cache"""
+    with _stats_lock:
+        info = dict(_stats_cache_counts)
+        info["size"] = len(_stats_cache)
+        info["negative_size"] = len(_negative_cache)
+        info["max_entries"] = _STATS_CACHE_MAX
+    return info
+
+
+# Negative cache: mints that resolved to nothing are skipped for a short,
+# failure-specific TTL instead of being re-fetched on every feed appearance
+_NEGATIVE_TTL_SEC = {
+    "not_found": int(os.getenv("STATS_NEG_TTL_NOT_FOUND_SEC", "120")),
+    "no_pairs": int(os.getenv("STATS_NEG_TTL_NO_PAIRS_SEC", "60")),
+    "parse_error": int(os.getenv("STATS_NEG_TTL_PARSE_ERROR_SEC", "300")),
+}
+_negative_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()  # mint -> (expires_at, reason)
+
+
+def _negative_get(token_address: str) -> Optional[str]:
+    """Reason the mint is negatively cached, or None"""
+    if _redis_client is not None:
+        try:
+            raw = _redis_client.get(f"stats_neg:{token_address}")
+            if raw:
+                return raw.decode("utf-8") if isinstance(raw, bytes) else str(raw)
+        except Exception:
+            pass
+    with _stats_lock:
+        item = _negative_cache.get(token_address)
         if not item:
             return None
-        ts, data = item
-        if (_t.time() - ts) <= _STATS_TTL_SEC:
-            return data
-        try:
-            _stats_cache.pop(token_address, None)
-        except Exception as e:
-            try:
-                log_process({"type": "stats_cache_pop_error", "error": str(e)})
-            except Exception:
-                pass
+        expires_at, reason = item
+        if time.time() < expires_at:
+            return reason
+        _negative_cache.pop(token_address, None)
         return None
 
 
-def _cache_set(token_address: str, data: Dict[str, Any]) -> None:
-    import time as _t
-    key = f"stats:{token_address}"
-    payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+def _negative_set(token_address: str, reason: Optional[str]) -> None:
+    ttl = _NEGATIVE_TTL_SEC.get(reason or "", 0)
+    if ttl <= 0:
+        return
+    if _redis_client is not None:
+        try:
+            _redis_client.setex(f"stats_neg:{token_address}", ttl, reason)
+        except Exception:
+            pass
+    with _stats_lock:
+        _negative_cache[token_address] = (time.time() + ttl, reason)
+        _negative_cache.move_to_end(token_address)
+        while len(_negative_cache) > _STATS_CACHE_MAX:
+            _negative_cache.popitem(last=False)
+
+
+def _negative_clear(token_address: str) -> None:
     if _redis_client is not None:
         try:
-            _redis_client.setex(key, _STATS_TTL_SEC, payload)
+            _redis_client.delete(f"stats_neg:{token_address}")
+        except Exception:
+            pass
+    with _stats_lock:
+        _negative_cache.pop(token_address, None)
+
+
+def _refresh_stats_async(token_address: str) -> None:
+    """Revalidate a stale entry in the background (one refresh per mint at a time)"""
+    with _stats_lock:
+        if token_address in _refreshing:
             return
+        _refreshing.add(token_address)
+
+    def _run() -> None:
+        try:
+            get_token_stats(token_address, force_refresh=True)
         except Exception as e:
             try:
-                log_process({"type": "stats_cache_redis_set_error", "error": str(e)})
+                log_process({"type": "stats_refresh_error", "token": token_address, "error": str(e)})
             except Exception:
                 pass
-    with _stats_lock:
-        _stats_cache[token_address] = (_t.time(), data)
+        finally:
+            with _stats_lock:
+                _refreshing.discard(token_address)
+
+    threading.Thread(target=_run, name="stats-refresh", daemon=True).start()
+
+
+# Single-flight: concurrent misses for the same mint share one upstream fetch.
+# In-process callers wait on the leader's event; with Redis, other processes
+# wait on a short-lived lock and then read the leader's cached result.
+class _InFlight:
+    __slots__ = ("event", "result")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+
+
+_inflight: Dict[str, _InFlight] = {}
+_inflight_lock = threading.Lock()
+_SINGLEFLIGHT_WAIT_SEC = float(os.getenv("STATS_SINGLEFLIGHT_WAIT_SEC", "30"))
+_SINGLEFLIGHT_REDIS = (os.getenv("STATS_SINGLEFLIGHT_REDIS", "true").strip().lower() == "true")
+_singleflight_counts = {"leader": 0, "coalesced_local": 0, "coalesced_redis": 0}
+
+
+def get_singleflight_stats() -> Dict[str, int]:
+    """Counts of upstream fetches vs. calls that were coalesced onto one"""
+    with _inflight_lock:
+        return dict(_singleflight_counts)
+
+
+def _count_singleflight(kind: str) -> None:
+    with _inflight_lock:
+        _singleflight_counts[kind] = _singleflight_counts.get(kind, 0) + 1
+    if kind != "leader":
+        try:
+            from app.metrics import inc_stats_coalesced
+            inc_stats_coalesced(kind.replace("coalesced_", ""))
+        except Exception:
+            pass
+
+
+def _redis_wait_for_peer(token_address: str) -> Tuple[bool, Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Try to take the cross-process fetch lock for a mint.
+    Returns (acquired, lock_value, peer_result). When another process holds the
+    lock, waits for it to publish into the stats cache and returns that result.
+    """
+    if _redis_client is None or not _SINGLEFLIGHT_REDIS:
+        return True, None, None
+    key = f"stats_lock:{token_address}"
+    value = f"{os.getpid()}:{threading.get_ident()}:{time.time()}"
+    try:
+        if _redis_client.set(key, value, nx=True, px=int(_SINGLEFLIGHT_WAIT_SEC * 1000)):
+            return True, value, None
+    except Exception:
+        return True, None, None
+    deadline = time.time() + _SINGLEFLIGHT_WAIT_SEC
+    while time.time() < deadline:
+        time.sleep(0.1)
+        cached = _cache_get(token_address)
+        if cached:
+            return False, None, cached
+        try:
+            if not _redis_client.exists(key):
+                break
+        except Exception:
+            break
+    return False, None, None
+
+
+def _redis_release(token_address: str, value: Optional[str]) -> None:
+    if value is None or _redis_client is None:
+        return
+    key = f"stats_lock:{token_address}"
+    try:
+        current = _redis_client.get(key)
+        if current is not None and (current.decode("utf-8") if isinstance(current, bytes) else current) == value:
+            _redis_client.delete(key)
+    except Exception:
+        pass
 
 
 def get_token_stats(token_address: str, force_refresh: bool = False) -> Dict[str, Any]:
@@ -309,42 +600,84 @@ def get_token_stats(token_address: str, force_refresh: bool = False) -> Dict[str
     if not token_address:
         return {}
     
-    # Check cache
-    cached = _cache_get(token_address) if not force_refresh else None
+    # Check cache (stale entries inside the grace window are served and refreshed in the background)
+    cached, stale = _cache_lookup(token_address) if not force_refresh else (None, False)
     if cached:
+        _count_cache("stale" if stale else "hit")
         try:
             from app.metrics import cache_hit
-            cache_hit()
+            cache_hit("stats_stale" if stale else "stats")
         except Exception:
             pass
+        if stale:
+            _refresh_stats_async(token_address)
         return cached
     
+    # Recently unresolvable mints are skipped until their negative entry expires
+    negative = _negative_get(token_address) if not force_refresh else None
+    if negative:
+        _count_cache("negative_hit")
+        try:
+            from app.metrics import cache_hit
+            cache_hit(f"stats_negative_{negative}")
+        except Exception:
+            pass
+        return {}
+    
+    _count_cache("miss")
     try:
         from app.metrics import cache_miss
         cache_miss()
     except Exception:
         pass
     
+    # Join an in-flight fetch for this mint instead of spending another call
+    with _inflight_lock:
+        flight = _inflight.get(token_address)
+        leader = flight is None
+        if leader:
+            flight = _InFlight()
+            _inflight[token_address] = flight
+    if not leader:
+        if flight.event.wait(_SINGLEFLIGHT_WAIT_SEC) and flight.result is not None:
+            _count_singleflight("coalesced_local")
+            return dict(flight.result)
+        return _fetch_token_stats(token_address)
+    
+    result: Dict[str, Any] = {}
+    try:
+        acquired, lock_value, peer = _redis_wait_for_peer(token_address)
+        if peer is not None:
+            _count_singleflight("coalesced_redis")
+            result = peer
+        else:
+            _count_singleflight("leader")
+            try:
+                result = _fetch_token_stats(token_address)
+            finally:
+                if acquired:
+                    _redis_release(token_address, lock_value)
+        return result
+    finally:
+        flight.result = result
+        with _inflight_lock:
+            _inflight.pop(token_address, None)
+        flight.event.set()
+
+
+def _fetch_token_stats(token_address: str) -> Dict[str, Any]:
+    """Uncached stats fetch: Cielo (budget permitting) with DexScreener fallback"""
     # Budget check
     try:
         b = get_budget()
         if b and not b.can_spend("stats"):
-            ds = _get_token_stats_dexscreener(token_address)
-            stats = _normalize_stats_schema(ds) if ds else {}
-            # CRITICAL FIX: Inject token_address so TokenStats.from_api_response() can parse it
-            if stats and not stats.get("token_address"):
-                stats["token_address"] = token_address
-            return stats
+            return _fallback_stats_dexscreener(token_address, normalize_empty=False)
     except Exception:
         pass
 
     # Skip Cielo if disabled or denied
     if CIELO_DISABLE_STATS or deny_is_denied() or not CIELO_API_KEY:
-        stats = _normalize_stats_schema(_get_token_stats_dexscreener(token_address) or {})
-        # CRITICAL FIX: Inject token_address so TokenStats.from_api_response() can parse it
-        if stats and not stats.get("token_address"):
-            stats["token_address"] = token_address
-        return stats
+        return _fallback_stats_dexscreener(token_address)
 
     # OPTIMIZED: Single URL and header (removed combinatorial explosion)
     url = "https://feed-api.cielo.finance/api/v1/token/stats"
@@ -353,6 +686,7 @@ def get_token_stats(token_address: str, force_refresh: bool = False) -> Dict[str
     
     # Try Cielo API with simple retry
     max_retries = 2
+    cielo_failure: Optional[str] = None
     for attempt in range(max_retries):
         result = request_json("GET", url, params=params, headers=headers, timeout=HTTP_TIMEOUT_STATS)
         status = result.get("status_code")
@@ -383,7 +717,9 @@ def get_token_stats(token_address: str, force_refresh: bool = False) -> Dict[str
                     data["token_address"] = token_address
                 
                 _cache_set(token_address, data)
+                _negative_clear(token_address)
                 return data
+            cielo_failure = "parse_error"
             break
             
         elif status == 429:
@@ -398,6 +734,7 @@ def get_token_stats(token_address: str, force_refresh: bool = False) -> Dict[str
             break
             
         elif status == 404:
+            _negative_set(token_address, "not_found")
             return {}
             
         elif attempt < max_retries - 1:
@@ -407,7 +744,20 @@ def get_token_stats(token_address: str, force_refresh: bool = False) -> Dict[str
             break
     
     # Fallback to DexScreener
-    stats = _normalize_stats_schema(_get_token_stats_dexscreener(token_address) or {})
+    return _fallback_stats_dexscreener(token_address, cielo_failure)
+
+
+def _fallback_stats_dexscreener(token_address: str, cielo_failure: Optional[str] = None, normalize_empty: bool = True) -> Dict[str, Any]:
+    """DexScreener stats in the normalized schema; definite misses are negatively cached and return {}"""
+    ds, reason = _dexscreener_stats_with_reason(token_address)
+    if not ds:
+        reason = reason or cielo_failure
+        if reason:
+            _negative_set(token_address, reason)
+            return {}
+        if not normalize_empty:
+            return {}
+    stats = _normalize_stats_schema(ds or {})
     # CRITICAL FIX: Inject token_address so TokenStats.from_api_response() can parse it
     if stats and not stats.get("token_address"):
         stats["token_address"] = token_address
@@ -476,6 +826,30 @@ def _normalize_stats_schema(d: Dict[str, Any]) -> Dict[str, Any]:
     return out
 
 
+# Preliminary score tiers shared by the scalar and batch paths: (usd threshold, points)
+# MICRO-CAP MODE: Lower thresholds (was 50k/10k/1k, now 10k/2k/200)
+_PRELIM_USD_TIERS = ((10000.0, 3), (2000.0, 2), (200.0, 1))
+_PRELIM_SYNTHETIC_FACTOR = 1.5  # Synthetic fallback items need 1.5x the USD value
+
+
+def _prelim_usd_value(tx_data: Dict[str, Any]) -> Any:
+    # FIX: Support both usd_value (Cielo) and token1_amount_usd (fallback feeds)
+    return tx_data.get('usd_value') or tx_data.get('token1_amount_usd', 0) or 0
+
+
+def _prelim_is_synthetic(tx_data: Dict[str, Any]) -> bool:
+    return bool(tx_data.get('is_synthetic')) or str(tx_data.get('tx_type') or '').endswith('_fallback')
+
+
+def _prelim_float(value: Any) -> float:
+    if not isinstance(value, (int, float)):
+        return math.nan
+    try:
+        return float(value)
+    except OverflowError:
+        return math.nan
+
+
 def calculate_preliminary_score(tx_data: Dict[str, Any], smart_money_detected: bool = False) -> int:
     """
     CREDIT-EFFICIENT: Calculate preliminary score from feed data without API calls
@@ -490,22 +864,13 @@ def calculate_preliminary_score(tx_data: Dict[str, Any], smart_money_detected: b
     #     score += 3  # Baseline bonus
 
     # USD value indicates serious activity; downweight synthetic fallback items
-    # OPTIMIZED: Lowered thresholds for micro-cap focus
-    # FIX: Support both usd_value (Cielo) and token1_amount_usd (fallback feeds)
-    usd_value = tx_data.get('usd_value') or tx_data.get('token1_amount_usd', 0) or 0
-    is_synthetic = bool(tx_data.get('is_synthetic')) or str(tx_data.get('tx_type') or '').endswith('_fallback')
+    usd_value = _prelim_usd_value(tx_data)
+    factor = _PRELIM_SYNTHETIC_FACTOR if _prelim_is_synthetic(tx_data) else 1.0
     
-    # MICRO-CAP MODE: Lower thresholds (was 50k/10k/1k, now 10k/2k/200)
-    high = 10000.0 * (1.5 if is_synthetic else 1.0)
-    mid = 2000.0 * (1.5 if is_synthetic else 1.0)
-    low = 200.0 * (1.5 if is_synthetic else 1.0)
-    
-    if usd_value > high:
-        score += 3
-    elif usd_value > mid:
-        score += 2
-    elif usd_value > low:
-        score += 1
+    for threshold, points in _PRELIM_USD_TIERS:
+        if usd_value > threshold * factor:
+            score += points
+            break
     # Even tiny transactions get base score of 1 (from initialization)
 
     # Transaction frequency/urgency
@@ -515,6 +880,34 @@ def calculate_preliminary_score(tx_data: Dict[str, Any], smart_money_detected: b
     return min(score, 10)
 
 
+def calculate_preliminary_scores_batch(items: List[Dict[str, Any]], smart_money_flags: Optional[List[bool]] = None) -> List[int]:
+    """
+    Preliminary scores for a whole feed page in one vectorized pass.
+    
+    Returns exactly what calculate_preliminary_score would for each item.
+    smart_money_flags is accepted for signature parity; like the scalar path it
+    does not affect the score. Items whose USD value is not a plain int/float
+    go through the scalar function (so they behave, and fail, identically), and
+    without NumPy the whole page is scored item by item.
+    """
+    if not items:
+        return []
+    if np is None:
+        return [calculate_preliminary_score(tx) for tx in items]
+    
+    n = len(items)
+    # NaN marks values the vector path cannot represent; those items are rescored below
+    usd = np.fromiter((_prelim_float(_prelim_usd_value(tx)) for tx in items), dtype=np.float64, count=n)
+    synthetic = np.fromiter((_prelim_is_synthetic(tx) for tx in items), dtype=bool, count=n)
+    factor = np.where(synthetic, _PRELIM_SYNTHETIC_FACTOR, 1.0)
+    conditions = [usd > threshold * factor for threshold, _ in _PRELIM_USD_TIERS]
+    points = [p for _, p in _PRELIM_USD_TIERS]
+    scores = np.minimum(1 + np.select(conditions, points, default=0), 10).tolist()
+    for i in np.flatnonzero(np.isnan(usd)).tolist():
+        scores[i] = calculate_preliminary_score(items[i])
+    return [int(x) for x in scores]
+
+
 def score_token(stats: Dict[str, Any], smart_money_detected: bool = False, token_address: Optional[str] = None) -> Tuple[int, List[str]]:
     """
     Compute a raw score based on token metrics only. This function no longer
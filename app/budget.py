@@ -1,5 +1,6 @@
 import json
 import os
+import threading
 import time
 from typing import Dict, Optional
 from app.file_lock import file_lock
@@ -24,6 +25,9 @@ class BudgetManager:
         self.feed_cost = max(0, int(feed_cost or 0))
         self.stats_cost = max(0, int(stats_cost or 0))
         self.hard_block = bool(hard_block)
+        # Serializes in-process callers (e.g. detail-analysis workers); the file
+        # lock is non-blocking and would otherwise fail under thread contention
+        self._lock = threading.RLock()
         self._state: Dict[str, int] = {
             "minute_epoch": 0,
             "minute_count": 0,
@@ -99,7 +103,7 @@ class BudgetManager:
     # ---------- API ----------
     def remaining_minute(self) -> int:
         # Reload under lock to reflect external updates
-        with file_lock(self.storage_path):
+        with self._lock, file_lock(self.storage_path):
             self._load_unlocked()
             self._roll_windows()
         if self.per_minute_max <= 0:
@@ -107,7 +111,7 @@ class BudgetManager:
         return max(0, self.per_minute_max - self._state["minute_count"])
 
     def remaining_day(self) -> int:
-        with file_lock(self.storage_path):
+        with self._lock, file_lock(self.storage_path):
             self._load_unlocked()
             self._roll_windows()
         if self.per_day_max <= 0:
@@ -123,7 +127,7 @@ class BudgetManager:
 
     def can_spend(self, kind: str = "stats", cost: Optional[int] = None) -> bool:
         c = int(cost if cost is not None else self._cost_for_kind(kind))
-        with file_lock(self.storage_path):
+        with self._lock, file_lock(self.storage_path):
             self._load_unlocked()
             self._roll_windows()
             min_left = self.per_minute_max if self.per_minute_max <= 0 else max(
@@ -135,7 +139,7 @@ class BudgetManager:
     def spend(self, kind: str = "stats", cost: Optional[int] = None) -> bool:
         """Atomically check and spend credits. Returns True if spent."""
         c = int(cost if cost is not None else self._cost_for_kind(kind))
-        with file_lock(self.storage_path):
+        with self._lock, file_lock(self.storage_path):
             self._load_unlocked()
             self._roll_windows()
             min_left = self.per_minute_max if self.per_minute_max <= 0 else max(
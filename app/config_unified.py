@@ -74,6 +74,7 @@ _allow_hosts_env = os.getenv("CALLSBOT_HTTP_ALLOW_HOSTS", ",".join([
     "api.geckoterminal.com",
     "quote-api.jup.ag",
     "token.jup.ag",
+    "tokens.jup.ag",
     "price.jup.ag",
     "api.telegram.org",
     "api.mainnet-beta.solana.com",
@@ -90,6 +91,10 @@ HTTP_TIMEOUT_STATS = _get_int("HTTP_TIMEOUT_STATS", 20)
 HTTP_TIMEOUT_TELEGRAM = _get_int("HTTP_TIMEOUT_TELEGRAM", 10)
 HTTP_MAX_RETRIES = _get_int("HTTP_MAX_RETRIES", 3)
 HTTP_BACKOFF_FACTOR = _get_float("HTTP_BACKOFF_FACTOR", 0.5)
+# DexScreener lookups are coalesced into comma-separated batches (max 30 mints per call)
+DEXSCREENER_BATCH_ENABLED = _get_bool("DEXSCREENER_BATCH_ENABLED", True)
+DEXSCREENER_BATCH_WINDOW_MS = _get_float("DEXSCREENER_BATCH_WINDOW_MS", 25.0)  # Collection window per batch
+DEXSCREENER_BATCH_MAX = _get_int("DEXSCREENER_BATCH_MAX", 30)
 
 
 # ============================================================================
@@ -160,6 +165,14 @@ SOLANA_WALLET_SECRET = _load_secret("SOLANA_WALLET_SECRET", min_len=20)
 
 # Redis (Optional - for signal passing)
 REDIS_URL = os.getenv("REDIS_URL", "").strip()
+# Signal transport: "list" (LPUSH/BRPOP, at-most-once), "stream" (XADD/XREADGROUP/XACK)
+# or "both" (publish to both while consumers migrate; traders read the stream)
+SIGNAL_TRANSPORT = os.getenv("SIGNAL_TRANSPORT", "list").strip().lower()
+SIGNAL_STREAM_KEY = os.getenv("SIGNAL_STREAM_KEY", "trading_signals_stream").strip()
+SIGNAL_STREAM_MAXLEN = _get_int("SIGNAL_STREAM_MAXLEN", 10000)
+SIGNAL_STREAM_GROUP = os.getenv("SIGNAL_STREAM_GROUP", "trader").strip()
+SIGNAL_STREAM_CONSUMER = os.getenv("SIGNAL_STREAM_CONSUMER", "").strip()
+SIGNAL_STREAM_CLAIM_IDLE_MS = _get_int("SIGNAL_STREAM_CLAIM_IDLE_MS", 60000)
 
 
 # ============================================================================
@@ -177,6 +190,15 @@ FETCH_INTERVAL = _get_int("FETCH_INTERVAL", 30)  # MICRO-CAP MODE: 30s for fast
 SMART_FEED_SCOPE = os.getenv("SMART_FEED_SCOPE", "trending").strip().lower()
 GENERAL_FEED_SCOPE = os.getenv("GENERAL_FEED_SCOPE", "moonshot").strip().lower()
 MIN_USD_VALUE = _get_int("MIN_USD_VALUE", 200)  # Minimum USD value for feed filtering
+# Concurrent detailed analysis per feed page (1 = sequential, original behaviour)
+FEED_DETAIL_MAX_WORKERS = _get_int("FEED_DETAIL_MAX_WORKERS", 1)
+FEED_PAGE_DEADLINE_SEC = _get_float("FEED_PAGE_DEADLINE_SEC", 25.0)  # Stats-fetch budget per page (0 = no deadline)
+FEED_PREFETCH_DEPTH = _get_int("FEED_PREFETCH_DEPTH", 0)  # Pages fetched ahead of processing (0 = sequential fetch)
+# Cross-cycle feed dedup (rotating Bloom filters; memory fixed by capacity)
+FEED_DEDUP_ENABLED = _get_bool("FEED_DEDUP_ENABLED", True)
+FEED_DEDUP_WINDOW_SEC = _get_int("FEED_DEDUP_WINDOW_SEC", 900)
+FEED_DEDUP_CAPACITY = _get_int("FEED_DEDUP_CAPACITY", 50000)  # Keys per filter before early rotation
+GATE_TRACE_ENABLED = _get_bool("GATE_TRACE_ENABLED", True)  # Per-gate latency/rejection tracing
 
 # Dry run mode
 DRY_RUN = _get_bool("DRY_RUN", False)
@@ -265,6 +287,23 @@ STORAGE_RETENTION_DAYS = _get_int("STORAGE_RETENTION_DAYS", 30)
 DB_FILE = os.getenv("DB_FILE", os.getenv("CALLSBOT_DB_FILE", "var/alerted_tokens.db"))
 DB_RETENTION_HOURS = _get_int("DB_RETENTION_HOURS", 720)  # 30 days
 
+# Signals DB journal: "auto" = WAL unless the volume is a network/host-shared mount
+# (then DELETE), "wal" forces WAL, "delete" keeps the rollback journal.
+SIGNALS_DB_JOURNAL_MODE = os.getenv("SIGNALS_DB_JOURNAL_MODE", "auto")
+SIGNALS_DB_WAL_AUTOCHECKPOINT = _get_int("SIGNALS_DB_WAL_AUTOCHECKPOINT", 1000)  # pages; 0 = background only
+SIGNALS_DB_CHECKPOINT_SEC = _get_float("SIGNALS_DB_CHECKPOINT_SEC", 60.0)
+SIGNALS_DB_WAL_MAX_MB = _get_int("SIGNALS_DB_WAL_MAX_MB", 64)
+
+# Write-behind for append-only inserts (token_activity, snapshots): one writer
+# thread group-commits every STORAGE_WRITE_BATCH_ROWS rows or STORAGE_WRITE_BATCH_MS ms.
+# Queued rows are spooled to STORAGE_WRITE_SPOOL.<pid> (one file per process) and
+# replayed by the next process to start if the owner dies.
+STORAGE_WRITE_BEHIND = _get_bool("STORAGE_WRITE_BEHIND", False)
+STORAGE_WRITE_BATCH_ROWS = _get_int("STORAGE_WRITE_BATCH_ROWS", 200)
+STORAGE_WRITE_BATCH_MS = _get_int("STORAGE_WRITE_BATCH_MS", 250)
+STORAGE_WRITE_QUEUE_MAX = _get_int("STORAGE_WRITE_QUEUE_MAX", 10000)
+STORAGE_WRITE_SPOOL = os.getenv("STORAGE_WRITE_SPOOL", "var/storage_writes.spool")
+
 # Budget tracking file
 CALLSBOT_BUDGET_FILE = os.getenv("CALLSBOT_BUDGET_FILE", "var/budget.json")
 
@@ -284,6 +323,16 @@ BUDGET_HARD_BLOCK = _get_bool("BUDGET_HARD_BLOCK", False)
 USE_CIELO_STATS = _get_bool("USE_CIELO_STATS", True)
 TELEGRAM_THROTTLE_ENABLED = _get_bool("TELEGRAM_THROTTLE_ENABLED", True)
 TELEGRAM_ALERT_MIN_INTERVAL = _get_int("TELEGRAM_ALERT_MIN_INTERVAL", 0)
+# Alert side-effects (Telegram/Telethon/metadata/logs) run after the trader push on a background queue
+ALERT_DISPATCH_ASYNC = _get_bool("ALERT_DISPATCH_ASYNC", True)
+ALERT_DISPATCH_QUEUE_MAX = _get_int("ALERT_DISPATCH_QUEUE_MAX", 1000)
+ALERT_DISPATCH_MAX_RETRIES = _get_int("ALERT_DISPATCH_MAX_RETRIES", 3)
+# Telegram sender service (keep-alive session, queue, per-chat pacing, burst merging)
+TELEGRAM_SENDER_ASYNC = _get_bool("TELEGRAM_SENDER_ASYNC", True)
+TELEGRAM_SENDER_QUEUE_MAX = _get_int("TELEGRAM_SENDER_QUEUE_MAX", 500)
+TELEGRAM_CHAT_INTERVAL_SEC = _get_float("TELEGRAM_CHAT_INTERVAL_SEC", 1.0)
+TELEGRAM_MERGE_THRESHOLD = _get_int("TELEGRAM_MERGE_THRESHOLD", 5)
+TELEGRAM_MERGE_MAX = _get_int("TELEGRAM_MERGE_MAX", 10)
 
 # ML Enhancement
 ML_ENHANCEMENT_ENABLED = _get_bool("ML_ENHANCEMENT_ENABLED", False)
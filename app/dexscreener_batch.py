@@ -0,0 +1,157 @@
+"""
+Batched DexScreener pair resolver.
+
+The /latest/dex/tokens endpoint accepts up to 30 comma-separated mints. Lookups
+from concurrent callers are collected for a short window and resolved with one
+request per batch; each caller gets back the raw pairs for its own mint.
+"""
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from app.http_client import request_json
+from app.logger_utils import log_process
+
+
+DEXSCREENER_TOKENS_URL = "https://api.dexscreener.com/latest/dex/tokens/"
+MAX_BATCH_SIZE = 30  # DexScreener hard limit for comma-separated addresses
+
+
+def _group_pairs(pairs: List[Dict[str, Any]], addresses: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Fan a combined response back out per requested mint (base or quote side)."""
+    wanted = set(addresses)
+    grouped: Dict[str, List[Dict[str, Any]]] = {a: [] for a in addresses}
+    for p in pairs or []:
+        for side in ("baseToken", "quoteToken"):
+            addr = (p.get(side) or {}).get("address")
+            if addr in wanted:
+                grouped[addr].append(p)
+    return grouped
+
+
+class DexScreenerBatcher:
+    """
+    Collects pending mint lookups and resolves them in batches.
+
+    A dedicated worker thread waits up to `window_ms` after the first pending
+    mint (or until `max_batch` are queued), then issues the batched request.
+    Callers only wait on their own future, and never longer than their own
+    timeout, however long other callers' batches take.
+    """
+
+    def __init__(self, window_ms: float = 25.0, max_batch: int = MAX_BATCH_SIZE, timeout: float = 10.0, max_retries: int = 3):
+        self.window_sec = max(0.0, float(window_ms) / 1000.0)
+        self.max_batch = max(1, min(int(max_batch), MAX_BATCH_SIZE))
+        self.timeout = timeout
+        self.max_retries = max(1, int(max_retries))
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Future] = {}
+        self._retries: Dict[str, int] = {}
+        self._worker: Optional[threading.Thread] = None
+        self.requests_sent = 0
+        self.mints_resolved = 0
+
+    def get_pairs(self, token_address: str, timeout: Optional[float] = None, max_retries: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Pairs for one mint ([] when DexScreener has none), or None when the
+        request failed so callers can fall back to their own error handling.
+        A batch is retried as many times as its most persistent caller asked for.
+        """
+        if not token_address:
+            return None
+        retries = max(1, int(max_retries)) if max_retries is not None else self.max_retries
+        with self._cond:
+            fut = self._pending.get(token_address)
+            if fut is None:
+                fut = Future()
+                self._pending[token_address] = fut
+            self._retries[token_address] = max(retries, self._retries.get(token_address, 0))
+            self._ensure_worker()
+            self._cond.notify_all()
+        try:
+            per_attempt = timeout if timeout is not None else self.timeout
+            return fut.result(timeout=per_attempt * retries + self.window_sec)
+        except Exception:
+            return None
+
+    def get_pairs_many(self, addresses: List[str]) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """Resolve a known list of mints directly (no collection window)."""
+        unique = list(dict.fromkeys(a for a in addresses if a))
+        out: Dict[str, Optional[List[Dict[str, Any]]]] = {}
+        for i in range(0, len(unique), self.max_batch):
+            chunk = unique[i:i + self.max_batch]
+            out.update(self._fetch_batch(chunk))
+        return out
+
+    def _ensure_worker(self) -> None:
+        # Called with self._cond held
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="dexscreener-batch", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                deadline = time.time() + self.window_sec
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = dict(list(self._pending.items())[:self.max_batch])
+                retries = max(self._retries.pop(addr, self.max_retries) for addr in batch)
+                for addr in batch:
+                    del self._pending[addr]
+            try:
+                results = self._fetch_batch(list(batch), retries)
+            except Exception:
+                results = {}
+            for addr, fut in batch.items():
+                if not fut.done():
+                    fut.set_result(results.get(addr))
+
+    def _fetch_batch(self, addresses: List[str], max_retries: Optional[int] = None) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        url = DEXSCREENER_TOKENS_URL + ",".join(addresses)
+        attempts = max_retries or self.max_retries
+        status = None
+        for attempt in range(attempts):
+            self.requests_sent += 1
+            result = request_json("GET", url, timeout=self.timeout)
+            status = result.get("status_code")
+            if status == 200:
+                data = result.get("json") or {}
+                self.mints_resolved += len(addresses)
+                return _group_pairs(data.get("pairs") or [], addresses)
+            if attempt < attempts - 1:
+                time.sleep(2 ** attempt if status == 429 else 1)
+        try:
+            log_process({
+                "type": "dexscreener_batch_failed",
+                "size": len(addresses),
+                "status": status,
+            })
+        except Exception:
+            pass
+        return {a: None for a in addresses}
+
+
+_batcher: Optional[DexScreenerBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher() -> DexScreenerBatcher:
+    """Process-wide batcher configured from DEXSCREENER_BATCH_* settings"""
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                from app.config_unified import DEXSCREENER_BATCH_WINDOW_MS, DEXSCREENER_BATCH_MAX, HTTP_TIMEOUT_STATS
+                _batcher = DexScreenerBatcher(
+                    window_ms=DEXSCREENER_BATCH_WINDOW_MS,
+                    max_batch=DEXSCREENER_BATCH_MAX,
+                    timeout=HTTP_TIMEOUT_STATS,
+                )
+    return _batcher
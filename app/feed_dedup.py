@@ -0,0 +1,123 @@
+"""
+Rolling, time-windowed deduplication for feed items.
+
+Two Bloom filters are rotated: new keys go into the current one and lookups
+check both, so a key is remembered for between one and two windows while the
+memory footprint stays fixed regardless of feed volume.
+"""
+import hashlib
+import math
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for `capacity` keys at `fp_rate`"""
+
+    def __init__(self, capacity: int, fp_rate: float = 0.001):
+        capacity = max(1, int(capacity))
+        fp_rate = min(max(float(fp_rate), 1e-9), 0.5)
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # Double hashing (Kirsch-Mitzenmacher) from one 128-bit digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RollingDedup:
+    """
+    Remembers keys for a rolling time window using a rotating pair of Bloom filters.
+    A filter is also rotated early when it reaches capacity, to keep the
+    false-positive rate bounded during feed bursts.
+    """
+
+    def __init__(self, window_sec: float = 900, capacity: int = 50000, fp_rate: float = 0.001):
+        self.window_sec = max(1.0, float(window_sec))
+        self.capacity = max(1, int(capacity))
+        self.fp_rate = fp_rate
+        self._current = BloomFilter(self.capacity, fp_rate)
+        self._previous = BloomFilter(self.capacity, fp_rate)
+        self._rotated_at = time.time()
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.duplicates = 0
+
+    def _maybe_rotate(self, now: float) -> None:
+        if (now - self._rotated_at) >= self.window_sec or self._current.count >= self.capacity:
+            self._previous = self._current
+            self._current = BloomFilter(self.capacity, self.fp_rate)
+            self._rotated_at = now
+            self.checked = 0
+            self.duplicates = 0
+
+    def seen_or_add(self, key: str) -> bool:
+        """True if the key was seen within the window; otherwise records it"""
+        with self._lock:
+            self._maybe_rotate(time.time())
+            self.checked += 1
+            if key in self._current or key in self._previous:
+                self.duplicates += 1
+                return True
+            self._current.add(key)
+            return False
+
+    def contains(self, key: str) -> bool:
+        """True if the key was seen within the window (does not record it)"""
+        with self._lock:
+            self._maybe_rotate(time.time())
+            self.checked += 1
+            if key in self._current or key in self._previous:
+                self.duplicates += 1
+                return True
+            return False
+
+    def add(self, key: str) -> None:
+        """Record a key without checking it"""
+        with self._lock:
+            self._maybe_rotate(time.time())
+            if key not in self._current:
+                self._current.add(key)
+
+    @property
+    def duplicate_rate(self) -> float:
+        """Share of checked items that were duplicates in the current window"""
+        return (self.duplicates / self.checked) if self.checked else 0.0
+
+
+def feed_dedup_key(tx: Dict[str, Any]) -> Optional[str]:
+    """
+    Identity of a feed swap: the tx signature when present, otherwise a hash of
+    token + wallet + amount + timestamp. Returns None when neither is available.
+    """
+    for field in ("tx_hash", "signature", "tx_signature", "transaction_hash"):
+        sig = tx.get(field)
+        if sig:
+            return f"sig:{sig}"
+    token = tx.get("token0_address") or tx.get("token1_address") or tx.get("token")
+    ts = tx.get("timestamp") or tx.get("block_time") or tx.get("time")
+    if not token or not ts:
+        return None
+    parts = (
+        str(tx.get("token0_address") or ""),
+        str(tx.get("token1_address") or ""),
+        str(tx.get("wallet") or tx.get("wallet_address") or ""),
+        str(tx.get("usd_value") or tx.get("token0_amount_usd") or tx.get("token1_amount_usd") or ""),
+        str(ts),
+    )
+    return "h:" + hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=16).hexdigest()
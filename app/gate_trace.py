@@ -0,0 +1,79 @@
+"""
+Lightweight per-gate tracing for the signal pipeline.
+
+Each stage is timed with a monotonic clock and each gate counts pass/reject.
+Durations feed Prometheus histograms via app.metrics; an in-process rollup is
+kept so the bot can write a compact per-cycle summary into its heartbeat.
+"""
+import threading
+import time
+from typing import Any, Dict, List
+
+
+class GateTracer:
+    """
+    Collects stage timings and gate outcomes. Costs two perf_counter() calls and
+    a couple of dict updates per stage, so it is meant to stay on in production.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages: Dict[str, List[float]] = {}  # stage -> [count, total_sec, max_sec]
+        self._gates: Dict[str, List[int]] = {}  # gate -> [passed, rejected]
+
+    @staticmethod
+    def clock() -> float:
+        return time.perf_counter()
+
+    def lap(self, stage: str, started: float) -> float:
+        """Record time since `started` under `stage`; returns now for the next lap"""
+        now = time.perf_counter()
+        if self.enabled:
+            self.record(stage, now - started)
+        return now
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            s = self._stages.get(stage)
+            if s is None:
+                self._stages[stage] = [1, seconds, seconds]
+            else:
+                s[0] += 1
+                s[1] += seconds
+                if seconds > s[2]:
+                    s[2] = seconds
+        try:
+            from app.metrics import observe_gate_duration
+            observe_gate_duration(stage, seconds)
+        except Exception:
+            pass
+
+    def gate(self, name: str, passed: bool) -> bool:
+        """Count a gate outcome and return `passed` so it can wrap a condition"""
+        if self.enabled:
+            with self._lock:
+                g = self._gates.get(name)
+                if g is None:
+                    g = self._gates[name] = [0, 0]
+                g[0 if passed else 1] += 1
+            try:
+                from app.metrics import inc_gate_result
+                inc_gate_result(name, "pass" if passed else "reject")
+            except Exception:
+                pass
+        return passed
+
+    def summary(self, reset: bool = False) -> Dict[str, Any]:
+        """
+        Compact rollup: {"ms": {stage: [count, avg_ms, max_ms]}, "gates": {gate: [passed, rejected]}}
+        """
+        with self._lock:
+            out = {
+                "ms": {k: [int(v[0]), round(v[1] * 1000.0 / v[0], 2), round(v[2] * 1000.0, 2)] for k, v in self._stages.items() if v[0]},
+                "gates": {k: list(v) for k, v in self._gates.items()},
+            }
+            if reset:
+                self._stages.clear()
+                self._gates.clear()
+        return out
@@ -16,8 +16,34 @@ import random
 from app.dns_patch import apply_dns_patch
 apply_dns_patch()
 
+from app.rate_limiter import SharedRateLimiter
+
 logger = logging.getLogger(__name__)
 
+
+def _limiter_name(api_key: str) -> str:
+    """Processes using the same API key share one bucket"""
+    if not api_key:
+        return "jupiter:free"
+    import hashlib
+    return "jupiter:" + hashlib.sha1(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+def _limiter_redis():
+    """Redis client for the shared limiter (None = host-local file bucket)"""
+    url = os.getenv("JUP_RATE_LIMIT_REDIS_URL") or os.getenv("REDIS_URL") or os.getenv("CALLSBOT_REDIS_URL") or ""
+    if not url or os.getenv("JUP_RATE_LIMIT_BACKEND", "").strip().lower() in ("file", "local"):
+        return None
+    try:
+        import redis  # type: ignore
+        client = redis.from_url(url, socket_timeout=2, socket_connect_timeout=2)
+        client.ping()
+        return client
+    except Exception as e:
+        logger.warning(f"Shared Jupiter rate limiter: Redis unavailable ({e}); using file bucket")
+        return None
+
+
 class JupiterClient:
     """
     Dedicated Jupiter API client with:
@@ -71,12 +97,17 @@ class JupiterClient:
             self._429_threshold = int(os.getenv("JUP_FREE_429_THRESHOLD", "3"))
             self._cooldown_sec = int(os.getenv("JUP_FREE_COOLDOWN_SEC", "60"))
         
-        self._bucket_refill_rate = rpm_limit / 60.0  # tokens per second
-        self._bucket_tokens = float(self._bucket_capacity)
-        self._bucket_last_refill = time.time()
-        self._bucket_lock = threading.Lock()
+        # One bucket per API key shared by every process on the host (or via Redis),
+        # with priority lanes so exits preempt price polling and health checks
+        self._limiter = SharedRateLimiter(
+            name=_limiter_name(self.api_key),
+            rate_per_sec=rpm_limit / 60.0,
+            capacity=self._bucket_capacity,
+            redis_client=_limiter_redis(),
+            path=os.getenv("JUP_RATE_LIMIT_FILE", "var/jupiter_rate.bucket") or None,
+        )
         
-        logger.info(f"Rate limiter: {rpm_limit} RPM ({rpm_limit/60:.1f} RPS), burst={self._bucket_capacity}")
+        logger.info(f"Rate limiter: {rpm_limit} RPM ({rpm_limit/60:.1f} RPS), burst={self._bucket_capacity}, backend={self._limiter.backend}")
         
         # 429 handling state
         self._consecutive_429 = 0
@@ -137,10 +168,14 @@ class JupiterClient:
         params: Optional[Dict] = None,
         json: Optional[Dict] = None,
         timeout: float = 10.0,
-        retries: int = 3
+        retries: int = 3,
+        lane: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Make HTTP request with DNS fallback and retry logic
+        
+        lane: rate-limit priority lane ("exit", "trade", "poll", "health");
+              defaults to the thread's rate_lane() context
         """
         url = f"{self.base_url}{path}"
         
@@ -160,7 +195,7 @@ class JupiterClient:
         
         for attempt in range(retries):
             # Acquire rate-limit token (token bucket) - this provides rate limiting
-            self._acquire_rate_token()
+            self._acquire_rate_token(lane)
             try:
                 # NO MORE REQUEST LOCK - allows concurrent requests (better throughput!)
                 # Token bucket prevents overloading Jupiter API
@@ -244,39 +279,9 @@ class JupiterClient:
         now = time.time()
         return bool(self._cooldown_until and now < self._cooldown_until)
 
-    def _acquire_rate_token(self) -> None:
-        """Block until a token is available under the global RPM limit."""
-        with self._bucket_lock:
-            now = time.time()
-            # Refill
-            elapsed = max(0.0, now - self._bucket_last_refill)
-            self._bucket_last_refill = now
-            self._bucket_tokens = min(
-                self._bucket_capacity,
-                self._bucket_tokens + elapsed * self._bucket_refill_rate,
-            )
-            if self._bucket_tokens >= 1.0:
-                self._bucket_tokens -= 1.0
-                return
-            # Calculate wait time for next token
-            needed = 1.0 - self._bucket_tokens
-            wait_sec = needed / max(self._bucket_refill_rate, 0.01)
-        # Sleep outside the lock
-        time.sleep(wait_sec)
-        # After sleeping, ensure we consume a token
-        with self._bucket_lock:
-            now2 = time.time()
-            elapsed2 = max(0.0, now2 - self._bucket_last_refill)
-            self._bucket_last_refill = now2
-            self._bucket_tokens = min(
-                self._bucket_capacity,
-                self._bucket_tokens + elapsed2 * self._bucket_refill_rate,
-            )
-            if self._bucket_tokens >= 1.0:
-                self._bucket_tokens -= 1.0
-                return
-            # Fallback: enforce small sleep to avoid tight loops
-            time.sleep(0.2)
+    def _acquire_rate_token(self, lane: Optional[str] = None) -> None:
+        """Block until a token is available under the shared RPM limit for this lane."""
+        self._limiter.acquire(lane)
     
     def get_quote(
         self,
@@ -286,7 +291,8 @@ class JupiterClient:
         slippage_bps: int = 2000,
         timeout: float = 10.0,
         only_direct_routes: bool = False,
-        max_accounts: int = None
+        max_accounts: int = None,
+        lane: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Get swap quote from Jupiter
@@ -299,6 +305,7 @@ class JupiterClient:
             timeout: Request timeout in seconds
             only_direct_routes: If True, only return quotes using single-hop routes (more reliable)
             max_accounts: Max accounts/hops to use (lower = simpler routes, e.g. 20 for 2-hop max)
+            lane: Rate-limit lane (see app.rate_limiter.LANES)
             
         Returns:
             Dict with status_code, json (quote data), and error
@@ -318,7 +325,7 @@ class JupiterClient:
         
         logger.debug(f"Getting Jupiter quote: {input_mint[:8]}... → {output_mint[:8]}... ({amount} units, {slippage_bps} BPS slippage, direct={only_direct_routes}, maxAccounts={max_accounts})")
         
-        result = self._make_request("GET", "/v6/quote", params=params, timeout=timeout)
+        result = self._make_request("GET", "/v6/quote", params=params, timeout=timeout, lane=lane)
         
         if result["status_code"] == 200:
             logger.info(f"✅ Jupiter quote received: {result['json'].get('outAmount')} units")
@@ -333,7 +340,8 @@ class JupiterClient:
         user_public_key: str,
         wrap_unwrap_sol: bool = True,
         priority_fee: int = 100000,
-        timeout: float = 15.0
+        timeout: float = 15.0,
+        lane: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Get swap transaction from Jupiter
@@ -344,6 +352,7 @@ class JupiterClient:
             wrap_unwrap_sol: Auto wrap/unwrap SOL
             priority_fee: Priority fee in microlamports
             timeout: Request timeout in seconds
+            lane: Rate-limit lane (see app.rate_limiter.LANES)
             
         Returns:
             Dict with status_code, json (swap transaction), and error
@@ -359,7 +368,7 @@ class JupiterClient:
         
         logger.debug(f"Getting Jupiter swap transaction for {user_public_key[:8]}...")
         
-        result = self._make_request("POST", "/v6/swap", json=payload, timeout=timeout)
+        result = self._make_request("POST", "/v6/swap", json=payload, timeout=timeout, lane=lane)
         
         if result["status_code"] == 200:
             logger.info("✅ Jupiter swap transaction received")
@@ -379,7 +388,8 @@ class JupiterClient:
                 output_mint="EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
                 amount=1000000000,  # 1 SOL
                 slippage_bps=50,
-                timeout=5.0
+                timeout=5.0,
+                lane="health"
             )
             
             return result["status_code"] == 200 and result["json"] is not None
@@ -0,0 +1,142 @@
+"""
+End-to-end latency trace for a signal, from the Cielo swap to the trader's fill.
+
+A trace is a plain dict that travels inside the Redis signal payload:
+{"id": "<hex>", "ts": {"swap": t, "seen": t, "decided": t, "published": t, ...}}
+Each process stamps the points it owns (epoch seconds) and records the hops
+that end at those points, so every hop is observed exactly once.
+"""
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from app.logger_utils import log_process
+
+
+# Stamp points in pipeline order; a hop is named after the interval it closes
+POINTS = ("swap", "seen", "decided", "published", "dequeued", "opening", "filled")
+HOPS = {
+    "seen": "feed",          # swap on-chain -> bot screened the feed item
+    "decided": "analysis",   # screened -> all gates passed
+    "published": "publish",  # decided -> signal pushed to Redis
+    "dequeued": "transport", # pushed -> trader read it
+    "opening": "trader",     # read -> trader filters done, buy starting
+    "filled": "fill",        # buy started -> broker returned a fill
+}
+BOT_POINTS = ("seen", "decided", "published")
+TRADER_POINTS = ("dequeued", "opening", "filled")
+
+
+def _epoch(value: Any) -> Optional[float]:
+    """Feed timestamps arrive as epoch seconds, epoch millis or ISO strings"""
+    if value is None or value == "":
+        return None
+    try:
+        ts = float(value)
+        return ts / 1000.0 if ts > 1e12 else ts
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except Exception:
+        return None
+
+
+def new_trace(tx: Optional[Dict[str, Any]] = None, seen_at: Optional[float] = None) -> Dict[str, Any]:
+    """Mint a trace for a feed item, stamping the swap time when the feed provides one"""
+    trace: Dict[str, Any] = {"id": uuid.uuid4().hex[:16], "ts": {}}
+    if tx:
+        swap = _epoch(tx.get("timestamp") or tx.get("block_time") or tx.get("time"))
+        # Ignore clearly bogus swap times (future, or older than a day)
+        now = time.time()
+        if swap is not None and now - 86400 < swap <= now + 5:
+            trace["ts"]["swap"] = swap
+    trace["ts"]["seen"] = seen_at if seen_at is not None else time.time()
+    return trace
+
+
+def stamp(trace: Optional[Dict[str, Any]], point: str, ts: Optional[float] = None) -> None:
+    if isinstance(trace, dict):
+        trace.setdefault("ts", {})[point] = ts if ts is not None else time.time()
+
+
+def hop_durations(trace: Optional[Dict[str, Any]], points: Iterable[str] = POINTS) -> Dict[str, float]:
+    """Seconds for each hop ending at one of `points`, measured from the previous stamped point"""
+    if not isinstance(trace, dict):
+        return {}
+    ts = trace.get("ts") or {}
+    wanted = set(points)
+    out: Dict[str, float] = {}
+    prev: Optional[float] = None
+    for point in POINTS:
+        value = _epoch(ts.get(point))
+        if value is None:
+            continue
+        if prev is not None and point in wanted and point in HOPS:
+            out[HOPS[point]] = max(0.0, value - prev)
+        prev = value
+    filled = _epoch(ts.get("filled"))
+    if "filled" in wanted and filled is not None:
+        start = _epoch(ts.get("swap")) or _epoch(ts.get("seen"))
+        if start is not None:
+            out["total"] = max(0.0, filled - start)
+    return out
+
+
+def record_hops(trace: Optional[Dict[str, Any]], points: Iterable[str], source: str, **fields: Any) -> Dict[str, float]:
+    """Observe hop latencies in Prometheus and log a `signal_latency` record for the dashboard"""
+    hops = hop_durations(trace, points)
+    if not hops:
+        return hops
+    try:
+        from app.metrics import observe_signal_hop
+        for hop, seconds in hops.items():
+            observe_signal_hop(hop, seconds)
+    except Exception:
+        pass
+    try:
+        record = {
+            "type": "signal_latency",
+            "trace_id": trace.get("id") if isinstance(trace, dict) else None,
+            "source": source,
+            "hops": {k: round(v, 4) for k, v in hops.items()},
+        }
+        record.update(fields)
+        log_process(record)
+    except Exception:
+        pass
+    return hops
+
+
+def _percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(records: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Per-hop p50/p90/p99 (seconds) over `signal_latency` log records"""
+    samples: Dict[str, list] = {}
+    for rec in records:
+        if rec.get("type") != "signal_latency":
+            continue
+        for hop, seconds in (rec.get("hops") or {}).items():
+            try:
+                samples.setdefault(hop, []).append(float(seconds))
+            except (TypeError, ValueError):
+                continue
+    out: Dict[str, Dict[str, float]] = {}
+    for hop, values in samples.items():
+        values.sort()
+        out[hop] = {
+            "n": len(values),
+            "p50": round(_percentile(values, 0.50), 3),
+            "p90": round(_percentile(values, 0.90), 3),
+            "p99": round(_percentile(values, 0.99), 3),
+            "max": round(values[-1], 3),
+        }
+    return out
@@ -102,16 +102,21 @@ _counter_circuit_opens = _counter("circuit_breaker_opens_total", "Total circuit
 _counter_signals_emitted = _counter("signals_emitted_total", "Total signals emitted")
 _counter_signals_skipped = _counter("signals_skipped_total", "Signals skipped by reason", ["reason"])
 _counter_signals_deduplicated = _counter("signals_deduplicated_total", "Duplicate signals filtered")
+_gauge_feed_duplicate_rate = _gauge("feed_duplicate_rate", "Share of feed items seen earlier in the dedup window")
 _gauge_last_signal_time = _gauge("last_signal_timestamp", "Unix timestamp of last signal")
 
 # Cache Metrics (existing + expanded)
 _counter_cache_hits = _counter("cache_hits_total", "Cache hits total", ["cache_type"])
 _counter_cache_misses = _counter("cache_misses_total", "Cache misses total", ["cache_type"])
 _gauge_cache_size = _gauge("cache_size", "Current cache size", ["cache_type"])
+_counter_stats_coalesced = _counter("stats_fetch_coalesced_total", "Stats fetches served by an in-flight request", ["scope"])
 
 # Alert Metrics (existing)
 _counter_alerts_sent = _counter("alerts_sent_total", "Alerts sent total")
 _counter_alerts_suppressed = _counter("alerts_suppressed_total", "Alerts suppressed total", ["reason"])
+_gauge_telegram_queue = _gauge("telegram_queue_depth", "Telegram messages waiting in the sender queue")
+_histogram_telegram_latency = _histogram("telegram_send_latency_seconds", "Enqueue-to-delivery latency of Telegram messages", buckets=[0.1, 0.5, 1, 2, 5, 10, 30, 60, 120])
+_counter_telegram_sends = _counter("telegram_sends_total", "Telegram sendMessage outcomes", ["result"])
 
 # Budget Metrics
 _counter_stats_budget_used = _counter("stats_budget_used_total", "Stats credits spent total")
@@ -129,6 +134,9 @@ _histogram_feed_latency = _histogram("feed_fetch_latency_seconds", "Feed fetch l
 # Processing Metrics
 _histogram_token_analysis_duration = _histogram("token_analysis_duration_seconds", "Token analysis duration", buckets=[0.1, 0.5, 1, 2, 5, 10])
 _counter_tokens_processed = _counter("tokens_processed_total", "Tokens processed", ["outcome"])
+_histogram_gate_duration = _histogram("signal_gate_duration_seconds", "Signal pipeline stage duration", ["gate"], buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10])
+_counter_gate_results = _counter("signal_gate_results_total", "Signal pipeline gate outcomes", ["gate", "result"])
+_histogram_signal_hop = _histogram("signal_hop_latency_seconds", "Feed-to-fill latency per pipeline hop", ["hop"], buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120, 300])
 
 
 # ============ METRIC FUNCTIONS ============
@@ -180,6 +188,11 @@ def inc_signal_deduplicated() -> None:
         _counter_signals_deduplicated.inc()  # type: ignore
 
 
+def set_feed_duplicate_rate(rate: float) -> None:
+    if _enabled and _gauge_feed_duplicate_rate is not None:
+        _gauge_feed_duplicate_rate.set(rate)  # type: ignore
+
+
 def cache_hit(cache_type: str = "stats") -> None:
     if _enabled and _counter_cache_hits is not None:
         _counter_cache_hits.labels(cache_type=cache_type).inc()  # type: ignore
@@ -195,6 +208,11 @@ def set_cache_size(cache_type: str, size: int) -> None:
         _gauge_cache_size.labels(cache_type=cache_type).set(size)  # type: ignore
 
 
+def inc_stats_coalesced(scope: str = "local") -> None:
+    if _enabled and _counter_stats_coalesced is not None:
+        _counter_stats_coalesced.labels(scope=scope).inc()  # type: ignore
+
+
 def alert_sent() -> None:
     if _enabled and _counter_alerts_sent is not None:
         _counter_alerts_sent.inc()  # type: ignore
@@ -205,6 +223,22 @@ def alert_suppressed(reason: str) -> None:
         _counter_alerts_suppressed.labels(reason=str(reason)).inc()  # type: ignore
 
 
+def set_telegram_queue_depth(n: int) -> None:
+    if _enabled and _gauge_telegram_queue is not None:
+        _gauge_telegram_queue.set(n)  # type: ignore
+
+
+def observe_telegram_latency(seconds: float) -> None:
+    if _enabled and _histogram_telegram_latency is not None:
+        _histogram_telegram_latency.observe(seconds)  # type: ignore
+
+
+def inc_telegram_send(result: str) -> None:
+    """Track Telegram send outcomes: ok, rate_limited, error, rejected, dropped"""
+    if _enabled and _counter_telegram_sends is not None:
+        _counter_telegram_sends.labels(result=result).inc()  # type: ignore
+
+
 def add_stats_budget_used(n: int = 1) -> None:
     if _enabled and _counter_stats_budget_used is not None:
         _counter_stats_budget_used.inc(n)  # type: ignore
@@ -251,6 +285,23 @@ def inc_token_processed(outcome: str) -> None:
         _counter_tokens_processed.labels(outcome=outcome).inc()  # type: ignore
 
 
+def observe_gate_duration(gate: str, seconds: float) -> None:
+    if _enabled and _histogram_gate_duration is not None:
+        _histogram_gate_duration.labels(gate=gate).observe(seconds)  # type: ignore
+
+
+def inc_gate_result(gate: str, result: str) -> None:
+    """Track per-gate outcomes: pass, reject"""
+    if _enabled and _counter_gate_results is not None:
+        _counter_gate_results.labels(gate=gate, result=result).inc()  # type: ignore
+
+
+def observe_signal_hop(hop: str, seconds: float) -> None:
+    """Hops: feed, analysis, publish, transport, trader, fill, total"""
+    if _enabled and _histogram_signal_hop is not None:
+        _histogram_signal_hop.labels(hop=hop).observe(seconds)  # type: ignore
+
+
 def get_all_metrics_summary() -> Dict[str, Any]:
     """
     Get summary of all metrics (for health endpoint when Prometheus not available).
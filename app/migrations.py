@@ -292,5 +292,75 @@ def get_signals_migrations() -> MigrationRunner:
     
     runner.register(5, "add_initial_holder_count", migration_5_add_initial_holder_count)
     
+    # Migration 6: Unix-timestamp alerted_at + covering index for tracking queries
+    def migration_6_normalize_alert_timestamps(conn: sqlite3.Connection) -> None:
+        """
+        Store alerted_at / first_alert_at as Unix seconds everywhere.
+        
+        Rows inserted without alerted_at got CURRENT_TIMESTAMP text (UTC), which
+        sorts after every number, so `alerted_at >= ?` matched them all. Existing
+        text values are converted, and a trigger converts any that arrive later.
+        """
+        # Whole seconds from %s plus the millisecond fraction from %f (julianday math drifts by microseconds)
+        to_unix = (
+            "COALESCE(CAST(strftime('%s', {col}) AS REAL)"
+            " + (strftime('%f', {col}) - CAST(strftime('%S', {col}) AS INTEGER)), {col})"
+        )
+        is_date_text = "typeof({col}) = 'text' AND {col} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*'"
+        
+        for table, col in (
+            ("alerted_tokens", "alerted_at"),
+            ("alerted_token_stats", "first_alert_at"),
+            ("alerted_token_stats", "last_checked_at"),
+        ):
+            conn.execute(
+                f"UPDATE {table} SET {col} = {to_unix.format(col=col)} "
+                f"WHERE {is_date_text.format(col=col)}"
+            )
+        
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_alerted_tokens_alerted_at_unix
+            AFTER INSERT ON alerted_tokens
+            WHEN {is_date_text.format(col='NEW.alerted_at')}
+            BEGIN
+                UPDATE alerted_tokens SET alerted_at = {to_unix.format(col='NEW.alerted_at')}
+                WHERE rowid = NEW.rowid;
+            END
+        """)
+        
+        # Covers get_alerted_tokens_for_tracking (range on alerted_at, no table lookups)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_alerted_tokens_alerted_at
+            ON alerted_tokens(alerted_at, token_address, final_score, conviction_type)
+        """)
+        
+        conn.commit()
+    
+    runner.register(6, "normalize_alert_timestamps", migration_6_normalize_alert_timestamps)
+    
+    # Migration 7: Indexes for the hot signals queries (see tests/test_query_plans.py)
+    def migration_7_add_activity_indexes(conn: sqlite3.Connection) -> None:
+        """
+        Index token_activity for get_recent_token_signals (token + time window)
+        and cleanup_old_activity (range delete on observed_at), and
+        alerted_token_stats.first_alert_at for the dashboard's time windows.
+        alerted_tokens(alerted_at) is covered by idx_alerted_tokens_alerted_at (migration 6).
+        """
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_token_activity_token_time
+            ON token_activity(token_address, observed_at)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_token_activity_observed_at
+            ON token_activity(observed_at)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_alerted_token_stats_first_alert_at
+            ON alerted_token_stats(first_alert_at)
+        """)
+        conn.commit()
+    
+    runner.register(7, "add_activity_indexes", migration_7_add_activity_indexes)
+    
     return runner
 
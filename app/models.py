@@ -229,6 +229,7 @@ class FeedTransaction:
     smart_money: bool = False
     is_synthetic: bool = False
     raw_data: Dict[str, Any] = field(default_factory=dict)
+    trace: Optional[Dict[str, Any]] = None  # End-to-end latency trace (app.latency_trace)
     
     def __post_init__(self):
         """Validate and compute derived fields"""
@@ -1,10 +1,10 @@
 # notify.py
-import time
 import json
 import os
-from app.config_unified import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_ENABLED
-from app.config_unified import HTTP_TIMEOUT_TELEGRAM
-from app.http_client import request_json
+from app.config_unified import TELEGRAM_ENABLED, TELEGRAM_SENDER_ASYNC
+from app.config_unified import SIGNAL_TRANSPORT, SIGNAL_STREAM_KEY, SIGNAL_STREAM_MAXLEN
+from app.signal_stream import publish_signal
+from app.telegram_sender import get_sender
 
 
 # Redis client for signal passing (optional, graceful fallback if not available)
@@ -62,9 +62,30 @@ def get_redis_status() -> str:
     return _redis_status
 
 
+def _publish(client, payload: str, signal_data: dict, done: set) -> None:
+    """Run the transport steps not yet in `done`, recording each one that succeeds.
+
+    A retry after a partial failure (e.g. XADD raising after the LPUSH went
+    through) then resumes at the failed step instead of pushing a duplicate.
+    """
+    if SIGNAL_TRANSPORT in ("list", "both"):
+        if "lpush" not in done:
+            client.lpush("trading_signals", payload)
+            done.add("lpush")
+        if "ltrim" not in done:
+            client.ltrim("trading_signals", 0, 999)
+            done.add("ltrim")
+    if SIGNAL_TRANSPORT in ("stream", "both") and "xadd" not in done:
+        publish_signal(client, signal_data, SIGNAL_STREAM_KEY, SIGNAL_STREAM_MAXLEN)
+        done.add("xadd")
+
+
 def push_signal_to_redis(signal_data: dict) -> bool:
     """Push trading signal to Redis for real-time consumption by trader.
     
+    Depending on SIGNAL_TRANSPORT the signal goes to the bounded
+    `trading_signals` list, the `SIGNAL_STREAM_KEY` stream, or both.
+    
     Args:
         signal_data: Dict containing token, score, conviction, price, liquidity, etc.
     
@@ -75,23 +96,20 @@ def push_signal_to_redis(signal_data: dict) -> bool:
         print(f"⚠️ Cannot push signal to Redis: client not connected (status: {_redis_status})")
         return False
     
+    payload = json.dumps(signal_data)
+    done: set = set()
     try:
-        # Push to Redis list with bounded size
-        payload = json.dumps(signal_data)
-        _redis_client.lpush("trading_signals", payload)
-        _redis_client.ltrim("trading_signals", 0, 999)
+        _publish(_redis_client, payload, signal_data, done)
         return True
     except Exception as e:
-        # Retry basic reconnect once
+        # Retry basic reconnect once, skipping the steps that already landed
         try:
             print(f"⚠️ Redis push failed, attempting reconnect: {e}")
             client = _create_redis_client()
             if client is not None:
                 globals()["_redis_client"] = client
                 client.ping()
-                payload = json.dumps(signal_data)
-                client.lpush("trading_signals", payload)
-                client.ltrim("trading_signals", 0, 999)
+                _publish(client, payload, signal_data, done)
                 return True
         except Exception as e2:
             print(f"⚠️ Failed to push signal to Redis after reconnect: {e2}")
@@ -99,6 +117,13 @@ def push_signal_to_redis(signal_data: dict) -> bool:
 
 
 def send_telegram_alert(message: str) -> bool:
+    """Deliver a Telegram message via the shared sender.
+
+    With TELEGRAM_SENDER_ASYNC the message is queued and this returns as soon as
+    it is accepted; delivery, pacing and 429 back-off happen on the sender's
+    worker. When async is off (or the queue is full) the message is sent inline
+    on the same keep-alive session.
+    """
     if not message or not message.strip():
         print("Error: Empty message provided")
         return False
@@ -107,34 +132,12 @@ def send_telegram_alert(message: str) -> bool:
     if not TELEGRAM_ENABLED:
         return True
 
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    data = {
-        "chat_id": TELEGRAM_CHAT_ID,
-        "text": message,
-        "parse_mode": "HTML",  # Allow HTML formatting
-    }
-
-    max_retries = 3
-    for attempt in range(max_retries):
-        result = request_json("POST", url, json=data, timeout=HTTP_TIMEOUT_TELEGRAM)
-        status = result.get("status_code")
-        if status == 200:
-            print("✅ Telegram message sent successfully")
-            return True
-        elif status == 429:
-            print(f"Telegram rate limited, waiting... (attempt {attempt + 1})")
-            time.sleep(2 ** attempt)
-            continue
-        elif status is None:
-            print(f"Request exception on Telegram attempt {attempt + 1}: {result.get('error')}")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
-                continue
-        else:
-            txt = result.get("text") if result.get("json") is None else None
-            print(f"Error sending Telegram message: {status}, {txt}")
-            if attempt < max_retries - 1:
-                time.sleep(1)
-                continue
-    print(f"Failed to send Telegram message after {max_retries} attempts")
+    sender = get_sender()
+    if TELEGRAM_SENDER_ASYNC and sender.enqueue(message):
+        return True
+
+    if sender.send_now(message):
+        print("✅ Telegram message sent successfully")
+        return True
+    print(f"Failed to send Telegram message after {sender.max_retries} attempts")
     return False
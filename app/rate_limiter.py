@@ -0,0 +1,235 @@
+"""
+Cross-process token bucket with priority lanes.
+
+Every process that talks to the same upstream (trader, bot, scripts) draws from
+one bucket so together they stay under the provider's RPS:
+- Redis (Lua script, atomic) when a client is available
+- otherwise a small mmap'd file under an flock, shared by processes on the host
+- otherwise an in-process bucket
+
+Lanes decide who may take the last tokens. Low lanes keep a reserve untouched,
+and when a priority lane (exits) has to wait it places a hold that blocks
+non-priority lanes until it has been served.
+"""
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl  # POSIX only
+except Exception:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore
+
+from app.logger_utils import log_process
+
+
+# lane -> (reserve fraction of capacity the lane must leave, priority)
+LANES: Dict[str, Tuple[float, bool]] = {
+    "exit": (0.0, True),     # sells and exit quotes
+    "trade": (0.0, False),   # buys
+    "poll": (0.25, False),   # price polling quotes
+    "health": (0.5, False),  # health checks and diagnostics
+}
+DEFAULT_LANE = "trade"
+
+_lane_local = threading.local()
+
+
+def current_lane() -> str:
+    return getattr(_lane_local, "lane", DEFAULT_LANE)
+
+
+@contextmanager
+def rate_lane(lane: str) -> Iterator[None]:
+    """Requests made by this thread inside the block use `lane` unless they pass one"""
+    prev = getattr(_lane_local, "lane", None)
+    _lane_local.lane = lane
+    try:
+        yield
+    finally:
+        if prev is None:
+            del _lane_local.lane
+        else:
+            _lane_local.lane = prev
+
+
+def take(state: Tuple[float, float, float], now: float, capacity: float, rate: float,
+         reserve: float, priority: bool) -> Tuple[Tuple[float, float, float], float]:
+    """
+    One bucket step. state = (tokens, last_refill, hold_until).
+    Returns (new_state, wait) where wait == 0 means a token was taken.
+    """
+    tokens, last, hold_until = state
+    tokens = min(capacity, tokens + max(0.0, now - last) * rate)
+    if not priority and now < hold_until:
+        return (tokens, now, hold_until), hold_until - now
+    if tokens - reserve >= 1.0:
+        return (tokens - 1.0, now, hold_until), 0.0
+    wait = (reserve + 1.0 - tokens) / max(rate, 0.01)
+    if priority:
+        hold_until = max(hold_until, now + wait)
+    return (tokens, now, hold_until), wait
+
+
+# KEYS[1] = bucket hash; ARGV = capacity, rate, reserve, priority(0/1)
+# Returns the wait in microseconds (0 = token taken). Uses the server clock so
+# all hosts agree on time.
+_LUA_TAKE = """
+pcall(redis.replicate_commands)
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local reserve = tonumber(ARGV[3])
+local priority = ARGV[4] == '1'
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local s = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'hold')
+local tokens = tonumber(s[1]) or capacity
+local last = tonumber(s[2]) or now
+local hold = tonumber(s[3]) or 0
+tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+local wait = 0
+if (not priority) and now < hold then
+  wait = hold - now
+elseif tokens - reserve >= 1 then
+  tokens = tokens - 1
+else
+  wait = (reserve + 1 - tokens) / math.max(rate, 0.01)
+  if priority then hold = math.max(hold, now + wait) end
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now), 'hold', tostring(hold))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / math.max(rate, 0.01)) + 60)
+return math.ceil(wait * 1000000)
+"""
+
+
+class _LocalBucket:
+    def __init__(self, capacity: float):
+        self._lock = threading.Lock()
+        self._state = (float(capacity), time.time(), 0.0)
+
+    def take(self, capacity: float, rate: float, reserve: float, priority: bool) -> float:
+        with self._lock:
+            self._state, wait = take(self._state, time.time(), capacity, rate, reserve, priority)
+            return wait
+
+
+class _FileBucket:
+    """Bucket state in a 24-byte mmap'd file, serialized across processes with flock"""
+
+    _FMT = "ddd"
+    _SIZE = struct.calcsize(_FMT)
+
+    def __init__(self, path: str, capacity: float):
+        if fcntl is None:
+            raise RuntimeError("flock not available on this platform")
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._lock = threading.Lock()  # flock does not exclude threads sharing the fd
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < self._SIZE:
+                os.ftruncate(self._fd, self._SIZE)
+                os.pwrite(self._fd, struct.pack(self._FMT, float(capacity), time.time(), 0.0), 0)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._mm = mmap.mmap(self._fd, self._SIZE)
+
+    def take(self, capacity: float, rate: float, reserve: float, priority: bool) -> float:
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                state = struct.unpack_from(self._FMT, self._mm, 0)
+                state, wait = take(state, time.time(), capacity, rate, reserve, priority)
+                struct.pack_into(self._FMT, self._mm, 0, *state)
+                return wait
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+            os.close(self._fd)
+        except Exception:
+            pass
+
+
+class SharedRateLimiter:
+    """
+    Token bucket shared across processes. `acquire(lane)` blocks until a token
+    is available for that lane (or `timeout` passes).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_sec: float,
+        capacity: float,
+        redis_client: Any = None,
+        path: Optional[str] = None,
+        lanes: Optional[Dict[str, Tuple[float, bool]]] = None,
+    ):
+        self.name = name
+        self.rate = max(0.01, float(rate_per_sec))
+        self.capacity = max(1.0, float(capacity))
+        self.lanes = dict(lanes or LANES)
+        self._redis = redis_client
+        self._redis_key = f"ratelimit:{name}"
+        self._script = None
+        self._redis_failed_at = 0.0
+        self._local = _LocalBucket(self.capacity)
+        self._file: Optional[_FileBucket] = None
+        if path:
+            try:
+                self._file = _FileBucket(path, self.capacity)
+            except Exception as e:
+                log_process({"type": "rate_limiter_file_unavailable", "name": name, "path": path, "error": str(e)})
+
+    @property
+    def backend(self) -> str:
+        if self._redis is not None and time.time() - self._redis_failed_at > 30:
+            return "redis"
+        return "file" if self._file is not None else "local"
+
+    def _lane(self, lane: Optional[str]) -> Tuple[float, bool]:
+        reserve_frac, priority = self.lanes.get(lane or current_lane(), self.lanes.get(DEFAULT_LANE, (0.0, False)))
+        return reserve_frac * self.capacity, priority
+
+    def try_acquire(self, lane: Optional[str] = None) -> float:
+        """Take a token if the lane may; returns 0.0 on success, else seconds to wait"""
+        reserve, priority = self._lane(lane)
+        if self.backend == "redis":
+            try:
+                if self._script is None:
+                    self._script = self._redis.register_script(_LUA_TAKE)
+                micros = self._script(
+                    keys=[self._redis_key],
+                    args=[self.capacity, self.rate, reserve, 1 if priority else 0],
+                )
+                return max(0.0, float(micros or 0) / 1_000_000)
+            except Exception as e:
+                # Redis down: fall back to the host-local bucket for a while
+                self._redis_failed_at = time.time()
+                log_process({"type": "rate_limiter_redis_error", "name": self.name, "error": str(e)})
+        bucket = self._file or self._local
+        return bucket.take(self.capacity, self.rate, reserve, priority)
+
+    def acquire(self, lane: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            wait = self.try_acquire(lane)
+            if wait <= 0:
+                return True
+            # Re-check often so a released hold or a refill is picked up promptly
+            sleep_for = min(wait, 0.25)
+            if deadline is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                sleep_for = min(sleep_for, remaining)
+            time.sleep(max(0.005, sleep_for))
@@ -7,7 +7,8 @@ Processes feed items and decides whether to send alerts.
 import os
 import time
 import html
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from typing import Optional, Dict, Any, List, Set, Tuple, Union, Callable
 from datetime import datetime
 
 from app.models import FeedTransaction, TokenStats, ProcessResult
@@ -15,6 +16,7 @@ from app.analyze_token import (
     get_token_stats,
     score_token,
     calculate_preliminary_score,
+    calculate_preliminary_scores_batch,
     check_senior_strict,
     check_junior_strict,
     check_junior_nuanced,
@@ -29,6 +31,17 @@ from app.storage import (
 from app.notify import send_telegram_alert, push_signal_to_redis
 from app.telethon_notifier import send_group_message
 from app.logger_utils import log_alert, log_process
+from app.feed_dedup import RollingDedup, feed_dedup_key
+from app.gate_trace import GateTracer
+from app.alert_dispatcher import AlertDispatcher, HUMAN_LANE
+from app.latency_trace import BOT_POINTS, new_trace, record_hops, stamp
+
+# Outcomes that depend on a flaky upstream; the swap is left unseen so a later page retries it
+_RETRYABLE_RESULTS = frozenset({
+    "Failed to fetch stats",
+    "Stats fetch deadline exceeded",
+    "Failed to send alert",
+})
 
 
 class SignalProcessor:
@@ -52,13 +65,24 @@ class SignalProcessor:
         """
         self.config = config
         self._session_alerted_tokens = set()
-        self._last_alert_time = 0.0
         self._api_calls_saved = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_workers = 0
+        self._feed_dedup = self._build_feed_dedup()
+        self._dispatcher: Optional[AlertDispatcher] = None
+        try:
+            from app.config_unified import GATE_TRACE_ENABLED
+        except Exception:
+            GATE_TRACE_ENABLED = True
+        # Per-stage latency and pass/reject counts (summarised into the heartbeat)
+        self.tracer = GateTracer(enabled=GATE_TRACE_ENABLED)
     
     def process_feed_item(
         self,
         tx: Dict[str, Any],
-        is_smart_cycle: bool
+        is_smart_cycle: bool,
+        prefetched_stats: Optional[Dict[str, Any]] = None,
+        preliminary_score: Optional[int] = None
     ) -> ProcessResult:
         """
         Process a single feed item and determine if it should generate an alert.
@@ -66,23 +90,185 @@ class SignalProcessor:
         Args:
             tx: Transaction data from feed
             is_smart_cycle: Whether this is from the smart money feed cycle
+            prefetched_stats: Stats already fetched for this token (skips get_token_stats)
+            preliminary_score: Score from score_feed_page (skips per-item scoring)
         
         Returns:
             ProcessResult with status and metadata
         """
-        # OPTIMIZED: Config imported at module level to avoid repeated imports
-        from app.config_unified import (
-            DEBUG_PRELIM,
-            REQUIRE_SMART_MONEY_FOR_ALERT,
-            PRELIM_DETAILED_MIN,
-            GENERAL_CYCLE_MIN_SCORE,
-            MIN_LIQUIDITY_USD,
-            USE_LIQUIDITY_FILTER,
-            EXCELLENT_LIQUIDITY_USD,
-            REQUIRE_LP_LOCKED,
-            REQUIRE_MINT_REVOKED,
-            ALLOW_UNKNOWN_SECURITY,
-        )
+        t0 = self.tracer.clock()
+        screened = self._screen_feed_item(tx, is_smart_cycle, preliminary_score)
+        self.tracer.lap("screen", t0)
+        if isinstance(screened, ProcessResult):
+            result = screened
+        else:
+            feed_tx, token_address, preliminary_score = screened
+            result = self._analyze_candidate(tx, feed_tx, token_address, preliminary_score, prefetched_stats)
+        self._remember_feed_item(tx, is_smart_cycle, result)
+        return result
+    
+    def process_feed_page(
+        self,
+        txs: List[Dict[str, Any]],
+        is_smart_cycle: bool,
+        max_workers: int = 4,
+        deadline_sec: float = 0.0,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> List[ProcessResult]:
+        """
+        Process a whole feed page, fetching detailed stats concurrently.
+        
+        Cheap gates run first in feed order. Each unique candidate mint is then
+        fetched once on a bounded worker pool, and the remaining gates and the
+        alert are applied sequentially in the original feed order.
+        
+        Args:
+            txs: Transactions from one feed page
+            is_smart_cycle: Whether this is from the smart money feed cycle
+            max_workers: Maximum concurrent stats fetches
+            deadline_sec: Wall-clock budget for the fetch phase (0 = no deadline)
+            should_stop: Optional callback; when it returns True remaining items are dropped
+        
+        Returns:
+            One ProcessResult per applied transaction, in feed order
+        """
+        screened: List[Any] = []
+        pending: List[str] = []
+        page_keys: Set[str] = set()
+        prelim_scores = self.score_feed_page(txs)
+        for tx, prelim in zip(txs, prelim_scores):
+            # Items are only remembered once analysed, so catch repeats within this page here
+            key = self._feed_key(tx, is_smart_cycle)
+            if key is not None:
+                if key in page_keys:
+                    screened.append(ProcessResult(status="skipped", error_message="Duplicate feed item"))
+                    continue
+                page_keys.add(key)
+            t0 = self.tracer.clock()
+            try:
+                item = self._screen_feed_item(tx, is_smart_cycle, prelim)
+            except Exception as e:
+                item = ProcessResult(status="error", error_message=str(e))
+            self.tracer.lap("screen", t0)
+            screened.append(item)
+            if not isinstance(item, ProcessResult) and item[1] not in pending:
+                pending.append(item[1])
+        
+        t0 = self.tracer.clock()
+        fetched = self._fetch_stats_concurrently(pending, max_workers, deadline_sec)
+        if pending:
+            self.tracer.lap("stats_fetch_page", t0)
+        
+        results: List[ProcessResult] = []
+        for tx, item in zip(txs, screened):
+            if should_stop is not None and should_stop():
+                break
+            if isinstance(item, ProcessResult):
+                results.append(item)
+                continue
+            feed_tx, token_address, preliminary_score = item
+            # An earlier item on this page may have alerted the same mint
+            if token_address in self._session_alerted_tokens:
+                results.append(ProcessResult(status="skipped", token_address=token_address, error_message="Already alerted"))
+                continue
+            if token_address not in fetched:
+                results.append(ProcessResult(
+                    status="skipped",
+                    token_address=token_address,
+                    preliminary_score=preliminary_score,
+                    error_message="Stats fetch deadline exceeded"
+                ))
+                continue
+            try:
+                results.append(self._analyze_candidate(tx, feed_tx, token_address, preliminary_score, fetched[token_address]))
+            except Exception as e:
+                results.append(ProcessResult(status="error", token_address=token_address, error_message=str(e)))
+        for tx, result in zip(txs, results):
+            self._remember_feed_item(tx, is_smart_cycle, result)
+        return results
+    
+    def score_feed_page(self, txs: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """
+        Preliminary scores for a whole feed page in one vectorized pass.
+        
+        None entries (the batch failed) make the item fall back to per-item scoring.
+        """
+        try:
+            return list(calculate_preliminary_scores_batch(txs))
+        except Exception:
+            return [None] * len(txs)
+    
+    def _fetch_stats_concurrently(self, tokens: List[str], max_workers: int, deadline_sec: float) -> Dict[str, Dict[str, Any]]:
+        """Fetch stats for unique tokens on the worker pool, honouring the page deadline"""
+        if not tokens:
+            return {}
+        self._log(f"FETCHING DETAILED STATS for {len(tokens)} token(s) (workers: {max(1, max_workers)})")
+        if max_workers <= 1:
+            return {t: (get_token_stats(t) or {}) for t in tokens}
+        
+        pool = self._get_executor(max_workers)
+        futures = {pool.submit(get_token_stats, t): t for t in tokens}
+        timeout = deadline_sec if deadline_sec and deadline_sec > 0 else None
+        fetched: Dict[str, Dict[str, Any]] = {}
+        try:
+            for fut in as_completed(futures, timeout=timeout):
+                token = futures[fut]
+                try:
+                    fetched[token] = fut.result() or {}
+                except Exception as e:
+                    self._log(f"⚠️ Stats fetch failed for {token[:8]}: {e}")
+                    fetched[token] = {}
+        except FuturesTimeout:
+            # Stragglers keep running and warm the stats cache for the next cycle
+            deferred = sum(1 for f in futures if not f.done())
+            self._log(f"⚠️ Page deadline ({deadline_sec:.0f}s) hit; {deferred} stats fetch(es) deferred")
+            log_process({
+                "type": "feed_page_deadline",
+                "deadline_sec": deadline_sec,
+                "deferred": deferred,
+                "fetched": len(fetched),
+            })
+        return fetched
+    
+    def _get_executor(self, max_workers: int) -> ThreadPoolExecutor:
+        """Lazily create (or resize) the detail-analysis worker pool"""
+        if self._executor is None or self._executor_workers != max_workers:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="detail")
+            self._executor_workers = max_workers
+        return self._executor
+    
+    def shutdown(self) -> None:
+        """Drain queued alert side-effects and release the worker pool (in-flight fetches are abandoned)"""
+        if self._dispatcher is not None:
+            self._dispatcher.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._executor_workers = 0
+    
+    def _screen_feed_item(
+        self,
+        tx: Dict[str, Any],
+        is_smart_cycle: bool,
+        preliminary_score: Optional[int] = None
+    ) -> Union[ProcessResult, Tuple[FeedTransaction, str, int]]:
+        """
+        Run the cheap, network-free gates for a feed item.
+        
+        Args:
+            preliminary_score: Score already computed by the batch path (skips recomputation)
+        
+        Returns:
+            ProcessResult when the item is rejected, otherwise (feed_tx, token_address, preliminary_score)
+        """
+        from app.config_unified import DEBUG_PRELIM, PRELIM_DETAILED_MIN
+        seen_at = time.time()
+        
+        # Cross-cycle dedup: the same swap shows up on overlapping pages and in both feeds
+        if not self.tracer.gate("dedup", not self._is_duplicate_feed_item(tx, is_smart_cycle)):
+            return ProcessResult(status="skipped", error_message="Duplicate feed item")
         
         # Parse transaction into model
         feed_tx = FeedTransaction(
@@ -110,17 +296,18 @@ class SignalProcessor:
             return ProcessResult(status="skipped", error_message="Native SOL token")
         
         # Check if already alerted (EARLY GATE: Skip before any processing)
-        if token_address in self._session_alerted_tokens or has_been_alerted(token_address):
+        if not self.tracer.gate("already_alerted", not (token_address in self._session_alerted_tokens or has_been_alerted(token_address))):
             return ProcessResult(status="skipped", error_message="Already alerted")
         
         # Calculate preliminary score (EARLY GATE: Skip expensive operations)
-        preliminary_score = calculate_preliminary_score(tx, smart_money_detected=feed_tx.smart_money)
+        if preliminary_score is None:
+            preliminary_score = calculate_preliminary_score(tx, smart_money_detected=feed_tx.smart_money)
         
         if DEBUG_PRELIM:
             self._log_prelim_debug(tx)
         
         # Preliminary score gating (BEFORE recording activity - no DB writes for rejected signals)
-        if preliminary_score < PRELIM_DETAILED_MIN:
+        if not self.tracer.gate("prelim", preliminary_score >= PRELIM_DETAILED_MIN):
             self._log(f"Token {token_address} prelim: {preliminary_score}/10 (skipped detailed analysis)")
             self._api_calls_saved += 1
             return ProcessResult(
@@ -131,9 +318,82 @@ class SignalProcessor:
                 error_message="Preliminary score too low"
             )
         
+        # Candidate survives the cheap gates: start its feed-to-fill latency trace
+        feed_tx.trace = new_trace(tx, seen_at)
+        return feed_tx, token_address, preliminary_score
+    
+    def _build_feed_dedup(self) -> Optional[RollingDedup]:
+        """Rolling Bloom-filter dedup for feed items (None when disabled)"""
+        try:
+            from app.config_unified import FEED_DEDUP_ENABLED, FEED_DEDUP_WINDOW_SEC, FEED_DEDUP_CAPACITY
+            if not FEED_DEDUP_ENABLED:
+                return None
+            return RollingDedup(window_sec=FEED_DEDUP_WINDOW_SEC, capacity=FEED_DEDUP_CAPACITY)
+        except Exception:
+            return None
+    
+    def _feed_key(self, tx: Dict[str, Any], is_smart_cycle: bool) -> Optional[str]:
+        """Dedup key for a feed swap on this cycle (None when the item has no swap identity)"""
+        if self._feed_dedup is None:
+            return None
+        # Synthetic fallback items carry no swap identity; leave them to the fallback path
+        if tx.get('is_synthetic') or str(tx.get('tx_type', '')).endswith('_fallback'):
+            return None
+        key = feed_dedup_key(tx)
+        if key is None:
+            return None
+        # The smart cycle judges the same swap differently (smart_money flag, stricter gates)
+        return f"{key}|{'smart' if is_smart_cycle else 'general'}"
+    
+    def _remember_feed_item(self, tx: Dict[str, Any], is_smart_cycle: bool, result: ProcessResult) -> None:
+        """Record a swap as seen once its analysis completed; transient failures stay retryable"""
+        if result.status == "error" or result.error_message in _RETRYABLE_RESULTS:
+            return
+        key = self._feed_key(tx, is_smart_cycle)
+        if key is not None:
+            self._feed_dedup.add(key)
+    
+    def _is_duplicate_feed_item(self, tx: Dict[str, Any], is_smart_cycle: bool) -> bool:
+        """True if this exact swap was already analysed on this cycle within the dedup window"""
+        key = self._feed_key(tx, is_smart_cycle)
+        if key is None:
+            return False
+        duplicate = self._feed_dedup.contains(key)
+        try:
+            from app.metrics import inc_signal_deduplicated, set_feed_duplicate_rate
+            if duplicate:
+                inc_signal_deduplicated()
+            set_feed_duplicate_rate(self._feed_dedup.duplicate_rate)
+        except Exception:
+            pass
+        return duplicate
+    
+    def _analyze_candidate(
+        self,
+        tx: Dict[str, Any],
+        feed_tx: FeedTransaction,
+        token_address: str,
+        preliminary_score: int,
+        prefetched_stats: Optional[Dict[str, Any]] = None
+    ) -> ProcessResult:
+        """Fetch detailed stats (unless prefetched), apply the remaining gates and alert"""
+        # OPTIMIZED: Config imported at module level to avoid repeated imports
+        from app.config_unified import (
+            REQUIRE_SMART_MONEY_FOR_ALERT,
+            GENERAL_CYCLE_MIN_SCORE,
+            MIN_LIQUIDITY_USD,
+            USE_LIQUIDITY_FILTER,
+            EXCELLENT_LIQUIDITY_USD,
+            REQUIRE_LP_LOCKED,
+            REQUIRE_MINT_REVOKED,
+            ALLOW_UNKNOWN_SECURITY,
+        )
+        usd_value = feed_tx.usd_value or 0
+
         # OPTIMIZED: Record activity ONLY for signals that pass preliminary score check
         # This avoids writing thousands of rejected transactions to the database
         trader = tx.get('from') or tx.get('wallet')
+        t = self.tracer.clock()
         record_token_activity(
             token_address,
             usd_value,
@@ -142,12 +402,17 @@ class SignalProcessor:
             preliminary_score,
             trader
         )
+        t = self.tracer.lap("activity_write", t)
         
         # Fetch detailed stats
-        self._log(f"FETCHING DETAILED STATS for {token_address[:8]} (prelim: {preliminary_score}/10)")
-        stats_raw = get_token_stats(token_address)
+        if prefetched_stats is not None:
+            stats_raw = prefetched_stats
+        else:
+            self._log(f"FETCHING DETAILED STATS for {token_address[:8]} (prelim: {preliminary_score}/10)")
+            stats_raw = get_token_stats(token_address)
+            t = self.tracer.lap("stats_fetch", t)
         self._log(f"DEBUG: Stats fetch result: {'SUCCESS' if stats_raw else 'FAILED'}")
-        if not stats_raw:
+        if not self.tracer.gate("stats_fetch", bool(stats_raw)):
             return ProcessResult(
                 status="skipped",
                 token_address=token_address,
@@ -157,8 +422,9 @@ class SignalProcessor:
         
         # Parse stats into model
         stats = TokenStats.from_api_response(stats_raw, source=stats_raw.get("_source", "unknown"))
+        t = self.tracer.lap("stats_parse", t)
         self._log(f"DEBUG: Stats parse result: {'SUCCESS' if stats else 'FAILED'}")
-        if not stats:
+        if not self.tracer.gate("stats_parse", bool(stats)):
             return ProcessResult(
                 status="skipped",
                 token_address=token_address,
@@ -169,7 +435,9 @@ class SignalProcessor:
         # EARLY GATE: Liquidity pre-filter (fast rejection before expensive scoring)
         # NOTE: Also checked in junior_strict/nuanced for nuanced liquidity_factor support
         if USE_LIQUIDITY_FILTER:
-            if not self._check_liquidity(stats, MIN_LIQUIDITY_USD, EXCELLENT_LIQUIDITY_USD):
+            liquidity_ok = self._check_liquidity(stats, MIN_LIQUIDITY_USD, EXCELLENT_LIQUIDITY_USD)
+            t = self.tracer.lap("liquidity", t)
+            if not self.tracer.gate("liquidity", liquidity_ok):
                 return ProcessResult(
                     status="skipped",
                     token_address=token_address,
@@ -180,7 +448,8 @@ class SignalProcessor:
             try:
                 from app.config_unified import MAX_LIQUIDITY_USD
                 liq_usd = float(stats.liquidity_usd or 0.0)
-                if (MAX_LIQUIDITY_USD or 0) > 0 and liq_usd > MAX_LIQUIDITY_USD:
+                t = self.tracer.lap("liquidity_max", t)
+                if not self.tracer.gate("liquidity_max", not ((MAX_LIQUIDITY_USD or 0) > 0 and liq_usd > MAX_LIQUIDITY_USD)):
                     return ProcessResult(
                         status="skipped",
                         token_address=token_address,
@@ -193,9 +462,10 @@ class SignalProcessor:
         # EARLY GATE: Market cap filter ($50k-$200k sweet spot)
         # DATA-DRIVEN: <$50k = 63.9% rug rate, $50k-$100k = 28.8% 2x+ rate (best!)
         mcap_ok = self._check_market_cap_range(stats, token_address)
+        t = self.tracer.lap("market_cap", t)
         mcap_val = stats.market_cap_usd if stats.market_cap_usd else 0
         self._log(f"DEBUG: Market cap check: {'PASS' if mcap_ok else 'FAIL'} (mcap=${mcap_val:.0f})")
-        if not mcap_ok:
+        if not self.tracer.gate("market_cap", mcap_ok):
             return ProcessResult(
                 status="skipped",
                 token_address=token_address,
@@ -207,18 +477,23 @@ class SignalProcessor:
         # Blind mode override
         if os.getenv('TS_BLIND_BUY', 'false').strip().lower() == 'true':
             pass
-        elif not self._check_fomo_filter(stats, token_address):
-            return ProcessResult(
-                status="skipped",
-                token_address=token_address,
-                preliminary_score=preliminary_score,
-                error_message="Already pumped - late entry rejected"
-            )
+        else:
+            fomo_ok = self._check_fomo_filter(stats, token_address)
+            t = self.tracer.lap("fomo", t)
+            if not self.tracer.gate("fomo", fomo_ok):
+                return ProcessResult(
+                    status="skipped",
+                    token_address=token_address,
+                    preliminary_score=preliminary_score,
+                    error_message="Already pumped - late entry rejected"
+                )
         
         # EARLY GATE: Quick security check (fast rejection before expensive scoring)
         # NOTE: Currently disabled (REQUIRE_LP_LOCKED=False, REQUIRE_MINT_REVOKED=False)
         # Also checked in senior_strict, but this provides early exit if requirements enabled
-        if not self._check_quick_security(stats, REQUIRE_LP_LOCKED, REQUIRE_MINT_REVOKED, ALLOW_UNKNOWN_SECURITY):
+        security_ok = self._check_quick_security(stats, REQUIRE_LP_LOCKED, REQUIRE_MINT_REVOKED, ALLOW_UNKNOWN_SECURITY)
+        t = self.tracer.lap("security", t)
+        if not self.tracer.gate("security", security_ok):
             return ProcessResult(
                 status="skipped",
                 token_address=token_address,
@@ -228,10 +503,11 @@ class SignalProcessor:
         
         # Score token
         score, scoring_details = score_token(stats_raw, smart_money_detected=feed_tx.smart_money, token_address=token_address)
+        t = self.tracer.lap("score", t)
         self._log(f"DEBUG: Token {token_address[:8]} scored {score}/10 (threshold: {GENERAL_CYCLE_MIN_SCORE})")
         
         # Post-score gates
-        if REQUIRE_SMART_MONEY_FOR_ALERT and not feed_tx.smart_money:
+        if not self.tracer.gate("smart_money", not (REQUIRE_SMART_MONEY_FOR_ALERT and not feed_tx.smart_money)):
             return ProcessResult(
                 status="skipped",
                 token_address=token_address,
@@ -250,7 +526,7 @@ class SignalProcessor:
         # Scores below 8 have poor performance and dilute signal quality
         if os.getenv('TS_BLIND_BUY', 'false').strip().lower() == 'true':
             pass
-        elif score < GENERAL_CYCLE_MIN_SCORE:
+        elif not self.tracer.gate("score_threshold", score >= GENERAL_CYCLE_MIN_SCORE):
             self._log(f"REJECTED (Score Below Threshold): {token_address} (score: {score}/{GENERAL_CYCLE_MIN_SCORE}, smart_money={feed_tx.smart_money})")
             return ProcessResult(
                 status="skipped",
@@ -261,7 +537,9 @@ class SignalProcessor:
             )
         
         # Senior strict check
-        if not check_senior_strict(stats_raw, token_address):
+        senior_ok = check_senior_strict(stats_raw, token_address)
+        t = self.tracer.lap("senior_strict", t)
+        if not self.tracer.gate("senior_strict", senior_ok):
             self._log(f"REJECTED (Senior Strict): {token_address}")
             return ProcessResult(
                 status="skipped",
@@ -275,7 +553,8 @@ class SignalProcessor:
         # FIXED: Give ALL tokens equal treatment - smart money or not
         # Data showed non-smart outperformed (3.03x vs 1.12x), so no special treatment
         # Both paths now get nuanced fallback
-        jr_strict_ok = check_junior_strict(stats_raw, score)
+        jr_strict_ok = self.tracer.gate("junior_strict", check_junior_strict(stats_raw, score))
+        t = self.tracer.lap("junior_strict", t)
         conviction_type = None
         
         if jr_strict_ok:
@@ -287,7 +566,9 @@ class SignalProcessor:
                 conviction_type = "High Confidence (Strict)"
         else:
             self._log(f"ENTERING DEBATE (Strict-Junior failed): {token_address}")
-            if check_junior_nuanced(stats_raw, score):
+            nuanced_ok = self.tracer.gate("junior_nuanced", check_junior_nuanced(stats_raw, score))
+            t = self.tracer.lap("junior_nuanced", t)
+            if nuanced_ok:
                 self._log(f"PASSED (Nuanced Junior): {token_address}")
                 if feed_tx.smart_money:
                     conviction_type = "Nuanced Conviction (Smart Money)"
@@ -305,6 +586,7 @@ class SignalProcessor:
         
         # ML Enhancement (optional) - capture predictions
         ml_data = self._get_ml_predictions(score, stats_raw, feed_tx.smart_money, conviction_type)
+        t = self.tracer.lap("ml", t)
         score = ml_data['enhanced_score']
         if ml_data['score_changed']:
             self._log(f"  🤖 ML Adjustment: {ml_data['original_score']} → {score} ({ml_data['reason']})")
@@ -323,8 +605,9 @@ class SignalProcessor:
             trader,
             ml_data  # Pass ML predictions to be saved
         )
+        self.tracer.lap("alert", t)
         
-        if alert_success:
+        if self.tracer.gate("alert_sent", alert_success):
             self._session_alerted_tokens.add(token_address)
             return ProcessResult(
                 status="alert_sent",
@@ -569,45 +852,18 @@ class SignalProcessor:
         trader: Optional[str],
         ml_data: Optional[dict] = None
     ) -> bool:
-        """Generate and send alert via all configured channels"""
-        # Build alert message
-        message = self._build_alert_message(token_address, stats, score, conviction, details)
-
-        # Throttle alerts
-        from app.config_unified import TELEGRAM_ALERT_MIN_INTERVAL
-        import os
+        """
+        Generate and send alert via all configured channels.
         
-        if TELEGRAM_ALERT_MIN_INTERVAL and TELEGRAM_ALERT_MIN_INTERVAL > 0:
-            now_ts = time.time()
-            delta = now_ts - self._last_alert_time
-            if self._last_alert_time > 0 and delta < TELEGRAM_ALERT_MIN_INTERVAL:
-                wait_s = int(TELEGRAM_ALERT_MIN_INTERVAL - delta)
-                self._log(f"Throttling alerts; waiting {wait_s}s")
-                time.sleep(wait_s)
-            self._last_alert_time = time.time()
-        
-        # Send via Telegram
-        telegram_ok = False
-        if os.getenv('DRY_RUN', 'false').strip().lower() != 'true':
-            try:
-                telegram_ok = send_telegram_alert(message)
-            except Exception as e:
-                log_process({
-                    "type": "alert_error",
-                    "channel": "telegram",
-                    "error": str(e),
-                })
+        Trader-first: the trading_signals push and the alerted mark happen inline;
+        Telegram, Telethon, metadata and JSONL logging go through the dispatcher,
+        which also applies the Telegram throttle (human channels only).
+        """
+        import os
+        stamp(feed_tx.trace, "decided")
         
-        # Send to group via Telethon
-        if os.getenv('DRY_RUN', 'false').strip().lower() != 'true':
-            try:
-                send_group_message(message)
-            except Exception as e:
-                log_process({
-                    "type": "alert_error",
-                    "channel": "telethon",
-                    "error": str(e),
-                })
+        # Push to Redis for traders (trade path: never throttled or queued)
+        self._push_to_redis(token_address, stats, score, prelim_score, conviction, feed_tx.smart_money, feed_tx.trace)
         
         # Mark as alerted (CRITICAL: This must not fail silently!)
         try:
@@ -620,10 +876,23 @@ class SignalProcessor:
                 "token": token_address,
                 "error": str(e),
             })
-            # Continue anyway - alert was already sent
+            # Continue anyway - the trader already has the signal
+        
+        # Build alert message
+        message = self._build_alert_message(token_address, stats, score, conviction, details)
+        dispatcher = self._get_dispatcher()
         
-        # Record comprehensive metadata
-        self._record_alert_metadata(
+        if os.getenv('DRY_RUN', 'false').strip().lower() != 'true':
+            from app.config_unified import TELETHON_ENABLED
+            # Both senders retry internally, so the dispatcher runs them once
+            # Send via Telegram (throttled by TELEGRAM_ALERT_MIN_INTERVAL)
+            dispatcher.submit("telegram", lambda: send_telegram_alert(message), attempts=1, throttled=True)
+            # Send to group via Telethon
+            if TELETHON_ENABLED:
+                dispatcher.submit("telethon", lambda: send_group_message(message), attempts=1, lane=HUMAN_LANE)
+        
+        # Record comprehensive metadata (not retried: a partial run may already have written rows)
+        dispatcher.submit("alert_metadata", lambda: self._record_alert_metadata(
             token_address,
             prelim_score,
             score,
@@ -633,18 +902,32 @@ class SignalProcessor:
             trader,
             feed_tx,
             ml_data
-        )
-        
-        # Push to Redis for traders
-        self._push_to_redis(token_address, stats, score, prelim_score, conviction, feed_tx.smart_money)
+        ), attempts=1)
         
         # Log alert
-        self._log_alert_event(token_address, stats, score, prelim_score, conviction, feed_tx)
+        dispatcher.submit("alert_log", lambda: self._log_alert_event(token_address, stats, score, prelim_score, conviction, feed_tx))
         
-        self._log(f"Alert for token {token_address} (Final: {score}/10, Prelim: {prelim_score}/10, telegram_ok={telegram_ok})")
+        self._log(f"Alert for token {token_address} (Final: {score}/10, Prelim: {prelim_score}/10, side-effects queued: {dispatcher.pending()})")
         
         return True
     
+    def _get_dispatcher(self) -> AlertDispatcher:
+        """Lazily create the alert side-effect dispatcher"""
+        if self._dispatcher is None:
+            from app.config_unified import (
+                TELEGRAM_ALERT_MIN_INTERVAL,
+                ALERT_DISPATCH_ASYNC,
+                ALERT_DISPATCH_QUEUE_MAX,
+                ALERT_DISPATCH_MAX_RETRIES,
+            )
+            self._dispatcher = AlertDispatcher(
+                max_queue=ALERT_DISPATCH_QUEUE_MAX,
+                max_retries=ALERT_DISPATCH_MAX_RETRIES,
+                min_interval_sec=TELEGRAM_ALERT_MIN_INTERVAL or 0,
+                run_async=ALERT_DISPATCH_ASYNC,
+            )
+        return self._dispatcher
+    
     def _build_alert_message(self, token_address: str, stats: TokenStats, score: int, conviction: str, details: list) -> str:
         """Build HTML alert message"""
         name = html.escape(stats.name or "Token")
@@ -752,8 +1035,9 @@ class SignalProcessor:
                 "error": str(e),
             })
     
-    def _push_to_redis(self, token: str, stats: TokenStats, score: int, prelim: int, conviction: str, smart: bool):
-        """Push signal to Redis for real-time trader consumption"""
+    def _push_to_redis(self, token: str, stats: TokenStats, score: int, prelim: int, conviction: str, smart: bool,
+                       trace: Optional[Dict[str, Any]] = None):
+        """Push signal to Redis for real-time trader consumption (carries the latency trace)"""
         print(f"[REDIS] Attempting to push signal for {token[:8]}... score={score}", flush=True)
         try:
             signal_payload = {
@@ -775,9 +1059,14 @@ class SignalProcessor:
                 "smart_money_detected": bool(smart),
                 "timestamp": time.time(),
             }
+            if trace is not None:
+                stamp(trace, "published")
+                signal_payload["trace_id"] = trace.get("id")
+                signal_payload["trace"] = trace
             result = push_signal_to_redis(signal_payload)
             if result:
                 print(f"[REDIS] ✅ Successfully pushed signal for {token[:8]}...", flush=True)
+                record_hops(trace, BOT_POINTS, "bot", token=token)
             else:
                 print(f"[REDIS] ❌ Failed to push signal for {token[:8]}...", flush=True)
         except Exception as e:
@@ -839,6 +1128,5 @@ class SignalProcessor:
     def reset_session_state(self):
         """Reset session-specific state (for testing)"""
         self._session_alerted_tokens.clear()
-        self._last_alert_time = 0.0
         self._api_calls_saved = 0
 
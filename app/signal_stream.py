@@ -0,0 +1,144 @@
+"""
+Redis Streams transport for trading signals.
+
+The bot XADDs each signal to a capped stream; traders read it through a
+consumer group and XACK once a signal has been handled. Entries a crashed
+consumer read but never acked stay in the group's pending list and are
+reclaimed by the next consumer after `claim_idle_ms`. Independent traders
+(e.g. paper next to live) use different group names and each see every signal.
+"""
+import json
+import os
+import socket
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.logger_utils import log_process
+
+
+PAYLOAD_FIELD = "payload"
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, (bytes, bytearray)) else str(value)
+
+
+def default_consumer_name() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def publish_signal(client: Any, signal_data: Dict[str, Any], stream: str, maxlen: int = 10000) -> Optional[str]:
+    """XADD one signal; the stream is trimmed (approximately) to `maxlen` entries"""
+    entry_id = client.xadd(
+        stream,
+        {PAYLOAD_FIELD: json.dumps(signal_data)},
+        maxlen=max(1, int(maxlen)) if maxlen else None,
+        approximate=True,
+    )
+    return _text(entry_id) if entry_id is not None else None
+
+
+class SignalStreamConsumer:
+    """
+    One consumer in a consumer group. `read()` first reclaims stale pending
+    entries, then blocks for new ones; callers `ack()` ids when done.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        stream: str,
+        group: str,
+        consumer: Optional[str] = None,
+        block_ms: int = 5000,
+        count: int = 10,
+        claim_idle_ms: int = 60000,
+    ):
+        self.client = client
+        self.stream = stream
+        self.group = group
+        self.consumer = consumer or default_consumer_name()
+        self.block_ms = max(0, int(block_ms))
+        self.count = max(1, int(count))
+        self.claim_idle_ms = max(0, int(claim_idle_ms))
+        self._group_ready = False
+        self._claim_cursor = "0-0"
+
+    def ensure_group(self) -> None:
+        """Create the group (and stream) if needed; an existing group is fine"""
+        if self._group_ready:
+            return
+        try:
+            self.client.xgroup_create(self.stream, self.group, id="$", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    def read(self) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Next batch of (entry_id, signal). The signal is None when the payload
+        could not be decoded; such entries should still be acked.
+        """
+        self.ensure_group()
+        entries = self._reclaim() if self.claim_idle_ms else []
+        if not entries:
+            resp = self.client.xreadgroup(
+                self.group, self.consumer, {self.stream: ">"},
+                count=self.count, block=self.block_ms,
+            )
+            for _stream, items in resp or []:
+                entries.extend(items)
+        return [(_text(entry_id), _decode(fields)) for entry_id, fields in entries]
+
+    def ack(self, *entry_ids: str) -> int:
+        if not entry_ids:
+            return 0
+        return int(self.client.xack(self.stream, self.group, *entry_ids) or 0)
+
+    def _reclaim(self) -> List[Any]:
+        """Take over entries another consumer read but did not ack in time"""
+        try:
+            resp = self.client.xautoclaim(
+                self.stream, self.group, self.consumer,
+                min_idle_time=self.claim_idle_ms, start_id=self._claim_cursor, count=self.count,
+            )
+            # Redis 6.2 returns [cursor, entries]; 7.x adds deleted ids
+            self._claim_cursor = _text(resp[0]) if resp else "0-0"
+            entries = [e for e in (resp[1] if resp and len(resp) > 1 else []) if e and e[1]]
+        except Exception as e:
+            if "unknown command" not in str(e).lower() and not isinstance(e, AttributeError):
+                raise
+            entries = self._reclaim_legacy()
+        if entries:
+            try:
+                log_process({"type": "signal_stream_reclaimed", "count": len(entries), "consumer": self.consumer})
+            except Exception:
+                pass
+        return entries
+
+    def _reclaim_legacy(self) -> List[Any]:
+        """XPENDING + XCLAIM fallback for servers without XAUTOCLAIM (< 6.2)"""
+        pending = self.client.xpending_range(self.stream, self.group, "-", "+", self.count)
+        stale = [
+            p["message_id"] for p in pending or []
+            if int(p.get("time_since_delivered", 0)) >= self.claim_idle_ms
+        ]
+        if not stale:
+            return []
+        claimed = self.client.xclaim(self.stream, self.group, self.consumer, self.claim_idle_ms, stale)
+        return [e for e in claimed or [] if e and e[1]]
+
+
+def _decode(fields: Any) -> Optional[Dict[str, Any]]:
+    try:
+        raw = None
+        for k, v in (fields or {}).items():
+            if _text(k) == PAYLOAD_FIELD:
+                raw = v
+                break
+        if raw is None:
+            return None
+        data = json.loads(_text(raw))
+        return data if isinstance(data, dict) else None
+    except Exception:
+        return None
@@ -0,0 +1,156 @@
+"""
+Long-lived SQLite connections, one per (thread, database file).
+
+Opening a connection and re-applying PRAGMAs for every storage call costs more
+than the queries themselves. ConnectionManager hands each thread a connection
+it keeps for its lifetime; PRAGMAs run once, and sqlite3's per-connection
+statement cache keeps the prepared statements around.
+
+Connections of threads that have exited are closed lazily and state from a
+forked parent is dropped; owners call close_all() at exit or shutdown.
+"""
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+
+DEFAULT_PRAGMAS: Tuple[str, ...] = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+class PooledConnection:
+    """
+    A thread's shared connection, handed out per call. close() only ends the
+    caller's use: uncommitted work is rolled back (as closing would) and the
+    underlying connection stays open for the next call.
+    """
+
+    __slots__ = ("_conn",)
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def close(self) -> None:
+        try:
+            if self._conn.in_transaction:
+                self._conn.rollback()
+        except sqlite3.ProgrammingError:
+            pass  # already closed by close_all()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+
+class ConnectionManager:
+    """Per-thread long-lived connections with PRAGMAs applied once"""
+
+    def __init__(self, pragmas: Iterable[str] = DEFAULT_PRAGMAS, timeout: float = 10.0,
+                 cached_statements: int = 256):
+        self.pragmas = tuple(pragmas)
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self._lock = threading.Lock()
+        # (thread ident, path) -> (thread, connection)
+        self._conns: Dict[Tuple[int, str], Tuple[threading.Thread, sqlite3.Connection]] = {}
+        self._pid = os.getpid()
+        self.opened = 0  # connections created over the manager's lifetime (for stats/benchmarks)
+
+    def connect(self, path: str) -> PooledConnection:
+        """This thread's connection to `path` (created on first use)"""
+        if os.getpid() != self._pid:
+            self._after_fork()
+        key = (threading.get_ident(), path)
+        entry = self._conns.get(key)
+        if entry is not None and entry[0] is not threading.current_thread():
+            # Thread ident reused after the owner exited: retire its connection
+            with self._lock:
+                if self._conns.get(key) is entry:
+                    del self._conns[key]
+            try:
+                entry[1].close()
+            except Exception:
+                pass
+            entry = None
+        if entry is not None:
+            conn = entry[1]
+            # A previous caller may have raised between a write and commit()
+            if conn.in_transaction:
+                conn.rollback()
+            return PooledConnection(conn)
+        conn = self._open(path)
+        with self._lock:
+            self._reap_dead_threads()
+            self._conns[key] = (threading.current_thread(), conn)
+            self.opened += 1
+        return PooledConnection(conn)
+
+    def _open(self, path: str) -> sqlite3.Connection:
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        # check_same_thread=False only so close_all() can close it from another thread;
+        # each connection is still used by the thread that opened it
+        conn = sqlite3.connect(path, timeout=self.timeout, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        for pragma in self.pragmas:
+            try:
+                conn.execute(pragma)
+            except Exception:
+                pass
+        return conn
+
+    def _reap_dead_threads(self) -> None:
+        dead = [k for k, (thread, _) in self._conns.items() if not thread.is_alive()]
+        for k in dead:
+            _, conn = self._conns.pop(k)
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _after_fork(self) -> None:
+        # Never use or close a parent's connections in the child
+        with self._lock:
+            self._conns = {}
+            self._pid = os.getpid()
+
+    def close_thread(self) -> None:
+        """Close the calling thread's connections (e.g. at the end of a worker thread)"""
+        ident = threading.get_ident()
+        with self._lock:
+            for k in [k for k in self._conns if k[0] == ident]:
+                _, conn = self._conns.pop(k)
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def close_all(self, path: Optional[str] = None) -> int:
+        """Close every managed connection (optionally only those to `path`); returns how many"""
+        if os.getpid() != self._pid:
+            self._after_fork()
+            return 0
+        with self._lock:
+            keys = [k for k in self._conns if path is None or k[1] == path]
+            conns = [self._conns.pop(k)[1] for k in keys]
+        for conn in conns:
+            try:
+                conn.close()  # uncommitted work is discarded, as with a per-call close
+            except Exception:
+                pass
+        return len(conns)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"open": len(self._conns), "opened_total": self.opened}
+
@@ -0,0 +1,189 @@
+"""
+WAL journal mode for SQLite files shared by several processes (bot, tracker, dashboard).
+
+In WAL mode readers no longer block the writer (nor the writer readers), but
+it relies on shared memory (the -shm file) that every process maps. That only
+works when all processes run on one kernel against a local filesystem: network
+and host-shared mounts (NFS, SMB, 9p, Docker Desktop's gRPC FUSE/virtiofs) can
+corrupt the database. resolve_journal_mode("auto") checks the mount holding
+the database and falls back to the DELETE rollback journal on those.
+
+The WAL file only shrinks on a checkpoint. SQLite's own autocheckpoint
+(wal_autocheckpoint pages) runs on the committing connection and is skipped
+while readers are active, so long-running readers let it grow; WalCheckpointer
+adds a background thread with a time and size policy.
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.logger_utils import log_process
+
+
+# Filesystems where WAL's shared-memory index is not safe
+UNSAFE_FSTYPES = frozenset({
+    "nfs", "nfs4", "cifs", "smb", "smb3", "smbfs", "9p", "afs", "ceph", "glusterfs",
+    "lustre", "gpfs", "vboxsf", "virtiofs", "fakeowner", "prl_fs", "vmhgfs",
+})
+
+JOURNAL_MODES = ("wal", "delete", "auto")
+
+
+def _mounts(mounts_file: str = "/proc/mounts") -> List[Tuple[str, str]]:
+    """(mount point, fstype) pairs; empty where /proc/mounts does not exist"""
+    out: List[Tuple[str, str]] = []
+    try:
+        with open(mounts_file, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3:
+                    # /proc/mounts escapes spaces in paths as \040
+                    out.append((parts[1].replace("\\040", " "), parts[2]))
+    except OSError:
+        pass
+    return out
+
+
+def filesystem_type(path: str, mounts_file: str = "/proc/mounts") -> Optional[str]:
+    """fstype of the mount holding `path` (the longest matching mount point), or None if unknown"""
+    target = os.path.realpath(os.path.dirname(os.path.abspath(path)) or ".")
+    best: Optional[Tuple[str, str]] = None
+    for mount_point, fstype in _mounts(mounts_file):
+        prefix = mount_point.rstrip("/") + "/"
+        if target == mount_point or target.startswith(prefix) or mount_point == "/":
+            if best is None or len(mount_point) >= len(best[0]):
+                best = (mount_point, fstype)
+    return best[1] if best else None
+
+
+def wal_unsupported_reason(path: str, mounts_file: str = "/proc/mounts") -> Optional[str]:
+    """Why WAL is unsafe for `path`, or None if nothing speaks against it"""
+    fstype = filesystem_type(path, mounts_file)
+    if fstype and (fstype in UNSAFE_FSTYPES or fstype.startswith("fuse")):
+        return f"filesystem {fstype} does not support WAL shared memory"
+    return None
+
+
+def resolve_journal_mode(path: str, requested: str, mounts_file: str = "/proc/mounts") -> str:
+    """
+    Journal mode to use for `path`: "wal" or "delete".
+
+    "wal" forces WAL, "delete" keeps the rollback journal, and "auto" (the
+    Docker-safe mode) uses WAL unless the filesystem is known not to support it.
+    """
+    requested = (requested or "auto").strip().lower()
+    if requested not in JOURNAL_MODES:
+        requested = "auto"
+    if requested != "auto":
+        return requested
+    reason = wal_unsupported_reason(path, mounts_file)
+    if reason:
+        try:
+            log_process({"type": "sqlite_wal_fallback", "path": path, "reason": reason})
+        except Exception:
+            pass
+        return "delete"
+    return "wal"
+
+
+def journal_pragmas(mode: str, wal_autocheckpoint: int = 1000) -> Tuple[str, ...]:
+    """Per-connection PRAGMAs for a resolved journal mode"""
+    if mode == "wal":
+        return ("PRAGMA journal_mode=WAL", f"PRAGMA wal_autocheckpoint={int(wal_autocheckpoint)}")
+    return ("PRAGMA journal_mode=DELETE",)
+
+
+class WalCheckpointer:
+    """
+    Background WAL checkpoints: TRUNCATE once the WAL passes `max_wal_bytes`,
+    otherwise a PASSIVE checkpoint every `interval_sec` while the WAL is non-empty.
+    A checkpoint blocked by readers just leaves the rest for the next round.
+
+    TRUNCATE holds off writers while it waits out busy_timeout for readers, so
+    after a busy TRUNCATE the next attempt is deferred (doubling from
+    `busy_backoff_sec` up to `interval_sec`) and the oversized WAL gets
+    non-blocking PASSIVE checkpoints until then.
+    """
+
+    def __init__(self, connect: Callable[[], object], db_path: str, interval_sec: float = 60.0,
+                 max_wal_bytes: int = 64 * 1024 * 1024, poll_sec: float = 1.0, busy_backoff_sec: float = 5.0):
+        self._connect = connect
+        self.wal_path = db_path + "-wal"
+        self.interval_sec = interval_sec
+        self.max_wal_bytes = max_wal_bytes
+        self.poll_sec = poll_sec
+        self.busy_backoff_sec = busy_backoff_sec
+        self._last = time.time()
+        self._backoff = 0.0
+        self._truncate_after = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats: Dict[str, int] = {"passive": 0, "truncate": 0, "busy": 0, "errors": 0}
+
+    def wal_size(self) -> int:
+        try:
+            return os.path.getsize(self.wal_path)
+        except OSError:
+            return 0
+
+    def checkpoint(self, mode: str = "PASSIVE") -> Tuple[int, int, int]:
+        """Run one checkpoint; returns SQLite's (busy, wal frames, frames checkpointed)"""
+        conn = self._connect()
+        try:
+            row = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        finally:
+            conn.close()
+        self._last = time.time()
+        self.stats[mode.lower()] = self.stats.get(mode.lower(), 0) + 1
+        if row and row[0]:
+            self.stats["busy"] += 1
+        return tuple(row) if row else (0, 0, 0)
+
+    def maybe_checkpoint(self, now: Optional[float] = None) -> Optional[str]:
+        """Apply the size/time policy once; returns the checkpoint mode run, if any"""
+        now = time.time() if now is None else now
+        size = self.wal_size()
+        if size == 0:
+            self._last = now
+            return None
+        if self.max_wal_bytes and size >= self.max_wal_bytes:
+            mode = "TRUNCATE" if now >= self._truncate_after else "PASSIVE"
+        elif now - self._last >= self.interval_sec:
+            mode = "PASSIVE"
+        else:
+            return None
+        busy = self.checkpoint(mode)[0]
+        if mode == "TRUNCATE":
+            if busy:
+                # Readers held it up; don't stall writers again on the next poll
+                self._backoff = min(max(self._backoff * 2, self.busy_backoff_sec), max(self.interval_sec, self.busy_backoff_sec))
+                self._truncate_after = now + self._backoff
+            else:
+                self._backoff = 0.0
+                self._truncate_after = 0.0
+        return mode
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sqlite-wal-checkpoint", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_sec):
+            try:
+                self.maybe_checkpoint()
+            except Exception as e:
+                self.stats["errors"] += 1
+                try:
+                    log_process({"type": "sqlite_wal_checkpoint_error", "path": self.wal_path, "error": str(e)})
+                except Exception:
+                    pass
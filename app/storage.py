@@ -1,23 +1,127 @@
 # storage.py
+import atexit
 import sqlite3
 import math
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
-from app.config_unified import DB_FILE, DB_RETENTION_HOURS
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Sequence
+from app.config_unified import (
+    DB_FILE,
+    DB_RETENTION_HOURS,
+    STORAGE_WRITE_BEHIND,
+    STORAGE_WRITE_BATCH_ROWS,
+    STORAGE_WRITE_BATCH_MS,
+    STORAGE_WRITE_QUEUE_MAX,
+    STORAGE_WRITE_SPOOL,
+    SIGNALS_DB_JOURNAL_MODE,
+    SIGNALS_DB_WAL_AUTOCHECKPOINT,
+    SIGNALS_DB_CHECKPOINT_SEC,
+    SIGNALS_DB_WAL_MAX_MB,
+)
 from app.alert_cache import get_alert_cache
+from app.sqlite_pool import ConnectionManager, DEFAULT_PRAGMAS
+from app.sqlite_wal import WalCheckpointer, journal_pragmas, resolve_journal_mode
+from app.write_behind import WriteBehindWriter
+
+
+# Long-lived per-thread connections: PRAGMAs run once per thread instead of per call.
+# WAL lets the dashboard and report readers run alongside the bot's writes; on
+# network/host-shared volumes (where WAL is unsafe) the rollback journal is kept.
+JOURNAL_MODE = resolve_journal_mode(DB_FILE, SIGNALS_DB_JOURNAL_MODE)
+_connections = ConnectionManager(
+    pragmas=journal_pragmas(JOURNAL_MODE, SIGNALS_DB_WAL_AUTOCHECKPOINT) + DEFAULT_PRAGMAS
+)
+atexit.register(_connections.close_all)
 
 
 def _get_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_FILE, timeout=10)
-    try:
-        # Use rollback journal to avoid cross-container/WAL file issues on some hosts
-        conn.execute("PRAGMA journal_mode=DELETE")
-        conn.execute("PRAGMA busy_timeout=5000")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA temp_store=MEMORY")
-    except Exception:
-        pass
-    return conn
+    """This thread's connection to DB_FILE; callers' close() returns it rather than closing it"""
+    return _connections.connect(DB_FILE)
+
+
+_writer: Optional[WriteBehindWriter] = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer() -> Optional[WriteBehindWriter]:
+    """The write-behind writer when STORAGE_WRITE_BEHIND is on; the crash spool is replayed on first use"""
+    global _writer
+    if not STORAGE_WRITE_BEHIND:
+        return None
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                writer = WriteBehindWriter(
+                    _get_conn,
+                    batch_rows=STORAGE_WRITE_BATCH_ROWS,
+                    batch_ms=STORAGE_WRITE_BATCH_MS,
+                    max_queue=STORAGE_WRITE_QUEUE_MAX,
+                    spool_path=STORAGE_WRITE_SPOOL,
+                )
+                try:
+                    writer.replay()
+                except Exception:
+                    pass
+                _writer = writer
+    return _writer
+
+
+def _queue_insert(sql: str, params: Sequence[Any]) -> bool:
+    """Hand an append-only insert to the writer; False when write-behind is off and the caller must write it"""
+    writer = _get_writer()
+    if writer is None:
+        return False
+    writer.submit(sql, params)
+    return True
+
+
+def flush_writes(timeout: float = 10.0) -> bool:
+    """Commit queued inserts now; False if they did not all commit within timeout"""
+    writer = _writer
+    if writer is None:
+        return True
+    return writer.flush(timeout)
+
+
+def _stop_writer() -> None:
+    global _writer
+    writer = _writer
+    if writer is not None:
+        writer.stop()
+        _writer = None
+
+
+# Registered after _connections.close_all so it runs first: queued rows commit before connections close
+atexit.register(_stop_writer)
+
+
+_checkpointer: Optional[WalCheckpointer] = None
+
+
+def start_checkpointer() -> Optional[WalCheckpointer]:
+    """Start background WAL checkpoints for DB_FILE (run by one process, the bot); None in DELETE mode"""
+    global _checkpointer
+    if JOURNAL_MODE != "wal":
+        return None
+    if _checkpointer is None:
+        _checkpointer = WalCheckpointer(
+            _get_conn,
+            DB_FILE,
+            interval_sec=SIGNALS_DB_CHECKPOINT_SEC,
+            max_wal_bytes=SIGNALS_DB_WAL_MAX_MB * 1024 * 1024,
+        )
+        _checkpointer.start()
+    return _checkpointer
+
+
+def close_connections() -> int:
+    """Commit queued inserts, then close all pooled connections (shutdown hook for the bot, tracker and server)"""
+    global _checkpointer
+    _stop_writer()
+    if _checkpointer is not None:
+        _checkpointer.stop()
+        _checkpointer = None
+    return _connections.close_all()
 
 
 def _is_valid_number(value: Any) -> bool:
@@ -417,11 +521,17 @@ def record_alert_with_metadata(
     conn.close()
 
 
+_INSERT_PRICE_SNAPSHOT = """
+    INSERT INTO price_snapshots (
+        token_address, snapshot_at, price_usd, market_cap_usd,
+        liquidity_usd, volume_24h_usd, holder_count,
+        price_change_1h, price_change_24h
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 def record_price_snapshot(token_address: str, stats: Dict[str, Any]) -> None:
     """Record a price snapshot for tracking performance over time"""
-    conn = _get_conn()
-    c = conn.cursor()
-    
     now = datetime.now().timestamp()
     # Fallback to root stats if nested structure doesn't exist
     price_data = stats.get('price', stats)
@@ -429,13 +539,7 @@ def record_price_snapshot(token_address: str, stats: Dict[str, Any]) -> None:
     liquidity_data = stats.get('liquidity', stats)
     holders_data = stats.get('holders', {})
     
-    c.execute("""
-        INSERT INTO price_snapshots (
-            token_address, snapshot_at, price_usd, market_cap_usd,
-            liquidity_usd, volume_24h_usd, holder_count,
-            price_change_1h, price_change_24h
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    params = (
         token_address,
         now,
         price_data.get('price_usd'),
@@ -445,8 +549,12 @@ def record_price_snapshot(token_address: str, stats: Dict[str, Any]) -> None:
         holders_data.get('holder_count'),
         price_data.get('price_change_1h'),
         price_data.get('price_change_24h'),
-    ))
-    
+    )
+    if _queue_insert(_INSERT_PRICE_SNAPSHOT, params):
+        return
+    conn = _get_conn()
+    c = conn.cursor()
+    c.execute(_INSERT_PRICE_SNAPSHOT, params)
     conn.commit()
     conn.close()
 
@@ -630,35 +738,30 @@ def get_alerted_tokens_for_tracking() -> List[str]:
     # Get tokens alerted in last 24 hours (reduced from 48h to save API credits)
     one_day_ago = (datetime.now() - timedelta(hours=24)).timestamp()
 
-    # Query from alerted_tokens (primary table) and LEFT JOIN with stats
-    # This ensures we track ALL alerted tokens, even those without stats records yet
-    # FIX: Use timestamp comparison, not datetime() function (alerted_at is Unix timestamp)
+    # Query from alerted_tokens (primary table) so we track ALL alerted tokens,
+    # and create stats records for the ones that don't have them yet - one
+    # statement for the whole window instead of a lookup + insert per token.
+    # alerted_at is a Unix timestamp (migration 6); idx_alerted_tokens_alerted_at covers both queries.
     # REMOVED RUG FILTER: Was excluding 373 signals including top winners (1462x, 298x, 43x)
     c.execute("""
-        SELECT a.token_address, a.alerted_at, a.final_score, a.conviction_type
+        INSERT INTO alerted_token_stats (
+            token_address, first_alert_at, last_checked_at, final_score, conviction_type
+        )
+        SELECT a.token_address, a.alerted_at, a.alerted_at, a.final_score, a.conviction_type
         FROM alerted_tokens a
-        LEFT JOIN alerted_token_stats s ON a.token_address = s.token_address
         WHERE a.alerted_at >= ?
-        ORDER BY a.alerted_at DESC
+          AND NOT EXISTS (
+              SELECT 1 FROM alerted_token_stats s WHERE s.token_address = a.token_address
+          )
     """, (one_day_ago,))
-    
-    rows = c.fetchall()
-    
-    # Create stats records for tokens that don't have them yet
-    for token_address, alerted_at, final_score, conviction_type in rows:
-        c.execute("SELECT token_address FROM alerted_token_stats WHERE token_address = ?", (token_address,))
-        if not c.fetchone():
-            # Create initial stats record for orphaned token
-            alerted_timestamp = datetime.fromisoformat(alerted_at.replace(' ', 'T')).timestamp() if isinstance(alerted_at, str) else float(alerted_at)
-            c.execute("""
-                INSERT INTO alerted_token_stats (
-                    token_address, first_alert_at, last_checked_at, final_score, conviction_type
-                ) VALUES (?, ?, ?, ?, ?)
-            """, (token_address, alerted_timestamp, alerted_timestamp, final_score, conviction_type))
-    
     conn.commit()
     
-    tokens = [row[0] for row in rows]
+    c.execute("""
+        SELECT token_address FROM alerted_tokens
+        WHERE alerted_at >= ?
+        ORDER BY alerted_at DESC
+    """, (one_day_ago,))
+    tokens = [row[0] for row in c.fetchall()]
     conn.close()
     return tokens
 
@@ -740,16 +843,24 @@ def get_performance_summary() -> Dict[str, Any]:
     return summary
 
 
+_INSERT_TOKEN_ACTIVITY = """
+    INSERT INTO token_activity
+    (token_address, observed_at, usd_value, transaction_count, smart_money_involved, preliminary_score, trader_address)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 def record_token_activity(token_address: str, usd_value: float, tx_count: int, smart_money_involved: bool, prelim_score: int, trader_address: Optional[str] = None) -> None:
     """Record token activity for velocity tracking"""
+    # Stamped here, same format as SQLite's datetime('now'), so a queued row keeps its observation time
+    observed_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    params = (token_address, observed_at, usd_value, tx_count, smart_money_involved, prelim_score, trader_address)
+    if _queue_insert(_INSERT_TOKEN_ACTIVITY, params):
+        return
     conn = _get_conn()
     c = conn.cursor()
     try:
-        c.execute("""
-            INSERT INTO token_activity
-            (token_address, observed_at, usd_value, transaction_count, smart_money_involved, preliminary_score, trader_address)
-            VALUES (?, datetime('now'), ?, ?, ?, ?, ?)
-        """, (token_address, usd_value, tx_count, smart_money_involved, prelim_score, trader_address))
+        c.execute(_INSERT_TOKEN_ACTIVITY, params)
         conn.commit()
     except sqlite3.IntegrityError:
         # Ignore duplicate-in-same-second inserts on legacy schemas
@@ -760,7 +871,23 @@ def record_token_activity(token_address: str, usd_value: float, tx_count: int, s
 def get_recent_token_signals(token_address: str, window_seconds: int) -> List[str]:
     """Return timestamps (ISO) of recent observations for a token within window.
     Used for multi-signal confirmation prior to expensive stats calls.
+    Observations still queued on the write-behind writer are merged in, so the
+    caller sees its own writes without forcing a flush.
     """
+    writer = _writer
+    if writer is None:
+        return _query_token_signals(token_address, window_seconds)
+    rows, queued = writer.read_with_pending(
+        _INSERT_TOKEN_ACTIVITY, lambda: _query_token_signals(token_address, window_seconds)
+    )
+    cutoff = (datetime.now(timezone.utc) - timedelta(seconds=int(window_seconds))).strftime('%Y-%m-%d %H:%M:%S')
+    pending = [p[1] for p in queued if p[0] == token_address and p[1] >= cutoff]
+    if not pending:
+        return rows
+    return sorted(rows + pending, reverse=True)
+
+
+def _query_token_signals(token_address: str, window_seconds: int) -> List[str]:
     conn = _get_conn()
     c = conn.cursor()
     try:
@@ -799,6 +926,14 @@ def cleanup_old_activity():
     conn.close()
 
 
+_INSERT_TX_SNAPSHOT = """
+    INSERT OR IGNORE INTO transaction_snapshots (
+        token_address, tx_signature, timestamp, from_wallet, to_wallet,
+        amount, amount_usd, tx_type, dex, is_smart_money
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 def record_transaction_snapshot(
     token_address: str,
     tx_signature: str,
@@ -826,19 +961,17 @@ def record_transaction_snapshot(
         dex: DEX name where transaction occurred
         is_smart_money: Whether wallet is identified as smart money
     """
+    params = (
+        token_address, tx_signature, timestamp, from_wallet, to_wallet,
+        amount, amount_usd, tx_type, dex, is_smart_money
+    )
+    if _queue_insert(_INSERT_TX_SNAPSHOT, params):
+        return
     conn = _get_conn()
     c = conn.cursor()
     
     try:
-        c.execute("""
-            INSERT OR IGNORE INTO transaction_snapshots (
-                token_address, tx_signature, timestamp, from_wallet, to_wallet,
-                amount, amount_usd, tx_type, dex, is_smart_money
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            token_address, tx_signature, timestamp, from_wallet, to_wallet,
-            amount, amount_usd, tx_type, dex, is_smart_money
-        ))
+        c.execute(_INSERT_TX_SNAPSHOT, params)
         conn.commit()
     except Exception as e:
         conn.rollback()
@@ -852,6 +985,14 @@ def record_transaction_snapshot(
         conn.close()
 
 
+_INSERT_WALLET_FIRST_BUY = """
+    INSERT OR IGNORE INTO wallet_first_buys (
+        token_address, wallet_address, timestamp, amount, amount_usd,
+        price_usd, is_smart_money, wallet_pnl_history
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 def record_wallet_first_buy(
     token_address: str,
     wallet_address: str,
@@ -875,19 +1016,17 @@ def record_wallet_first_buy(
         is_smart_money: Whether wallet is identified as smart money
         wallet_pnl_history: Historical PnL of wallet (if known)
     """
+    params = (
+        token_address, wallet_address, timestamp, amount, amount_usd,
+        price_usd, is_smart_money, wallet_pnl_history
+    )
+    if _queue_insert(_INSERT_WALLET_FIRST_BUY, params):
+        return
     conn = _get_conn()
     c = conn.cursor()
     
     try:
-        c.execute("""
-            INSERT OR IGNORE INTO wallet_first_buys (
-                token_address, wallet_address, timestamp, amount, amount_usd,
-                price_usd, is_smart_money, wallet_pnl_history
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            token_address, wallet_address, timestamp, amount, amount_usd,
-            price_usd, is_smart_money, wallet_pnl_history
-        ))
+        c.execute(_INSERT_WALLET_FIRST_BUY, params)
         conn.commit()
     except Exception as e:
         conn.rollback()
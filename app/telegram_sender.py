@@ -0,0 +1,303 @@
+"""
+Non-blocking Telegram Bot API sender.
+
+Messages are queued and delivered by one worker thread that owns a keep-alive
+session to api.telegram.org. The worker paces each chat, honours the
+`retry_after` Telegram returns with a 429, and when the queue backs up merges
+consecutive messages for the same chat into one sendMessage call.
+"""
+import collections
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.logger_utils import log_process
+
+
+TELEGRAM_API_BASE = "https://api.telegram.org"
+MAX_MESSAGE_CHARS = 4096  # Telegram hard limit for sendMessage text
+MERGE_SEPARATOR = "\n\n"
+
+
+class TelegramSender:
+    """
+    Bounded queue of outgoing messages drained by a single daemon worker.
+
+    `enqueue` never blocks: it returns False when the queue is full so the
+    caller can decide whether to send synchronously instead (counted as
+    `rejected`). `dropped` counts only messages discarded undelivered, i.e.
+    still queued when `stop` gives up.
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        default_chat_id: str,
+        max_queue: int = 500,
+        chat_interval_sec: float = 1.0,
+        merge_threshold: int = 5,
+        max_merge: int = 10,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        session: Optional[requests.Session] = None,
+    ):
+        self.bot_token = bot_token
+        self.default_chat_id = str(default_chat_id)
+        self.max_queue = max(1, int(max_queue))
+        self.chat_interval_sec = max(0.0, float(chat_interval_sec))
+        self.merge_threshold = max(2, int(merge_threshold))
+        self.max_merge = max(1, int(max_merge))
+        self.timeout = timeout
+        self.max_retries = max(1, int(max_retries))
+        self._session = session
+        self._queue: Deque[Tuple[str, str, float]] = collections.deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._next_send_at: Dict[str, float] = {}
+        self.sent = 0
+        self.merged = 0
+        self.failed = 0
+        self.rejected = 0
+        self.dropped = 0
+
+    # ------------------------------------------------------------------ API
+
+    def enqueue(self, text: str, chat_id: Optional[str] = None) -> bool:
+        """Queue a message for delivery; False when the queue is full or stopped"""
+        chat = str(chat_id or self.default_chat_id)
+        with self._cond:
+            if self._stopping or len(self._queue) >= self.max_queue:
+                self.rejected += 1
+                depth = len(self._queue)
+                accepted = False
+            else:
+                self._queue.append((chat, text, time.time()))
+                depth = len(self._queue)
+                accepted = True
+                self._cond.notify()
+        self._report_depth(depth)
+        if not accepted:
+            _metric("inc_telegram_send", "rejected")
+            return False
+        self._ensure_worker()
+        return True
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue) + (1 if self._busy else 0)
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Wait until every queued message has been attempted; False on timeout"""
+        deadline = time.time() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, 0.1))
+        return True
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Deliver what is queued (up to `timeout`) and stop the worker"""
+        self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            # Whatever flush could not deliver in time is discarded
+            discarded = len(self._queue)
+            self._queue.clear()
+            self.dropped += discarded
+            self._cond.notify_all()
+        for _ in range(discarded):
+            _metric("inc_telegram_send", "dropped")
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        with self._cond:
+            self._stopping = False
+
+    def send_now(self, text: str, chat_id: Optional[str] = None) -> bool:
+        """Synchronous send on the sender's session (still paced and 429-aware)"""
+        return self._deliver(str(chat_id or self.default_chat_id), text)
+
+    # ------------------------------------------------------------- internals
+
+    def _get_session(self) -> requests.Session:
+        if self._session is None:
+            sess = requests.Session()
+            # Retries are handled here so 429 retry_after can be honoured exactly
+            adapter = HTTPAdapter(max_retries=0, pool_connections=1, pool_maxsize=2)
+            sess.mount("https://", adapter)
+            sess.headers.update({"user-agent": "callsbotonchain/1.0", "connection": "keep-alive"})
+            self._session = sess
+        return self._session
+
+    def _ensure_worker(self) -> None:
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="telegram-sender", daemon=True)
+                self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait(1.0)
+                if not self._queue:
+                    return
+                chat, text, oldest = self._take_batch()
+                self._busy = True
+                depth = len(self._queue)
+            self._report_depth(depth)
+            try:
+                if self._deliver(chat, text):
+                    _metric("observe_telegram_latency", time.time() - oldest)
+            except Exception as e:
+                self.failed += 1
+                _log({"type": "telegram_sender_error", "error": str(e)})
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _take_batch(self) -> Tuple[str, str, float]:
+        """Pop the next message, merging followers for the same chat when backed up"""
+        chat, text, enq_at = self._queue.popleft()
+        if len(self._queue) + 1 < self.merge_threshold:
+            return chat, text, enq_at
+        parts: List[str] = [text]
+        size = len(text)
+        while self._queue and len(parts) < self.max_merge:
+            next_chat, next_text, _ = self._queue[0]
+            if next_chat != chat or size + len(MERGE_SEPARATOR) + len(next_text) > MAX_MESSAGE_CHARS:
+                break
+            self._queue.popleft()
+            parts.append(next_text)
+            size += len(MERGE_SEPARATOR) + len(next_text)
+        if len(parts) > 1:
+            self.merged += len(parts) - 1
+        return chat, MERGE_SEPARATOR.join(parts), enq_at
+
+    def _wait_for_chat(self, chat: str) -> None:
+        """Claim the chat's next send slot, then sleep until it (worker and send_now share the pacing)"""
+        with self._cond:
+            now = time.time()
+            slot = max(now, self._next_send_at.get(chat, 0.0))
+            self._next_send_at[chat] = slot + self.chat_interval_sec
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _defer_chat(self, chat: str, until: float) -> None:
+        """Push the chat's next send slot out to `until` (never pulls it in)"""
+        with self._cond:
+            if until > self._next_send_at.get(chat, 0.0):
+                self._next_send_at[chat] = until
+
+    def _deliver(self, chat: str, text: str) -> bool:
+        url = f"{TELEGRAM_API_BASE}/bot{self.bot_token}/sendMessage"
+        payload = {"chat_id": chat, "text": text, "parse_mode": "HTML"}
+        status: Optional[int] = None
+        for attempt in range(self.max_retries):
+            self._wait_for_chat(chat)
+            retry_after: Optional[float] = None
+            try:
+                resp = self._get_session().post(url, json=payload, timeout=self.timeout)
+                status = resp.status_code
+                if status == 429:
+                    retry_after = _retry_after(resp)
+            except Exception as e:
+                status = None
+                _log({"type": "telegram_send_exception", "attempt": attempt + 1, "error": str(e)})
+            now = time.time()
+            self._defer_chat(chat, now + self.chat_interval_sec)
+            if status == 200:
+                self.sent += 1
+                _metric("inc_telegram_send", "ok")
+                return True
+            if status == 429:
+                _metric("inc_telegram_send", "rate_limited")
+                self._defer_chat(chat, now + (retry_after if retry_after is not None else 2 ** attempt))
+                continue
+            if status is not None and 400 <= status < 500:
+                # Bad request / forbidden will not succeed on retry
+                break
+            if attempt < self.max_retries - 1:
+                self._defer_chat(chat, now + max(self.chat_interval_sec, 2 ** attempt))
+        self.failed += 1
+        _metric("inc_telegram_send", "error")
+        _log({"type": "telegram_send_failed", "status": status, "chars": len(text)})
+        return False
+
+    def _report_depth(self, depth: int) -> None:
+        _metric("set_telegram_queue_depth", depth)
+
+
+def _retry_after(resp: Any) -> Optional[float]:
+    """Seconds to wait from a 429: JSON parameters.retry_after, then the header"""
+    try:
+        body = resp.json() or {}
+        value = (body.get("parameters") or {}).get("retry_after")
+        if value is not None:
+            return max(0.0, float(value))
+    except Exception:
+        pass
+    try:
+        header = resp.headers.get("Retry-After")
+        if header is not None:
+            return max(0.0, float(header))
+    except Exception:
+        pass
+    return None
+
+
+def _metric(name: str, *args: Any) -> None:
+    try:
+        from app import metrics
+        getattr(metrics, name)(*args)
+    except Exception:
+        pass
+
+
+def _log(event: Dict[str, Any]) -> None:
+    try:
+        log_process(event)
+    except Exception:
+        pass
+
+
+_sender: Optional[TelegramSender] = None
+_sender_lock = threading.Lock()
+
+
+def get_sender() -> TelegramSender:
+    """Process-wide sender configured from TELEGRAM_* settings"""
+    global _sender
+    if _sender is None:
+        with _sender_lock:
+            if _sender is None:
+                from app.config_unified import (
+                    TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, HTTP_TIMEOUT_TELEGRAM,
+                    TELEGRAM_SENDER_QUEUE_MAX, TELEGRAM_CHAT_INTERVAL_SEC,
+                    TELEGRAM_MERGE_THRESHOLD, TELEGRAM_MERGE_MAX,
+                )
+                _sender = TelegramSender(
+                    TELEGRAM_BOT_TOKEN or "",
+                    TELEGRAM_CHAT_ID,
+                    max_queue=TELEGRAM_SENDER_QUEUE_MAX,
+                    chat_interval_sec=TELEGRAM_CHAT_INTERVAL_SEC,
+                    merge_threshold=TELEGRAM_MERGE_THRESHOLD,
+                    max_merge=TELEGRAM_MERGE_MAX,
+                    timeout=HTTP_TIMEOUT_TELEGRAM,
+                )
+    return _sender
+
+
+def flush_telegram(timeout: float = 15.0) -> bool:
+    """Block until queued Telegram messages are delivered (used at shutdown)"""
+    if _sender is None:
+        return True
+    return _sender.flush(timeout)
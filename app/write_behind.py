@@ -0,0 +1,422 @@
+"""
+Group-commit writer for append-only inserts (token activity, snapshots).
+
+Callers enqueue (sql, params) and return immediately; one writer thread drains
+the queue and commits with executemany once `batch_rows` rows are pending or
+`batch_ms` has passed since the oldest one, so many inserts share one commit.
+
+Backpressure: when the bounded queue is full, submit() waits up to
+`put_timeout` and then writes the row inline, so rows are never dropped.
+
+Durability: each row is appended to a spool file before it is queued and the
+sequence numbers of every committed batch are appended after it. Each process
+spools to its own `<spool_path>.<pid>` file and holds an exclusive flock on it,
+so processes sharing a spool path (bot, track_performance) never mix sequence
+numbers. replay() inserts the uncommitted rows of every spool whose owner is
+gone (its lock is free) and then deletes that file. Once committed records
+outnumber the live rows, the spool is rewritten with only the live rows, so its
+size stays bounded while the writer is behind.
+"""
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, IO, Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: spools are still per-process, but not lock-protected
+    fcntl = None
+
+from app.logger_utils import log_process
+
+
+Row = Tuple[int, str, Sequence[Any]]  # (seq, sql, params)
+
+_STOP = None
+_FLUSH = (0, "", ())  # queue marker: commit what's batched now instead of waiting out batch_ms
+
+
+class WriteBehindWriter:
+    """Bounded queue + one writer thread that group-commits inserts"""
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        batch_rows: int = 200,
+        batch_ms: int = 250,
+        max_queue: int = 10000,
+        put_timeout: float = 0.5,
+        spool_path: Optional[str] = None,
+    ):
+        self._connect = connect
+        self.batch_rows = max(1, int(batch_rows))
+        self.batch_sec = max(0.001, int(batch_ms) / 1000.0)
+        self.put_timeout = put_timeout
+        self.spool_path = spool_path
+        self.own_spool_path = f"{spool_path}.{os.getpid()}" if spool_path else None
+        self._queue: "queue.Queue[Optional[Row]]" = queue.Queue(maxsize=max(1, int(max_queue)))
+        # Re-entrant: flush() may run from a signal handler that interrupted submit() on the same thread
+        self._lock = threading.RLock()
+        self._committed_cond = threading.Condition(self._lock)
+        self._seq = 0
+        self._outstanding: Set[int] = set()
+        self._uncommitted: Dict[int, Tuple[str, List[Any]]] = {}  # outstanding rows, for readers and compaction
+        # Held across a batch's write and _mark_committed, so a reader never sees a row both committed and pending
+        self._commit_lock = threading.Lock()
+        self._spool_lines = 0
+        self._spool_file: Optional[IO[str]] = None
+        self._thread: Optional[threading.Thread] = None
+        self.stats: Dict[str, float] = {"rows": 0, "commits": 0, "inline": 0, "commit_sec": 0.0, "max_commit_sec": 0.0}
+
+    # ---- producer side ----
+
+    def submit(self, sql: str, params: Sequence[Any]) -> None:
+        params = list(params)
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._outstanding.add(seq)
+            self._uncommitted[seq] = (sql, params)
+            if self.spool_path:
+                self._spool({"s": seq, "q": sql, "p": params})
+        self._ensure_worker()
+        try:
+            self._queue.put((seq, sql, params), timeout=self.put_timeout)
+        except queue.Full:
+            # Backpressure: the writer can't keep up, so this caller pays for its own row
+            self.stats["inline"] += 1
+            self._write([(seq, sql, params)])
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._outstanding)
+
+    def read_with_pending(self, sql: str, read: Callable[[], Any]) -> Tuple[Any, List[List[Any]]]:
+        """Run `read()` between commits and return its result with the params of uncommitted `sql` rows.
+
+        Lets a reader see its own queued inserts without waiting for a flush:
+        each row is in exactly one of the two results.
+        """
+        with self._commit_lock:
+            result = read()
+            with self._lock:
+                rows = [params for row_sql, params in self._uncommitted.values() if row_sql == sql]
+        return result, rows
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until everything submitted so far is committed; False on timeout"""
+        deadline = time.time() + timeout
+        with self._committed_cond:
+            target = self._seq
+        if self._worker_alive():
+            try:
+                self._queue.put_nowait(_FLUSH)
+            except queue.Full:
+                pass  # a full queue means full batches are already being committed
+        with self._committed_cond:
+            while self._outstanding and min(self._outstanding) <= target:
+                remaining = deadline - time.time()
+                if remaining <= 0 or not self._worker_alive():
+                    break
+                self._committed_cond.wait(min(remaining, 0.1))
+            done = not self._outstanding or min(self._outstanding) > target
+        if not done and not self._worker_alive():
+            # No writer thread (e.g. it died or we're past interpreter shutdown): drain here
+            self._drain_inline()
+            with self._lock:
+                done = not self._outstanding or min(self._outstanding) > target
+        return done
+
+    def stop(self, timeout: float = 10.0) -> bool:
+        """Flush, stop the writer thread and close the spool"""
+        ok = self.flush(timeout)
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(timeout)
+        self._thread = None
+        with self._lock:
+            if self._spool_file is not None:
+                try:
+                    if not self._outstanding:
+                        os.remove(self.own_spool_path)  # nothing left to recover
+                except Exception:
+                    pass
+                try:
+                    self._spool_file.close()  # releases the lock; leftovers are replayed next start
+                except Exception:
+                    pass
+                self._spool_file = None
+                self._spool_lines = 0
+        return ok
+
+    # ---- writer thread ----
+
+    def _worker_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _ensure_worker(self) -> None:
+        if self._worker_alive():
+            return
+        with self._lock:
+            if self._worker_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="storage-write-behind", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            if item is _FLUSH:
+                continue
+            batch: List[Row] = [item]
+            deadline = time.time() + self.batch_sec
+            stop = False
+            while len(batch) < self.batch_rows:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                if nxt is _FLUSH:
+                    break
+                batch.append(nxt)
+            try:
+                self._write(batch)
+            except Exception as e:
+                try:
+                    log_process({"type": "write_behind_error", "rows": len(batch), "error": str(e)})
+                except Exception:
+                    pass
+            if stop:
+                return
+
+    def _drain_inline(self) -> None:
+        batch: List[Row] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP and item is not _FLUSH:
+                batch.append(item)
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch: List[Row]) -> None:
+        with self._commit_lock:
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Row]) -> None:
+        started = time.time()
+        conn = self._connect()
+        try:
+            groups: Dict[str, List[Sequence[Any]]] = {}
+            for _, sql, params in batch:
+                groups.setdefault(sql, []).append(params)
+            try:
+                for sql, rows in groups.items():
+                    conn.executemany(sql, rows)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                self._write_rows_individually(conn, batch, e)
+        finally:
+            conn.close()
+        elapsed = time.time() - started
+        self.stats["rows"] += len(batch)
+        self.stats["commits"] += 1
+        self.stats["commit_sec"] += elapsed
+        self.stats["max_commit_sec"] = max(self.stats["max_commit_sec"], elapsed)
+        self._mark_committed(seq for seq, _, _ in batch)
+
+    def _write_rows_individually(self, conn: sqlite3.Connection, batch: List[Row], batch_error: Exception) -> None:
+        """One bad row (e.g. a legacy unique constraint) must not lose the rest of the batch"""
+        failed = 0
+        for _, sql, params in batch:
+            try:
+                conn.execute(sql, params)
+            except sqlite3.IntegrityError:
+                continue
+            except Exception:
+                failed += 1
+        conn.commit()
+        if failed:
+            try:
+                log_process({"type": "write_behind_rows_failed", "failed": failed, "batch": len(batch), "error": str(batch_error)})
+            except Exception:
+                pass
+
+    def _mark_committed(self, seqs: Iterable[int]) -> None:
+        seqs = list(seqs)
+        with self._committed_cond:
+            self._outstanding.difference_update(seqs)
+            for seq in seqs:
+                self._uncommitted.pop(seq, None)
+            if not self._outstanding:
+                self._truncate_spool()
+            elif self._spool_lines + 1 > 2 * len(self._uncommitted):
+                self._compact_spool()
+            else:
+                self._spool({"c": seqs})
+            self._committed_cond.notify_all()
+
+    # ---- spool (crash recovery); callers hold self._lock ----
+
+    def _install_spool(self, lines: Iterable[str]) -> IO[str]:
+        """Write `lines` to a locked temp file and move it over our spool.
+        
+        The temp name is hidden from replay, and the file is locked before it
+        appears under the spool name, so another process never sees it unowned.
+        """
+        d, base = os.path.split(self.own_spool_path)
+        tmp = os.path.join(d, f".{base}.tmp")
+        f = open(tmp, "w", encoding="utf-8")
+        try:
+            if not _try_lock(f):
+                raise OSError(f"{tmp} is locked by another process")
+            f.writelines(lines)
+            f.flush()
+            os.replace(tmp, self.own_spool_path)
+        except Exception:
+            f.close()
+            raise
+        return f
+
+    def _open_spool(self) -> IO[str]:
+        d = os.path.dirname(self.own_spool_path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        if os.path.exists(self.own_spool_path):
+            # A previous process with our pid (container restart) left rows behind
+            self._replay_file(self.own_spool_path)
+        f = self._install_spool([])
+        self._spool_lines = 0
+        return f
+
+    def _spool(self, record: Dict[str, Any]) -> None:
+        if not self.spool_path:
+            return
+        try:
+            if self._spool_file is None:
+                self._spool_file = self._open_spool()
+            self._spool_file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._spool_file.flush()  # in the OS page cache: survives the process dying
+            self._spool_lines += 1
+        except Exception:
+            pass
+
+    def _truncate_spool(self) -> None:
+        if self._spool_file is None:
+            return
+        try:
+            self._spool_file.seek(0)
+            self._spool_file.truncate(0)
+            self._spool_lines = 0
+        except Exception:
+            pass
+
+    def _compact_spool(self) -> None:
+        """Rewrite the spool with only the rows that are still outstanding"""
+        if self._spool_file is None:
+            return
+        try:
+            f = self._install_spool(
+                json.dumps({"s": seq, "q": sql, "p": params}, separators=(",", ":")) + "\n"
+                for seq, (sql, params) in sorted(self._uncommitted.items())
+            )
+        except Exception:
+            return
+        old, self._spool_file = self._spool_file, f
+        self._spool_lines = len(self._uncommitted)
+        try:
+            old.close()
+        except Exception:
+            pass
+
+    def _spool_files(self) -> List[str]:
+        """The shared (pre per-process) spool plus every `<spool_path>.<pid>` file"""
+        d = os.path.dirname(self.spool_path) or "."
+        base = os.path.basename(self.spool_path)
+        try:
+            names = os.listdir(d)
+        except OSError:
+            return []
+        return sorted(
+            os.path.join(d, name) for name in names
+            if name == base or (name.startswith(base + ".") and name[len(base) + 1:].isdigit())
+        )
+
+    def _replay_file(self, path: str) -> int:
+        """Insert the uncommitted rows of one dead process's spool, then delete it"""
+        try:
+            f = open(path, "r+", encoding="utf-8")
+        except OSError:
+            return 0
+        try:
+            if not _try_lock(f):
+                return 0  # owner is alive
+            rows: Dict[int, Tuple[str, Sequence[Any]]] = {}
+            committed: Set[int] = set()
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except Exception:
+                    continue  # torn last line
+                if "c" in rec:
+                    committed.update(rec["c"])
+                elif "s" in rec:
+                    rows[int(rec["s"])] = (rec["q"], rec["p"])
+            pending = [(seq, sql, params) for seq, (sql, params) in sorted(rows.items()) if seq not in committed]
+            if pending:
+                conn = self._connect()
+                try:
+                    self._write_rows_individually(conn, pending, RuntimeError("replay"))
+                finally:
+                    conn.close()
+            # Emptied before unlinking: a replayer that opened it meanwhile finds nothing to redo
+            f.truncate(0)
+            os.remove(path)
+            return len(pending)
+        finally:
+            f.close()
+
+    def replay(self) -> int:
+        """Insert rows that dead processes spooled but never committed; returns how many"""
+        if not self.spool_path:
+            return 0
+        replayed = 0
+        for path in self._spool_files():
+            if path == self.own_spool_path and self._spool_file is not None:
+                continue
+            replayed += self._replay_file(path)
+        if replayed:
+            try:
+                log_process({"type": "write_behind_replayed", "rows": replayed})
+            except Exception:
+                pass
+        return replayed
+
+
+def _try_lock(f: IO[str]) -> bool:
+    """Non-blocking exclusive flock; True when we hold it (or locking is unavailable)"""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
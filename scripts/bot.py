@@ -1,15 +1,18 @@
 # bot.py
 import time
 import atexit
+import queue
 import signal
+import threading
 import sys
 import os
 from datetime import datetime
 from typing import Optional
 from app.logger_utils import log_process, log_heartbeat, mirror_stdout_line
 from app.toggles import signals_enabled
-from app.storage import init_db
+from app.storage import init_db, close_connections, flush_writes, start_checkpointer
 from app.notify import send_telegram_alert
+from app.telegram_sender import flush_telegram
 from app.signal_processor import SignalProcessor
 
 # Ensure project root is importable when running this script directly
@@ -211,6 +214,8 @@ def acquire_singleton_lock() -> bool:
 def signal_handler(sig, frame):
     global shutdown_flag
     _out("\nShutdown signal received. Gracefully stopping bot...")
+    # Only set the flag: the handler can land mid-put on the write-behind queue,
+    # so queued inserts are flushed by run_bot on its way out instead
     shutdown_flag = True
 
 
@@ -228,6 +233,7 @@ def initialize_bot() -> bool:
 	try:
 		init_db()
 		# ensure_indices() # Disabled - function not available yet
+		start_checkpointer()  # WAL mode only; the bot is the long-lived writer
 		_out("Database initialized successfully")
 	except Exception as e:
 		_out(f"Failed to initialize database: {e}")
@@ -312,6 +318,144 @@ def run_periodic_tasks(last_track_time: float) -> float:
 	return last_track_time
 
 
+def inject_fallback_feed(feed: dict, is_smart_cycle: bool) -> dict:
+	"""If the upstream feed page is empty, fill it from GeckoTerminal/DexScreener fallbacks."""
+	if feed.get("transactions"):
+		return feed
+	try:
+		from app.fetch_feed import _fallback_feed_from_geckoterminal, _fallback_feed_from_dexscreener
+	except Exception:
+		_fallback_feed_from_geckoterminal = None  # type: ignore
+		_fallback_feed_from_dexscreener = None  # type: ignore
+	_out("No new transactions found")
+	fallback_items = []
+	try:
+		if _fallback_feed_from_geckoterminal:
+			fallback_items = _fallback_feed_from_geckoterminal(limit=40)
+	except Exception:
+		fallback_items = []
+	if not fallback_items:
+		try:
+			if _fallback_feed_from_dexscreener:
+				fallback_items = _fallback_feed_from_dexscreener(limit=40, smart_money_only=is_smart_cycle)
+		except Exception:
+			fallback_items = []
+	try:
+		_out(f"Fallback items count: {len(fallback_items) if fallback_items else 0}")
+	except Exception:
+		pass
+	if fallback_items:
+		feed["transactions"] = fallback_items
+		items_count = len(fallback_items)
+		_out(f"Using fallback feed items: {items_count}")
+		try:
+			log_process({
+				"type": "feed_fallback_injected",
+				"count": items_count,
+				"smart_cycle": bool(is_smart_cycle),
+			})
+		except Exception:
+			pass
+	return feed
+
+
+class FeedPrefetcher:
+	"""
+	Background producer that fetches feed pages ahead of the processing loop.
+	
+	Pages alternate general/smart cycles exactly like the sequential loop and are
+	handed over through a bounded queue, so at most `depth` pages wait while the
+	current one is analysed. Fetch starts are paced to `interval_sec`; cooldowns
+	from the feed (rate limit / quota) are absorbed in the fetcher thread.
+	"""
+	
+	def __init__(self, depth: int = 1, interval_sec: float = 60, should_fetch=None, fetch=None):
+		self.interval_sec = max(0.0, float(interval_sec))
+		self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max(1, int(depth)))
+		self._should_fetch = should_fetch or (lambda: True)
+		self._fetch = fetch
+		self._stop = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+		self._is_smart_cycle = False
+		self.cursor_general = None
+		self.cursor_smart = None
+	
+	def start(self) -> None:
+		if self._thread is not None and self._thread.is_alive():
+			return
+		self._stop.clear()
+		self._thread = threading.Thread(target=self._run, name="feed-prefetch", daemon=True)
+		self._thread.start()
+	
+	def stop(self, timeout: float = 5.0) -> None:
+		self._stop.set()
+		if self._thread is not None:
+			self._thread.join(timeout=timeout)
+			self._thread = None
+	
+	def queue_depth(self) -> int:
+		return self._queue.qsize()
+	
+	def get_page(self, timeout: Optional[float] = None) -> Optional[dict]:
+		"""Next fetched page ({feed, is_smart, fetched_at}) or None on timeout."""
+		try:
+			return self._queue.get(timeout=timeout)
+		except queue.Empty:
+			return None
+	
+	def fetch_next(self) -> dict:
+		"""Fetch one page for the current cycle, advance its cursor and flip the cycle."""
+		fetch = self._fetch
+		if fetch is None:
+			from app.fetch_feed import fetch_solana_feed
+			fetch = fetch_solana_feed
+		is_smart = self._is_smart_cycle
+		if is_smart:
+			feed = fetch(self.cursor_smart, smart_money_only=True)
+			self.cursor_smart = feed.get("next_cursor")
+		else:
+			feed = fetch(self.cursor_general, smart_money_only=False)
+			self.cursor_general = feed.get("next_cursor")
+		self._is_smart_cycle = not is_smart
+		return {"feed": feed, "is_smart": is_smart, "fetched_at": time.time()}
+	
+	def _put(self, page: dict) -> bool:
+		# Block while the queue is full (bounded read-ahead) but stay responsive to stop()
+		while not self._stop.is_set() and not shutdown_flag:
+			try:
+				self._queue.put(page, timeout=0.5)
+				return True
+			except queue.Full:
+				continue
+		return False
+	
+	def _run(self) -> None:
+		next_fetch_at = 0.0
+		while not self._stop.is_set() and not shutdown_flag:
+			wait = next_fetch_at - time.time()
+			if wait > 0:
+				self._stop.wait(min(wait, 1.0))
+				continue
+			if not self._should_fetch():
+				self._stop.wait(1.0)
+				continue
+			next_fetch_at = time.time() + self.interval_sec
+			try:
+				page = self.fetch_next()
+			except Exception as e:
+				_out(f"Feed prefetch error: {e}")
+				continue
+			feed = page["feed"]
+			feed_error = feed.get("error")
+			if feed_error in ("rate_limited", "quota_exceeded"):
+				handle_cooldown(feed_error, int(feed.get("retry_after_sec") or 0))
+				next_fetch_at = 0.0
+				continue
+			inject_fallback_feed(feed, page["is_smart"])
+			if not self._put(page):
+				break
+
+
 def run_bot():
     # Emergency kill switch check
     if os.getenv("KILL_SWITCH", "false").strip().lower() == "true":
@@ -320,11 +464,6 @@ def run_bot():
 
     # Helper imports kept local to reduce import-time requirements
     from app.fetch_feed import fetch_solana_feed
-    try:
-        from app.fetch_feed import _fallback_feed_from_geckoterminal, _fallback_feed_from_dexscreener
-    except Exception:
-        _fallback_feed_from_geckoterminal = None  # type: ignore
-        _fallback_feed_from_dexscreener = None  # type: ignore
     try:
         from app.config_unified import CURRENT_GATES
     except Exception:
@@ -344,6 +483,7 @@ def run_bot():
     last_track_time = 0
 
     from app.config_unified import HIGH_CONFIDENCE_SCORE, FETCH_INTERVAL
+    from app.config_unified import FEED_DETAIL_MAX_WORKERS, FEED_PAGE_DEADLINE_SEC, FEED_PREFETCH_DEPTH
     _out("SMART MONEY ENHANCED SOLANA MEMECOIN BOT STARTED")
     _out(f"Configuration: Score threshold = {HIGH_CONFIDENCE_SCORE}, Fetch interval = {FETCH_INTERVAL}s")
     if 'CURRENT_GATES' in globals() and CURRENT_GATES:
@@ -352,6 +492,10 @@ def run_bot():
     _out("Features: Smart Money Detection + Enhanced Scoring + Detailed Analysis")
     _out("Smart-money cycle enabled (top_wallets=true, min_wallet_pnl=1000)")
     _out("Adaptive cooldown on Cielo rate limits is enabled")
+    if FEED_DETAIL_MAX_WORKERS > 1:
+        _out(f"Concurrent detailed analysis: {FEED_DETAIL_MAX_WORKERS} workers, {FEED_PAGE_DEADLINE_SEC:.0f}s page deadline")
+    if FEED_PREFETCH_DEPTH > 0:
+        _out(f"Pipelined feed fetch: prefetch queue depth {FEED_PREFETCH_DEPTH}")
     
     # Send startup notification
     startup_message = (
@@ -378,6 +522,18 @@ def run_bot():
     # OPTIMIZED: Initialize SignalProcessor (replaces duplicate logic)
     processor = SignalProcessor({})
     
+    # Optional producer/consumer pipeline: fetch the next pages while this one is processed
+    prefetcher: Optional[FeedPrefetcher] = None
+    if FEED_PREFETCH_DEPTH > 0:
+        prefetcher = FeedPrefetcher(
+            depth=FEED_PREFETCH_DEPTH,
+            interval_sec=FETCH_INTERVAL,
+            should_fetch=lambda: (
+                os.getenv("KILL_SWITCH", "false").strip().lower() != "true" and signals_enabled()
+            ),
+        )
+        prefetcher.start()
+    
     is_smart_cycle = False
     while not shutdown_flag:
         try:
@@ -397,21 +553,29 @@ def run_bot():
                     time.sleep(1)
                 continue
 
-            # Alternate between general feed and smart-money-only feed
-            if is_smart_cycle:
-                feed = fetch_solana_feed(cursor_smart, smart_money_only=True)
-                cursor_smart = feed.get("next_cursor")
+            if prefetcher is not None:
+                # Pipelined: take the next ready page; cooldowns are handled by the fetcher
+                page = prefetcher.get_page(timeout=1.0)
+                if page is None:
+                    continue
+                feed = page["feed"]
+                is_smart_cycle = page["is_smart"]
             else:
-                feed = fetch_solana_feed(cursor_general, smart_money_only=False)
-                cursor_general = feed.get("next_cursor")
-
-            # Handle adaptive cooldown on rate limit / quota exhaust
-            feed_error = feed.get("error")
-            if feed_error in ("rate_limited", "quota_exceeded"):
-                retry_after_sec = int(feed.get("retry_after_sec") or 0)
-                handle_cooldown(feed_error, retry_after_sec)
-                is_smart_cycle = not is_smart_cycle
-                continue
+                # Alternate between general feed and smart-money-only feed
+                if is_smart_cycle:
+                    feed = fetch_solana_feed(cursor_smart, smart_money_only=True)
+                    cursor_smart = feed.get("next_cursor")
+                else:
+                    feed = fetch_solana_feed(cursor_general, smart_money_only=False)
+                    cursor_general = feed.get("next_cursor")
+
+                # Handle adaptive cooldown on rate limit / quota exhaust
+                feed_error = feed.get("error")
+                if feed_error in ("rate_limited", "quota_exceeded"):
+                    retry_after_sec = int(feed.get("retry_after_sec") or 0)
+                    handle_cooldown(feed_error, retry_after_sec)
+                    is_smart_cycle = not is_smart_cycle
+                    continue
 
             # Log the number of items returned this cycle for visibility
             items_count = len(feed.get("transactions", []))
@@ -421,16 +585,6 @@ def run_bot():
                 set_queue_len(items_count)
             except Exception:
                 pass
-            try:
-                log_heartbeat(os.getpid(), extra={
-                    "cycle": ("smart" if is_smart_cycle else "general"),
-                    "feed_items": items_count,
-                    "processed_count": processed_count,
-                    "api_calls_saved": api_calls_saved,
-                    "alerts_sent": alert_count,
-                })
-            except Exception:
-                pass
             # Metrics: update gauges for cycle and feed size
             if _metrics.get("enabled"):
                 try:
@@ -440,73 +594,91 @@ def run_bot():
                     pass
             
             # If upstream feed is empty, attempt local fallbacks to keep signals flowing
-            if not feed.get("transactions"):
-                _out("No new transactions found")
-                fallback_items = []
-                try:
-                    if _fallback_feed_from_geckoterminal:
-                        fallback_items = _fallback_feed_from_geckoterminal(limit=40)
-                except Exception:
-                    fallback_items = []
-                if not fallback_items:
-                    try:
-                        if _fallback_feed_from_dexscreener:
-                            fallback_items = _fallback_feed_from_dexscreener(limit=40, smart_money_only=is_smart_cycle)
-                    except Exception:
-                        fallback_items = []
-                try:
-                    _out(f"Fallback items count: {len(fallback_items) if fallback_items else 0}")
-                except Exception:
-                    pass
-                if fallback_items:
-                    feed["transactions"] = fallback_items
-                    items_count = len(fallback_items)
-                    _out(f"Using fallback feed items: {items_count}")
-                    try:
-                        log_process({
-                            "type": "feed_fallback_injected",
-                            "count": items_count,
-                            "smart_cycle": bool(is_smart_cycle),
-                        })
-                    except Exception:
-                        pass
+            # (the prefetcher already did this off-thread in pipelined mode)
+            if prefetcher is None:
+                feed = inject_fallback_feed(feed, is_smart_cycle)
             
             # OPTIMIZED: Use SignalProcessor for all feed items
-            for tx in feed.get("transactions", []):
+            transactions = feed.get("transactions", [])
+            if FEED_DETAIL_MAX_WORKERS > 1 and transactions:
+                # Concurrent mode: stats fetched on a bounded pool, results applied in feed order
                 try:
-                    if shutdown_flag:
-                        break
-                    
-                    # Process feed item using optimized SignalProcessor
-                    result = processor.process_feed_item(tx, is_smart_cycle)
-                    
+                    results = processor.process_feed_page(
+                        transactions,
+                        is_smart_cycle,
+                        max_workers=FEED_DETAIL_MAX_WORKERS,
+                        deadline_sec=FEED_PAGE_DEADLINE_SEC,
+                        should_stop=lambda: shutdown_flag,
+                    )
+                except Exception as e:
+                    _out(f"Error processing feed page: {e}")
+                    results = []
+                for result in results:
                     processed_count += 1
-                    
-                    # Track API calls saved
                     if result.api_calls_saved:
                         api_calls_saved += result.api_calls_saved
-                    
-                    # Handle alerts
                     if result.is_alert and result.token_address:
                         session_alerted_tokens.add(result.token_address)
                         alert_count += 1
-                    
-                except Exception as e:
-                    # Don't let one bad transaction crash the entire loop
-                    _out(f"Error processing transaction: {e}")
+                    elif result.is_error:
+                        _out(f"Error processing transaction: {result.error_message}")
+            else:
+                # Score the page in one vectorized pass, then process items one by one
+                prelim_scores = processor.score_feed_page(transactions)
+                for tx, prelim in zip(transactions, prelim_scores):
                     try:
-                        log_process({
-                            "type": "transaction_error",
-                            "error": str(e),
-                            "token": tx.get("token1_address") or tx.get("token0_address") or "unknown",
-                        })
-                    except Exception:
-                        pass
-                    continue
+                        if shutdown_flag:
+                            break
+                        
+                        # Process feed item using optimized SignalProcessor
+                        result = processor.process_feed_item(tx, is_smart_cycle, preliminary_score=prelim)
+                        
+                        processed_count += 1
+                        
+                        # Track API calls saved
+                        if result.api_calls_saved:
+                            api_calls_saved += result.api_calls_saved
+                        
+                        # Handle alerts
+                        if result.is_alert and result.token_address:
+                            session_alerted_tokens.add(result.token_address)
+                            alert_count += 1
+                        
+                    except Exception as e:
+                        # Don't let one bad transaction crash the entire loop
+                        _out(f"Error processing transaction: {e}")
+                        try:
+                            log_process({
+                                "type": "transaction_error",
+                                "error": str(e),
+                                "token": tx.get("token1_address") or tx.get("token0_address") or "unknown",
+                            })
+                        except Exception:
+                            pass
+                        continue
+
+            # Heartbeat after processing so the gate trace covers this cycle
+            try:
+                log_heartbeat(os.getpid(), extra={
+                    "cycle": ("smart" if is_smart_cycle else "general"),
+                    "feed_items": items_count,
+                    "processed_count": processed_count,
+                    "api_calls_saved": api_calls_saved,
+                    "alerts_sent": alert_count,
+                    "prefetch_queue": (prefetcher.queue_depth() if prefetcher is not None else None),
+                    # Per-gate timings/outcomes for the page just processed
+                    "gate_trace": processor.tracer.summary(reset=True),
+                })
+            except Exception:
+                pass
 
             # Periodic maintenance and tracking
             last_track_time = run_periodic_tasks(last_track_time)
 
+            if prefetcher is not None:
+                # The fetcher paces requests; go straight to the next queued page
+                continue
+            
             if not shutdown_flag:
                 _out(f"Sleeping for {FETCH_INTERVAL} seconds...")
                 for _ in range(FETCH_INTERVAL):
@@ -524,6 +696,13 @@ def run_bot():
             _out("Continuing after error...")
             time.sleep(30)  # Wait before retrying
     
+    if prefetcher is not None:
+        prefetcher.stop()
+    processor.shutdown()
+    # Commit queued storage inserts before the (possibly slow) Telegram drain
+    if not flush_writes(timeout=5.0):
+        _out("Storage writer did not commit all queued rows; they stay in the spool for the next start")
+    
     # Send shutdown notification
     shutdown_message = (
         "<b>Solana Memecoin Bot Stopped</b>\n\n"
@@ -533,6 +712,9 @@ def run_bot():
         "<b>Status:</b> Bot shutdown complete"
     )
     send_telegram_alert(shutdown_message)
+    if not flush_telegram(timeout=15.0):
+        _out("Telegram sender did not drain before shutdown; some messages may be lost")
+    close_connections()
     _out(f"Bot stopped gracefully. Processed {processed_count} tokens, sent {alert_count} alerts.")
 
 
@@ -8,6 +8,14 @@ import socket
 import requests
 from datetime import datetime
 
+def _take_rate_token():
+    """Draw from the trader's shared Jupiter bucket (lowest lane) so diagnostics never cause 429s for exits"""
+    try:
+        from app.jupiter_client import get_jupiter_client
+        get_jupiter_client()._acquire_rate_token("health")
+    except ImportError:
+        pass
+
 def test_dns_resolution():
     """Test DNS resolution for Jupiter API"""
     print("="*60)
@@ -45,6 +53,7 @@ def test_api_health():
     
     for endpoint in endpoints:
         try:
+            _take_rate_token()
             # Test with a simple SOL/USDC quote
             if "v6/quote" in endpoint:
                 r = requests.get(
@@ -87,6 +96,7 @@ def test_memecoin_quote():
     memecoin = "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263"
     
     try:
+        _take_rate_token()
         r = requests.get(
             "https://quote-api.jup.ag/v6/quote",
             params={
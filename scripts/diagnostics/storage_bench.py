@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Storage micro-benchmarks for the signals database (app/storage.py).
+
+    python scripts/diagnostics/storage_bench.py conn [--iterations N]
+    python scripts/diagnostics/storage_bench.py writes [--iterations N]
+    python scripts/diagnostics/storage_bench.py concurrency [--readers N] [--seconds S]
+
+conn: per-candidate hot path (has_been_alerted miss, record_token_activity,
+get_recent_token_signals) with connect-per-call vs the pooled connections.
+
+writes: append-only inserts (token activity, tx snapshots, wallet first buys)
+committed one by one vs group-committed by the write-behind writer; reports
+caller-side throughput/latency and the writer's commit latency.
+
+concurrency: one writer process (record_token_activity) plus N reader
+processes (dashboard-style aggregate + per-token lookups) on one database,
+in DELETE and in WAL journal mode; reports ops/s per role and lock errors.
+
+Runs against a throwaway database in a temp directory; never touches var/.
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app import storage  # noqa: E402
+from app.database_config import DatabasePaths  # noqa: E402
+from app.sqlite_pool import ConnectionManager, DEFAULT_PRAGMAS  # noqa: E402
+from app.sqlite_wal import journal_pragmas  # noqa: E402
+
+
+def _connect_per_call() -> sqlite3.Connection:
+    """The pre-pool _get_conn: new connection + PRAGMAs on every call"""
+    conn = sqlite3.connect(storage.DB_FILE, timeout=10)
+    for pragma in storage._connections.pragmas:
+        conn.execute(pragma)
+    return conn
+
+
+def _candidate_path(i: int, tag: str) -> None:
+    token = f"{tag}Token{i:08d}"
+    storage.has_been_alerted(token)
+    storage.record_token_activity(token, 1000.0, 3, False, 4)
+    storage.get_recent_token_signals(token, 300)
+
+
+def _time(label: str, n: int, fn) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {n:>6} iters  {elapsed:8.3f}s  {elapsed / n * 1e6:9.1f} us/iter  {n / elapsed:9.1f} iter/s")
+    return elapsed
+
+
+def bench_conn(iterations: int) -> None:
+    pooled_get_conn = storage._get_conn
+    try:
+        storage._get_conn = _connect_per_call
+        before = _time("connect-per-call", iterations, lambda i: _candidate_path(i, "a"))
+    finally:
+        storage._get_conn = pooled_get_conn
+    after = _time("pooled (per-thread)", iterations, lambda i: _candidate_path(i, "b"))
+    print(f"speedup: {before / after:.2f}x   pool stats: {storage._connections.stats()}")
+
+
+def _insert_burst(i: int) -> None:
+    token = f"Token{i % 50:04d}"
+    storage.record_token_activity(token, 250.0, 1, i % 7 == 0, 5, f"Trader{i:08d}")
+    storage.record_transaction_snapshot(token, f"sig{i:010d}", time.time(), amount_usd=250.0, tx_type="buy")
+    storage.record_wallet_first_buy(token, f"Wallet{i:08d}", time.time(), amount_usd=250.0)
+
+
+def bench_writes(iterations: int) -> None:
+    rows = iterations * 3
+    storage.STORAGE_WRITE_BEHIND = False
+    before = _time("per-row commit", iterations, _insert_burst)
+    print(f"{'':<28} {rows / before:9.1f} rows/s")
+
+    storage.STORAGE_WRITE_BEHIND = True
+    storage.STORAGE_WRITE_SPOOL = os.path.join(os.path.dirname(storage.DB_FILE), "writes.spool")
+    start = time.perf_counter()
+    after = _time("write-behind (enqueue)", iterations, lambda i: _insert_burst(i + iterations))
+    storage.flush_writes(timeout=60)
+    total = time.perf_counter() - start
+    stats = dict(storage._writer.stats)
+    storage.STORAGE_WRITE_BEHIND = False
+    print(f"{'':<28} {rows / total:9.1f} rows/s committed (incl. final flush {total - after:.3f}s)")
+    commits = max(1, stats["commits"])
+    print(f"writer: {int(stats['commits'])} commits, {stats['rows'] / commits:.1f} rows/commit, "
+          f"commit avg {stats['commit_sec'] / commits * 1e3:.2f} ms max {stats['max_commit_sec'] * 1e3:.2f} ms, "
+          f"{int(stats['inline'])} inline (backpressure)")
+    print(f"caller speedup: {before / after:.2f}x   end-to-end: {before / total:.2f}x")
+
+
+def _use_journal_mode(path: str, mode: str) -> None:
+    storage.DB_FILE = DatabasePaths.SIGNALS_DB = path
+    storage.JOURNAL_MODE = mode
+    storage._connections = ConnectionManager(pragmas=journal_pragmas(mode) + DEFAULT_PRAGMAS)
+
+
+def _worker(role: str, path: str, mode: str, seconds: float, start_at: float, results) -> None:
+    _use_journal_mode(path, mode)
+    ops = errors = 0
+    worst = 0.0
+    while time.time() < start_at:
+        time.sleep(0.001)
+    deadline = start_at + seconds
+    i = 0
+    while time.time() < deadline:
+        t0 = time.perf_counter()
+        try:
+            if role == "writer":
+                storage.record_token_activity(f"Token{i % 200:04d}", 100.0, 1, False, 4, f"Trader{i}")
+            else:
+                conn = storage._get_conn()
+                conn.execute(
+                    "SELECT token_address, COUNT(*), SUM(usd_value) FROM token_activity "
+                    "GROUP BY token_address ORDER BY 2 DESC LIMIT 20"
+                ).fetchall()
+                conn.close()
+                storage.get_recent_token_signals(f"Token{i % 200:04d}", 3600)
+            ops += 1
+        except Exception:
+            errors += 1
+        worst = max(worst, time.perf_counter() - t0)
+        i += 1
+    storage.close_connections()
+    results.put((role, ops, errors, worst))
+
+
+def bench_concurrency(tmp: str, readers: int, seconds: float) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    for mode in ("delete", "wal"):
+        path = os.path.join(tmp, f"concurrency_{mode}.db")
+        _use_journal_mode(path, mode)
+        storage.init_db()
+        conn = storage._get_conn()
+        conn.executemany(  # something for the readers to aggregate
+            "INSERT INTO token_activity (token_address, observed_at, usd_value, transaction_count, "
+            "smart_money_involved, preliminary_score) VALUES (?, datetime('now'), 100.0, 1, 0, 4)",
+            [(f"Token{i % 200:04d}",) for i in range(5000)],
+        )
+        conn.commit()
+        conn.close()
+        storage.close_connections()
+
+        results = ctx.Queue()
+        start_at = time.time() + 2.0  # let every process finish importing first
+        roles = ["writer"] + ["reader"] * readers
+        procs = [ctx.Process(target=_worker, args=(role, path, mode, seconds, start_at, results)) for role in roles]
+        for p in procs:
+            p.start()
+        rows = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+        for role in ("writer", "reader"):
+            mine = [r for r in rows if r[0] == role]
+            ops = sum(r[1] for r in mine)
+            errors = sum(r[2] for r in mine)
+            worst = max(r[3] for r in mine)
+            print(f"{mode:<7} {role:<7} x{len(mine):<3} {ops / seconds:9.1f} ops/s  "
+                  f"{errors:>5} errors  worst {worst * 1e3:8.1f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bench", choices=["conn", "writes", "concurrency"])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.DB_FILE = DatabasePaths.SIGNALS_DB = os.path.join(tmp, "alerted_tokens.db")
+        storage.init_db()
+        if args.bench == "conn":
+            bench_conn(args.iterations)
+        elif args.bench == "writes":
+            bench_writes(args.iterations)
+        elif args.bench == "concurrency":
+            bench_concurrency(tmp, args.readers, args.seconds)
+        storage.close_connections()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -12,6 +12,7 @@ import sys
 import os
 import time
 from datetime import datetime
+from typing import Optional
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -20,54 +21,72 @@ from app.storage import (
     get_alerted_tokens_for_tracking,
     record_price_snapshot,
     update_token_performance,
-    get_performance_summary
+    get_performance_summary,
+    close_connections,
 )
 from app.logger_utils import _out
 
 
-def get_token_price_free(token_address: str) -> dict:
+def prefetch_dexscreener_pairs(tokens: list) -> dict:
+    """
+    Resolve DexScreener pairs for a whole tracking cycle in batched calls
+    (up to 30 mints per request). Returns {token: pairs}; failed lookups are omitted.
+    """
+    try:
+        from app.dexscreener_batch import get_batcher
+        resolved = get_batcher().get_pairs_many(list(tokens))
+        return {t: p for t, p in resolved.items() if p is not None}
+    except Exception as e:
+        _out(f"DexScreener batch prefetch failed: {e}")
+        return {}
+
+
+def get_token_price_free(token_address: str, pairs: Optional[list] = None) -> dict:
     """
     Get token price using ONLY free APIs (no Cielo credits burned).
     Tries multiple sources for reliability.
     
+    pairs: DexScreener pairs already resolved by prefetch_dexscreener_pairs
+    (skips the per-token DexScreener request).
+    
     Returns dict with price data in the same format as get_token_stats()
     """
     from app.http_client import request_json
     
     # Try 1: DexScreener (most reliable for Solana)
     try:
-        url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-        result = request_json("GET", url, timeout=10)
+        if pairs is None:
+            url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
+            result = request_json("GET", url, timeout=10)
+            if result.get("status_code") == 200:
+                data = result.get("json") or {}
+                pairs = data.get("pairs") or []
         
-        if result.get("status_code") == 200:
-            data = result.get("json") or {}
-            pairs = data.get("pairs") or []
+        if pairs:
+            # Pick the most liquid pair
+            best_pair = max(pairs, key=lambda p: float(p.get("liquidity", {}).get("usd", 0) or 0))
             
-            if pairs:
-                # Pick the most liquid pair
-                best_pair = max(pairs, key=lambda p: float(p.get("liquidity", {}).get("usd", 0) or 0))
+            price_usd = float(best_pair.get("priceUsd", 0))
+            if price_usd > 0:
+                price_change = best_pair.get("priceChange") or {}
+                volume = best_pair.get("volume") or {}
                 
-                price_usd = float(best_pair.get("priceUsd", 0))
-                if price_usd > 0:
-                    price_change = best_pair.get("priceChange") or {}
-                    volume = best_pair.get("volume") or {}
-                    
-                    return {
-                        "price": {
-                            "price_usd": price_usd,
-                            "price_change_1h": float(price_change.get("h1", 0) or 0),
-                            "price_change_6h": float(price_change.get("h6", 0) or 0),
-                            "price_change_24h": float(price_change.get("h24", 0) or 0),
-                        },
-                        "volume": {
-                            "volume_24h": float(volume.get("h24", 0) or 0),
-                        },
-                        "liquidity": {
-                            "liquidity_usd": float(best_pair.get("liquidity", {}).get("usd", 0) or 0),
-                        },
-                        "market_cap_usd": best_pair.get("marketCap"),
-                        "source": "dexscreener_free"
-                    }
+                return {
+                    "price": {
+                        "price_usd": price_usd,
+                        "price_change_1h": float(price_change.get("h1", 0) or 0),
+                        "price_change_6h": float(price_change.get("h6", 0) or 0),
+                        "price_change_24h": float(price_change.get("h24", 0) or 0),
+                    },
+                    "volume": {
+                        "volume_24h": float(volume.get("h24", 0) or 0),
+                    },
+                    "liquidity": {
+                        "liquidity_usd": float(best_pair.get("liquidity", {}).get("usd", 0) or 0),
+                    },
+                    "market_cap_usd": best_pair.get("marketCap"),
+                    "source": "dexscreener_free"
+                }
     except Exception as e:
         _out(f"DexScreener free API failed: {e}")
     
@@ -125,7 +144,7 @@ def get_token_price_free(token_address: str) -> dict:
     return {}
 
 
-def track_token_performance(token_address: str, retry_count: int = 0) -> bool:
+def track_token_performance(token_address: str, retry_count: int = 0, pairs: Optional[list] = None) -> bool:
     """
     Fetch current stats for a token and update performance metrics.
     Returns True if successful, False if token no longer exists.
@@ -136,7 +155,7 @@ def track_token_performance(token_address: str, retry_count: int = 0) -> bool:
     try:
         # TRACKER OPTIMIZATION: Use ONLY free APIs (no Cielo credits)
         # This is perfect for historical tracking where we just need basic price data
-        stats = get_token_price_free(token_address)
+        stats = get_token_price_free(token_address, pairs=pairs)
         
         if not stats:
             # For very new tokens, this is expected - they're not indexed yet
@@ -258,16 +277,21 @@ def main():
             else:
                 _out(f"Tracking {len(tokens)} tokens...")
                 
+                # One DexScreener request per 30 tokens instead of one per token
+                pairs_by_token = prefetch_dexscreener_pairs(tokens)
+                
                 success_count = 0
                 failed_count = 0
                 for token in tokens:
-                    if track_token_performance(token):
+                    pairs = pairs_by_token.get(token)
+                    if track_token_performance(token, pairs=pairs):
                         success_count += 1
                         consecutive_failures = 0  # Reset on success
                     else:
                         failed_count += 1
-                    # Increased delay between tokens to avoid rate limits
-                    time.sleep(5)
+                    # Delay only when per-token free APIs were hit, to avoid rate limits
+                    if not pairs:
+                        time.sleep(5)
                 
                 if success_count > 0:
                     _out(f"✅ Updated {success_count}/{len(tokens)} tokens")
@@ -299,6 +323,7 @@ def main():
         except KeyboardInterrupt:
             _out("\n👋 Tracker stopped by user")
             print_summary()
+            close_connections()
             break
         except Exception as e:
             _out(f"❌ Error in tracking loop: {e}")
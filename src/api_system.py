@@ -72,6 +72,9 @@ def get_system_health() -> Dict[str, Any]:
             c = conn.cursor()
             c.execute("SELECT MAX(alerted_at) FROM alerted_tokens")
             last_write = c.fetchone()[0]
+            if isinstance(last_write, (int, float)):
+                # alerted_at is stored as Unix seconds
+                last_write = datetime.fromtimestamp(last_write).isoformat(timespec="seconds")
             health["database"]["last_write"] = last_write
             conn.close()
         else:
@@ -205,7 +208,7 @@ def get_lifecycle_tracking() -> Dict[str, Any]:
         for row in c.fetchall():
             token_address, first_alert, last_checked = row
             try:
-                first_time = datetime.fromisoformat(first_alert)
+                first_time = datetime.fromtimestamp(float(first_alert))  # Unix seconds
                 age_hours = (now - first_time).total_seconds() / 3600
                 
                 if age_hours < 1:
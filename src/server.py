@@ -229,23 +229,23 @@ def _pick_signals_db_path(preferred_path: str) -> str:
 
 
 def _window_to_sqlite_clause(window: str) -> str:
-    """Return a SQLite datetime WHERE clause for first_alert_at based on a simple window string.
+    """Return a SQLite WHERE clause for first_alert_at (Unix seconds) based on a simple window string.
     Examples: '90m', '2h', '1d'. Defaults to 3 hours if unparsable.
     """
     try:
         w = (window or "").strip().lower()
         if w.endswith("m"):
             n = int(w[:-1] or "0")
-            return f"first_alert_at >= datetime('now','-{n} minute')"
+            return f"first_alert_at >= CAST(strftime('%s','now','-{n} minute') AS REAL)"
         if w.endswith("h"):
             n = int(w[:-1] or "0")
-            return f"first_alert_at >= datetime('now','-{n} hour')"
+            return f"first_alert_at >= CAST(strftime('%s','now','-{n} hour') AS REAL)"
         if w.endswith("d"):
             n = int(w[:-1] or "0")
-            return f"first_alert_at >= datetime('now','-{n} day')"
+            return f"first_alert_at >= CAST(strftime('%s','now','-{n} day') AS REAL)"
     except Exception:
         pass
-    return "first_alert_at >= datetime('now','-3 hour')"
+    return "first_alert_at >= CAST(strftime('%s','now','-3 hour') AS REAL)"
 
 
 def _paper_metrics(db_path: str, *, window: str, stop_pct: float, trail_retention: float,
@@ -484,9 +484,18 @@ def create_app() -> Flask:
             except Exception:
                 return None
 
+        # Feed-to-fill latency percentiles per hop (bot and trader both log signal_latency)
+        def _signal_latency(proc_rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+            try:
+                from app.latency_trace import summarize
+                return summarize(proc_rows)
+            except Exception:
+                return {}
+
         metrics = {
             "api_error_pct": _api_error_pct(process),
             "cache_hit_pct": _cache_hit_pct(process),
+            "signal_latency": _signal_latency(process),
         }
 
         data = {
@@ -866,7 +875,7 @@ def create_app() -> Flask:
                                t.final_score,
                                t.conviction_type
                         FROM alerted_tokens t
-                        ORDER BY datetime(t.alerted_at) DESC
+                        ORDER BY t.alerted_at DESC
                         LIMIT ?
                         """,
                         (limit,)
@@ -879,7 +888,7 @@ def create_app() -> Flask:
                                t.final_score,
                                NULL AS conviction_type
                         FROM alerted_tokens t
-                        ORDER BY datetime(t.alerted_at) DESC
+                        ORDER BY t.alerted_at DESC
                         LIMIT ?
                         """,
                         (limit,)
@@ -926,7 +935,7 @@ def create_app() -> Flask:
                                CASE WHEN s.is_rug = 1 THEN 'rug' ELSE NULL END AS outcome
                         FROM alerted_tokens t
                         LEFT JOIN alerted_token_stats s ON s.token_address = t.token_address
-                        ORDER BY datetime(COALESCE(s.last_checked_at, t.alerted_at)) DESC
+                        ORDER BY COALESCE(s.last_checked_at, t.alerted_at) DESC
                         LIMIT ?
                         """,
                         (limit,)
@@ -950,7 +959,7 @@ def create_app() -> Flask:
                                CASE WHEN s.is_rug = 1 THEN 'rug' ELSE NULL END AS outcome
                         FROM alerted_tokens t
                         LEFT JOIN alerted_token_stats s ON s.token_address = t.token_address
-                        ORDER BY datetime(COALESCE(s.last_checked_at, t.alerted_at)) DESC
+                        ORDER BY COALESCE(s.last_checked_at, t.alerted_at) DESC
                         LIMIT ?
                         """,
                         (limit,)
@@ -979,7 +988,7 @@ def create_app() -> Flask:
                            NULL AS outcome
                     FROM alerted_tokens t
                     LEFT JOIN alerted_token_stats s ON s.token_address = t.token_address
-                    ORDER BY datetime(t.alerted_at) DESC
+                    ORDER BY t.alerted_at DESC
                     LIMIT ?
                     """,
                     (limit,)
@@ -1298,7 +1307,7 @@ def create_app() -> Flask:
 
     # Optional SQL allowlist for safer admin queries
     _SQL_ALLOWLIST = {
-        "alerts_24h": "SELECT COUNT(1) AS alerts_24h FROM alerted_tokens WHERE alerted_at >= datetime('now','-1 day')",
+        "alerts_24h": "SELECT COUNT(1) AS alerts_24h FROM alerted_tokens WHERE alerted_at >= CAST(strftime('%s','now','-1 day') AS REAL)",
         "recent_open_positions": "SELECT id, token_address, open_at FROM positions WHERE status='open' ORDER BY datetime(open_at) DESC LIMIT 50",
     }
 
@@ -1443,7 +1452,7 @@ def _signals_metrics(db_path: str) -> Dict[str, Any]:
         cur.execute("SELECT COUNT(1) FROM alerted_tokens")
         out["total_alerts"] = int(cur.fetchone()[0])
         # 24h alerts
-        cur.execute("SELECT COUNT(1) FROM alerted_tokens WHERE alerted_at >= datetime('now','-1 day')")
+        cur.execute("SELECT COUNT(1) FROM alerted_tokens WHERE alerted_at >= CAST(strftime('%s','now','-1 day') AS REAL)")
         out["alerts_24h"] = int(cur.fetchone()[0])
         # Success rates (>=2x, >=5x, >=10x), denominator considers rows with valid first_price
         # Using max_gain_percent: 2x=100%, 5x=400%, 10x=900%
@@ -1478,7 +1487,7 @@ def _signals_metrics(db_path: str) -> Dict[str, Any]:
         cur.execute(
             """
             SELECT time_to_peak_price_s FROM (
-              SELECT CAST((JULIANDAY(peak_price_at)-JULIANDAY(first_alert_at))*86400 AS INTEGER) AS time_to_peak_price_s
+              SELECT CAST(peak_price_at - first_alert_at AS INTEGER) AS time_to_peak_price_s
               FROM alerted_token_stats
               WHERE peak_price_at IS NOT NULL AND first_alert_at IS NOT NULL
             )
@@ -1505,7 +1514,7 @@ def _signals_metrics(db_path: str) -> Dict[str, Any]:
               AVG(last_price_usd/first_price_usd) as avg_mul,
               SUM(CASE WHEN last_price_usd/first_price_usd > 1.0 THEN 1 ELSE 0 END) as winners
             FROM alerted_token_stats
-            WHERE first_alert_at >= datetime('now','-1 hour')
+            WHERE first_alert_at >= CAST(strftime('%s','now','-1 hour') AS REAL)
               AND first_price_usd > 0 AND last_price_usd IS NOT NULL
             """
         )
@@ -1520,11 +1529,11 @@ def _signals_metrics(db_path: str) -> Dict[str, Any]:
         # Daily counts (last 14 days)
         cur.execute(
             """
-            SELECT DATE(alerted_at), COUNT(1)
+            SELECT DATE(alerted_at, 'unixepoch') AS day, COUNT(1)
             FROM alerted_tokens
-            WHERE alerted_at >= DATE('now','-14 day')
-            GROUP BY DATE(alerted_at)
-            ORDER BY DATE(alerted_at)
+            WHERE alerted_at >= CAST(strftime('%s','now','-14 day') AS REAL)
+            GROUP BY day
+            ORDER BY day
             """
         )
         out["daily"] = [{"date": d, "count": int(c)} for d, c in (cur.fetchall() or [])]
@@ -1,8 +1,22 @@
 import os
 import sys
+import tempfile
 import pytest
 from unittest.mock import MagicMock
 
+# Keep runtime state (logs, DB, budget/treasury files) out of the repo's
+# data/ and var/ directories. Must run before any app module is imported,
+# since the paths are resolved at import time.
+_RUNTIME_DIR = tempfile.mkdtemp(prefix="callsbot-tests-")
+os.environ.setdefault("CALLSBOT_LOG_DIR", os.path.join(_RUNTIME_DIR, "logs"))
+os.environ.setdefault("DB_FILE", os.path.join(_RUNTIME_DIR, "alerted_tokens.db"))
+os.environ.setdefault("CALLSBOT_DB_FILE", os.path.join(_RUNTIME_DIR, "alerted_tokens.db"))
+os.environ.setdefault("CALLSBOT_BUDGET_FILE", os.path.join(_RUNTIME_DIR, "budget.json"))
+os.environ.setdefault("CALLSBOT_TRADING_DB", os.path.join(_RUNTIME_DIR, "trading.db"))
+os.environ.setdefault("CALLSBOT_ADMIN_DB", os.path.join(_RUNTIME_DIR, "admin.db"))
+os.environ.setdefault("CALLSBOT_TREASURY_DB", os.path.join(_RUNTIME_DIR, "treasury.json"))
+os.environ.setdefault("TS_TREASURY_FILE", os.path.join(_RUNTIME_DIR, "treasury.json"))
+
 # Ensure project root is importable for tests
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 if PROJECT_ROOT not in sys.path:
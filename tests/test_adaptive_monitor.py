@@ -0,0 +1,45 @@
+import threading
+import time
+
+from tradingSystem.adaptive_monitor import AdaptiveMonitor, ExitScheduler
+
+
+def test_interval_for_matches_tiers():
+    m = AdaptiveMonitor()
+    now = time.time()
+    assert m.interval_for(now - 600, 300.0, now)[0] == m.FAST_INTERVAL  # young position
+    assert m.interval_for(now - 2 * 3600, 100.0, now)[0] == m.MEDIUM_INTERVAL
+    assert m.interval_for(now - 2 * 3600, 300.0, now)[0] == m.SLOW_INTERVAL
+    assert m.interval_for(now - 2 * 3600, 800.0, now)[0] == m.ULTRA_SLOW_INTERVAL
+
+
+def test_scheduler_pops_only_due_positions():
+    s = ExitScheduler()
+    now = 1000.0
+    s.sync(["fast", "slow"], now=now)
+    assert sorted(s.pop_due(now)) == ["fast", "slow"]
+    s.schedule("fast", now + 5)
+    s.schedule("slow", now + 1800)
+    assert s.pop_due(now + 4) == []
+    assert s.pop_due(now + 5) == ["fast"]
+    # Rescheduling replaces the old deadline instead of duplicating it
+    s.schedule("slow", now + 60)
+    assert s.pop_due(now + 1800) == ["slow"]
+    assert len(s) == 0
+
+
+def test_sync_drops_closed_positions():
+    s = ExitScheduler()
+    s.schedule("gone", 10.0)
+    s.sync([], now=0.0)
+    assert s.pop_due(100.0) == [] and s.next_due_in() is None
+
+
+def test_wake_interrupts_sleep():
+    s = ExitScheduler()
+    s.schedule("slow", time.time() + 3600)
+    threading.Timer(0.1, s.wake, args=("new",)).start()
+    started = time.time()
+    s.wait(max_wait=5.0)
+    assert time.time() - started < 2.0
+    assert s.pop_due() == ["new"]
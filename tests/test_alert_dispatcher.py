@@ -0,0 +1,144 @@
+import threading
+import time
+
+from app.alert_dispatcher import AlertDispatcher
+
+
+def test_jobs_run_in_order_off_thread():
+    d = AlertDispatcher()
+    seen = []
+    caller = threading.get_ident()
+    d.submit("a", lambda: seen.append(("a", threading.get_ident())))
+    d.submit("b", lambda: seen.append(("b", threading.get_ident())))
+    assert d.flush(timeout=5)
+    assert [name for name, _ in seen] == ["a", "b"]
+    assert all(tid != caller for _, tid in seen)
+    d.stop()
+
+
+def test_failed_job_is_retried(monkeypatch):
+    import app.alert_dispatcher as ad
+
+    monkeypatch.setattr(ad.time, "sleep", lambda s: None)
+    d = AlertDispatcher(max_retries=3, run_async=False)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError("boom")
+
+    d.submit("telegram", flaky)
+    assert len(calls) == 3 and d.completed == 1 and d.failed == 0
+    d.submit("telegram", lambda: False, attempts=2)
+    assert d.failed == 1
+
+
+def test_throttle_only_delays_queued_jobs():
+    d = AlertDispatcher(min_interval_sec=0.3)
+    sent = []
+    start = time.time()
+    d.submit("telegram", lambda: sent.append(time.time()), throttled=True)
+    d.submit("telegram", lambda: sent.append(time.time()), throttled=True)
+    # submit() returns immediately even though the second send must wait
+    assert time.time() - start < 0.2
+    assert d.flush(timeout=5)
+    assert sent[1] - sent[0] >= 0.25
+    d.stop()
+
+
+def test_sleeping_human_send_does_not_hold_up_records():
+    from app.alert_dispatcher import HUMAN_LANE
+
+    d = AlertDispatcher()
+    release = threading.Event()
+    recorded = threading.Event()
+    d.submit("telegram", lambda: release.wait(5), throttled=True)
+    d.submit("telethon", lambda: None, lane=HUMAN_LANE)
+    d.submit("alert_metadata", recorded.set, attempts=1)
+    assert recorded.wait(2)
+    release.set()
+    assert d.flush(timeout=5)
+    d.stop()
+
+
+def test_full_lane_drops_oldest_without_blocking(monkeypatch):
+    import app.alert_dispatcher as ad
+
+    logged = []
+    monkeypatch.setattr(ad, "log_process", logged.append)
+    d = AlertDispatcher(max_queue=2)
+    release = threading.Event()
+    ran = []
+    d.submit("telegram", lambda: release.wait(5) and ran.append("first"), throttled=True)
+    # Wait for the worker to pick up the blocking job so the lane holds only what follows
+    deadline = time.time() + 2
+    while d.pending() and time.time() < deadline:
+        time.sleep(0.01)
+    caller = threading.get_ident()
+    start = time.time()
+    for i in range(4):
+        d.submit("telegram", lambda i=i: ran.append((i, threading.get_ident())), throttled=True)
+    assert time.time() - start < 0.2
+    assert d.dropped == 2
+    assert [rec["type"] for rec in logged] == ["alert_dispatch_dropped"] * 2
+    release.set()
+    assert d.flush(timeout=5)
+    assert [r[0] for r in ran[1:]] == [2, 3]
+    assert all(tid != caller for _, tid in ran[1:])
+    d.stop()
+
+
+def test_send_alert_pushes_to_traders_before_side_effects(monkeypatch):
+    import app.signal_processor as sp
+    from app.models import FeedTransaction, TokenStats
+
+    order = []
+    monkeypatch.setattr(sp, "push_signal_to_redis", lambda payload: order.append("trade") or True)
+    monkeypatch.setattr(sp, "mark_alerted", lambda *a, **k: order.append("mark"))
+    monkeypatch.setattr(sp, "send_telegram_alert", lambda msg: order.append("telegram") or True)
+    monkeypatch.setattr(sp, "send_group_message", lambda msg: order.append("telethon") or True)
+    monkeypatch.setattr("app.config_unified.TELETHON_ENABLED", True)
+    monkeypatch.setenv("DRY_RUN", "false")
+
+    proc = sp.SignalProcessor({})
+    proc._dispatcher = AlertDispatcher()
+    monkeypatch.setattr(proc, "_record_alert_metadata", lambda *a, **k: order.append("metadata"))
+    monkeypatch.setattr(proc, "_log_alert_event", lambda *a, **k: order.append("log"))
+
+    stats = TokenStats.from_api_response({"token_address": "AlertMint", "price_usd": 1.0, "market_cap_usd": 100000, "liquidity_usd": 50000})
+    feed_tx = FeedTransaction(token0_address="AlertMint", token1_address=None, usd_value=1000)
+    assert proc._send_alert("AlertMint", stats, 8, 5, "High Confidence (Strict)", [], feed_tx, True, None)
+    assert order[:2] == ["trade", "mark"]
+    proc.shutdown()
+    # Human channels and records run on separate lanes, each in order
+    rest = order[2:]
+    assert [o for o in rest if o in ("telegram", "telethon")] == ["telegram", "telethon"]
+    assert [o for o in rest if o in ("metadata", "log")] == ["metadata", "log"]
+
+
+def test_self_retrying_channels_run_once_and_telethon_is_skipped_when_disabled(monkeypatch):
+    import app.alert_dispatcher as ad
+    import app.signal_processor as sp
+    from app.models import FeedTransaction, TokenStats
+
+    calls = []
+    monkeypatch.setattr(ad.time, "sleep", lambda s: calls.append(("sleep", s)))
+    monkeypatch.setattr(ad, "log_process", lambda rec: calls.append(rec["channel"]))
+    monkeypatch.setattr(sp, "push_signal_to_redis", lambda payload: True)
+    monkeypatch.setattr(sp, "mark_alerted", lambda *a, **k: None)
+    monkeypatch.setattr(sp, "send_telegram_alert", lambda msg: calls.append("telegram") or False)
+    monkeypatch.setattr(sp, "send_group_message", lambda msg: calls.append("telethon") or False)
+    monkeypatch.setattr("app.config_unified.TELETHON_ENABLED", False)
+    monkeypatch.setenv("DRY_RUN", "false")
+
+    proc = sp.SignalProcessor({})
+    proc._dispatcher = AlertDispatcher(run_async=False)
+    monkeypatch.setattr(proc, "_record_alert_metadata", lambda *a, **k: calls.append("metadata") or False)
+    monkeypatch.setattr(proc, "_log_alert_event", lambda *a, **k: None)
+
+    stats = TokenStats.from_api_response({"token_address": "OnceMint", "price_usd": 1.0, "market_cap_usd": 100000, "liquidity_usd": 50000})
+    feed_tx = FeedTransaction(token0_address="OnceMint", token1_address=None, usd_value=1000)
+    assert proc._send_alert("OnceMint", stats, 8, 5, "High Confidence (Strict)", [], feed_tx, True, None)
+    # One attempt each, no backoff sleeps, and no Telethon job at all
+    assert calls == ["telegram", "telegram", "metadata", "alert_metadata"]
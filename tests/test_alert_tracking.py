@@ -0,0 +1,90 @@
+import sqlite3
+import time
+
+import pytest
+
+from app.sqlite_pool import ConnectionManager
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    from app import storage
+    from app.database_config import DatabasePaths
+
+    path = str(tmp_path / "alerted_tokens.db")
+    monkeypatch.setattr(storage, "DB_FILE", path)
+    monkeypatch.setattr(DatabasePaths, "SIGNALS_DB", path)
+    monkeypatch.setattr(storage, "_connections", ConnectionManager(pragmas=storage._connections.pragmas))
+    storage.init_db()
+    yield storage
+    storage.close_connections()
+
+
+def _raw(storage):
+    return sqlite3.connect(storage.DB_FILE)
+
+
+def test_tracking_backfills_stats_and_filters_window(storage):
+    now = time.time()
+    conn = _raw(storage)
+    conn.executemany(
+        "INSERT INTO alerted_tokens (token_address, alerted_at, final_score, conviction_type) VALUES (?, ?, ?, ?)",
+        [("Old", now - 3 * 86400, 7, "High"), ("Mid", now - 3600, 8, "High"), ("New", now - 60, 9, "Smart")],
+    )
+    conn.execute("INSERT INTO alerted_token_stats (token_address, first_alert_at, final_score) VALUES ('Mid', ?, 8)",
+                 (now - 3600,))
+    conn.commit()
+
+    assert storage.get_alerted_tokens_for_tracking() == ["New", "Mid"]
+    rows = dict(conn.execute("SELECT token_address, first_alert_at FROM alerted_token_stats").fetchall())
+    assert set(rows) == {"Mid", "New"}
+    assert rows["New"] == pytest.approx(now - 60)
+
+    # Idempotent: nothing left to backfill
+    assert storage.get_alerted_tokens_for_tracking() == ["New", "Mid"]
+    assert conn.execute("SELECT COUNT(*) FROM alerted_token_stats").fetchone()[0] == 2
+    conn.close()
+
+
+def test_text_alerted_at_is_normalised_to_unix_seconds(storage):
+    conn = _raw(storage)
+    # Inserted without alerted_at -> CURRENT_TIMESTAMP text; the trigger converts it
+    conn.execute("INSERT INTO alerted_tokens (token_address) VALUES ('Legacy')")
+    conn.execute("INSERT INTO alerted_tokens (token_address, alerted_at) VALUES ('Ancient', '2020-01-01 00:00:00')")
+    conn.commit()
+    rows = dict(conn.execute("SELECT token_address, alerted_at FROM alerted_tokens").fetchall())
+    assert rows["Legacy"] == pytest.approx(time.time(), abs=5)
+    assert rows["Ancient"] == 1577836800
+    conn.close()
+
+    # Old text timestamps no longer sort after every number and leak into the window
+    assert storage.get_alerted_tokens_for_tracking() == ["Legacy"]
+
+
+def test_migration_converts_existing_text_timestamps(tmp_path, monkeypatch):
+    from app.database_config import DatabasePaths
+    from app.migrations import get_signals_migrations
+
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE alerted_tokens (token_address TEXT PRIMARY KEY, alerted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, final_score INTEGER, smart_money_detected BOOLEAN, conviction_type TEXT)")
+    conn.execute("CREATE TABLE alerted_token_stats (token_address TEXT PRIMARY KEY, first_alert_at REAL, last_checked_at REAL)")
+    conn.execute("CREATE TABLE price_snapshots (token_address TEXT, snapshot_at REAL)")
+    conn.execute("CREATE TABLE token_activity (token_address TEXT, observed_at TIMESTAMP)")
+    conn.execute("INSERT INTO alerted_tokens (token_address, alerted_at) VALUES ('A', '2024-05-01T12:30:00.500'), ('B', 1714566600), ('C', 'garbage')")
+    conn.execute("INSERT INTO alerted_token_stats VALUES ('A', '2024-05-01 12:30:00', 1714566600.0)")
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(DatabasePaths, "SIGNALS_DB", path)
+    get_signals_migrations().run()
+
+    conn = sqlite3.connect(path)
+    rows = dict(conn.execute("SELECT token_address, alerted_at FROM alerted_tokens").fetchall())
+    assert rows == {"A": 1714566600.5, "B": 1714566600, "C": "garbage"}
+    assert conn.execute("SELECT first_alert_at FROM alerted_token_stats").fetchone()[0] == 1714566600.0
+    plan = " ".join(r[-1] for r in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT token_address FROM alerted_tokens WHERE alerted_at >= ? ORDER BY alerted_at DESC", (0,)
+    ))
+    assert "COVERING INDEX idx_alerted_tokens_alerted_at" in plan
+    conn.close()
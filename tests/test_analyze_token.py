@@ -63,3 +63,195 @@ def test_senior_and_junior_checks_nuanced():
     assert check_senior_nuanced(stats, token_address="abc") is True
     assert check_junior_nuanced(stats, final_score=9) is True
 
+
+
+def test_get_token_stats_single_flight(monkeypatch):
+    import threading
+    import time
+    import app.analyze_token as at
+
+    calls = []
+
+    def slow_fetch(token):
+        calls.append(token)
+        time.sleep(0.2)
+        return {"token_address": token, "price_usd": 1.0}
+
+    monkeypatch.setattr(at, "_fetch_token_stats", slow_fetch)
+    monkeypatch.setattr(at, "_cache_lookup", lambda token: (None, False))
+    before = at.get_singleflight_stats()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(at.get_token_stats("SingleFlightMint"))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert calls == ["SingleFlightMint"]
+    assert len(results) == 5 and all(r["price_usd"] == 1.0 for r in results)
+    after = at.get_singleflight_stats()
+    assert after["leader"] - before["leader"] == 1
+    assert after["coalesced_local"] - before["coalesced_local"] == 4
+
+
+def test_stats_cache_is_lru_bounded(monkeypatch):
+    from collections import OrderedDict
+    import app.analyze_token as at
+
+    monkeypatch.setattr(at, "_redis_client", None)
+    monkeypatch.setattr(at, "_stats_cache", OrderedDict())
+    monkeypatch.setattr(at, "_STATS_CACHE_MAX", 3)
+    for i in range(3):
+        at._cache_set(f"M{i}", {"i": i})
+    assert at._cache_get("M0") == {"i": 0}  # touch: M1 becomes least recent
+    at._cache_set("M3", {"i": 3})
+    assert list(at._stats_cache) == ["M2", "M0", "M3"]
+    assert at._cache_get("M1") is None
+
+
+def test_stale_stats_served_and_refreshed(monkeypatch):
+    import threading
+    import time
+    from collections import OrderedDict
+    import app.analyze_token as at
+
+    monkeypatch.setattr(at, "_redis_client", None)
+    monkeypatch.setattr(at, "_stats_cache", OrderedDict())
+    monkeypatch.setattr(at, "_STATS_TTL_SEC", 10)
+    monkeypatch.setattr(at, "_STATS_STALE_GRACE_SEC", 60)
+    at._stats_cache["StaleMint"] = (time.time() - 30, {"price_usd": 1.0}, time.time() + 40)
+
+    refreshed = threading.Event()
+
+    def fetch(token):
+        at._cache_set(token, {"price_usd": 2.0})
+        refreshed.set()
+        return {"price_usd": 2.0}
+
+    monkeypatch.setattr(at, "_fetch_token_stats", fetch)
+    assert at.get_token_stats("StaleMint") == {"price_usd": 1.0}
+    assert refreshed.wait(2)
+    deadline = time.time() + 2
+    while at._cache_get("StaleMint") is None and time.time() < deadline:
+        time.sleep(0.01)
+    assert at.get_token_stats("StaleMint") == {"price_usd": 2.0}
+
+    # Past the grace window the entry is a plain miss
+    at._stats_cache["StaleMint"] = (time.time() - 100, {"price_usd": 1.0}, time.time() - 30)
+    assert at._cache_lookup("StaleMint") == (None, False)
+
+
+def test_negative_cache_skips_unresolvable_mints(monkeypatch):
+    from collections import OrderedDict
+    import app.analyze_token as at
+
+    monkeypatch.setattr(at, "_redis_client", None)
+    monkeypatch.setattr(at, "_negative_cache", OrderedDict())
+    monkeypatch.setattr(at, "CIELO_DISABLE_STATS", True)
+    calls = []
+
+    def no_pairs(token, timeout=None, max_retries=3):
+        calls.append(token)
+        return []
+
+    monkeypatch.setattr(at, "_dexscreener_pairs", no_pairs)
+    assert at.get_token_stats("FreshLaunchMint") == {}
+    assert at._negative_get("FreshLaunchMint") == "no_pairs"
+    assert at.get_token_stats("FreshLaunchMint") == {}
+    assert calls == ["FreshLaunchMint"]
+
+    # Transient failures are not negatively cached
+    monkeypatch.setattr(at, "_dexscreener_pairs", lambda token, timeout=None, max_retries=3: None)
+    at.get_token_stats("FlakyMint")
+    assert at._negative_get("FlakyMint") is None
+
+    # Expired entries are dropped
+    at._negative_cache["FreshLaunchMint"] = (0.0, "no_pairs")
+    assert at._negative_get("FreshLaunchMint") is None
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+
+def test_two_tier_stats_cache(monkeypatch):
+    from collections import OrderedDict
+    import app.analyze_token as at
+
+    fake = _FakeRedis()
+    monkeypatch.setattr(at, "_redis_client", fake)
+    monkeypatch.setattr(at, "_stats_cache", OrderedDict())
+    stats = {"price_usd": 0.5, "volume": {"24h": {"volume_usd": 100.0}}, "symbol": "ABC"}
+
+    at._cache_set("TierMint", stats)
+    raw = fake.store["stats:TierMint"]
+    assert raw[:1] in (at._CODEC_MSGPACK, at._CODEC_ZLIB_JSON)
+    assert at._decode_stats(raw)["symbol"] == "ABC"
+
+    # L1 answers without touching Redis
+    assert at._cache_get("TierMint") == stats
+    assert fake.gets == 0
+
+    # Another process's entry (L1 cold) is read from L2 and promoted to L1
+    at._stats_cache.clear()
+    assert at._cache_get("TierMint") == stats
+    assert at._cache_get("TierMint") == stats
+    assert fake.gets == 1
+
+    at.invalidate_token_stats("TierMint")
+    assert "stats:TierMint" not in fake.store and at.get_cached_token_stats("TierMint") is None
+
+
+def _random_feed_items(rng, n):
+    thresholds = [200.0, 2000.0, 10000.0, 300.0, 3000.0, 15000.0]
+    specials = [0, 0.0, -1, None, float("nan"), float("inf"), float("-inf"), True, False, 10 ** 400]
+    items = []
+    for _ in range(n):
+        kind = rng.random()
+        if kind < 0.3:
+            t = rng.choice(thresholds)
+            v = rng.choice([t, t - 1e-9, t + 1e-9, int(t), int(t) + 1, int(t) - 1])
+        elif kind < 0.45:
+            v = rng.choice(specials)
+        elif kind < 0.75:
+            v = rng.uniform(-100, 50000)
+        else:
+            v = rng.randint(0, 10 ** rng.randint(1, 8))
+        tx = {}
+        field = rng.choice(["usd_value", "token1_amount_usd", "both", "none"])
+        if field in ("usd_value", "both"):
+            tx["usd_value"] = v
+        if field in ("token1_amount_usd", "both"):
+            tx["token1_amount_usd"] = rng.choice([v, rng.uniform(0, 20000), None, 0])
+        if rng.random() < 0.3:
+            tx["is_synthetic"] = rng.choice([True, False, 1, 0, "", "yes", None])
+        if rng.random() < 0.5:
+            tx["tx_type"] = rng.choice(["swap", "buy", "dexscreener_fallback", "gecko_fallback", None, "", 5])
+        items.append(tx)
+    return items
+
+
+def test_batch_preliminary_scores_match_scalar():
+    import random
+    from app.analyze_token import calculate_preliminary_scores_batch
+
+    assert calculate_preliminary_scores_batch([]) == []
+    for seed in range(25):
+        rng = random.Random(seed)
+        items = _random_feed_items(rng, rng.randint(1, 300))
+        flags = [rng.random() < 0.5 for _ in items]
+        expected = [calculate_preliminary_score(tx, smart_money_detected=f) for tx, f in zip(items, flags)]
+        assert calculate_preliminary_scores_batch(items, flags) == expected, f"seed {seed}"
@@ -23,3 +23,41 @@ def test_singleton_lock_reacquire_same_process(tmp_path):
             pass
 
 
+
+
+def test_feed_prefetcher_alternates_cycles_and_cursors():
+    from scripts.bot import FeedPrefetcher
+
+    calls = []
+
+    def fake_fetch(cursor, smart_money_only=False):
+        calls.append((cursor, smart_money_only))
+        n = len(calls)
+        return {"transactions": [{"n": n}], "next_cursor": f"c{n}"}
+
+    pf = FeedPrefetcher(depth=2, interval_sec=0, fetch=fake_fetch)
+    pages = [pf.fetch_next() for _ in range(4)]
+    assert [p["is_smart"] for p in pages] == [False, True, False, True]
+    # Each cycle resumes from its own cursor
+    assert calls == [(None, False), (None, True), ("c1", False), ("c2", True)]
+
+
+def test_feed_prefetcher_queue_is_bounded():
+    import time
+    from scripts.bot import FeedPrefetcher
+
+    def fake_fetch(cursor, smart_money_only=False):
+        return {"transactions": [{"x": 1}], "next_cursor": None}
+
+    pf = FeedPrefetcher(depth=2, interval_sec=0, fetch=fake_fetch)
+    pf.start()
+    try:
+        deadline = time.time() + 2
+        while pf.queue_depth() < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        assert pf.queue_depth() == 2
+        page = pf.get_page(timeout=1)
+        assert page is not None and page["feed"]["transactions"]
+    finally:
+        pf.stop()
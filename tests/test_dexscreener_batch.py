@@ -0,0 +1,87 @@
+import threading
+import time
+
+from app import dexscreener_batch
+from app.dexscreener_batch import DexScreenerBatcher
+
+
+def _pair(base, quote="So11111111111111111111111111111111111111112", liq=1000):
+    return {
+        "chainId": "solana",
+        "baseToken": {"address": base},
+        "quoteToken": {"address": quote},
+        "liquidity": {"usd": liq},
+        "priceUsd": "0.01",
+    }
+
+
+def _fake_request(calls):
+    def fake(method, url, timeout=None, **kwargs):
+        addrs = url.rsplit("/", 1)[1].split(",")
+        calls.append(addrs)
+        return {"status_code": 200, "json": {"pairs": [_pair(a) for a in addrs]}, "headers": {}}
+    return fake
+
+
+def test_concurrent_lookups_share_one_request(monkeypatch):
+    calls = []
+    monkeypatch.setattr(dexscreener_batch, "request_json", _fake_request(calls))
+    batcher = DexScreenerBatcher(window_ms=200)
+    results = {}
+
+    def lookup(addr):
+        results[addr] = batcher.get_pairs(addr)
+
+    threads = [threading.Thread(target=lookup, args=(f"Mint{i}",)) for i in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert len(calls) == 1
+    assert sorted(calls[0]) == sorted(f"Mint{i}" for i in range(10))
+    for i in range(10):
+        pairs = results[f"Mint{i}"]
+        assert len(pairs) == 1 and pairs[0]["baseToken"]["address"] == f"Mint{i}"
+
+
+def test_get_pairs_many_chunks_at_30(monkeypatch):
+    calls = []
+    monkeypatch.setattr(dexscreener_batch, "request_json", _fake_request(calls))
+    batcher = DexScreenerBatcher()
+    tokens = [f"T{i}" for i in range(65)] + ["T0"]
+    out = batcher.get_pairs_many(tokens)
+    assert [len(c) for c in calls] == [30, 30, 5]
+    assert len(out) == 65
+
+
+def test_failed_batch_returns_none(monkeypatch):
+    monkeypatch.setattr(dexscreener_batch, "request_json", lambda *a, **k: {"status_code": 500, "json": None, "headers": {}})
+    monkeypatch.setattr(dexscreener_batch.time, "sleep", lambda s: None)
+    batcher = DexScreenerBatcher(window_ms=0)
+    assert batcher.get_pairs("MintX") is None
+    # Mints without listed pairs resolve to an empty list, not a failure
+    assert dexscreener_batch._group_pairs([_pair("A")], ["A", "B"]) == {"A": [_pair("A")], "B": []}
+
+
+def test_caller_waits_at_most_its_own_timeout(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def slow(method, url, timeout=None, **kwargs):
+        calls.append(url)
+        release.wait(5)  # another caller's long batch
+        return {"status_code": 200, "json": {"pairs": []}, "headers": {}}
+
+    monkeypatch.setattr(dexscreener_batch, "request_json", slow)
+    batcher = DexScreenerBatcher(window_ms=0, timeout=20)
+    threading.Thread(target=batcher.get_pairs, args=("Slow",), daemon=True).start()
+    while not calls:
+        time.sleep(0.01)
+
+    started = time.time()
+    assert batcher.get_pairs("Quick", timeout=0.2, max_retries=1) is None
+    assert time.time() - started < 1.0
+    release.set()
+    # The worker still resolves the queued mint for later callers
+    assert batcher.get_pairs("Quick", timeout=2, max_retries=1) == []
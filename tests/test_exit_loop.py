@@ -0,0 +1,108 @@
+"""
+Exit-loop helpers in tradingSystem.cli_optimized.
+
+The CLI pulls in the Solana broker stack at import time; the broker module and
+base58 are stubbed so these helpers can be exercised without solana/solders.
+"""
+import importlib
+import socket
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+@pytest.fixture
+def cli(monkeypatch):
+    broker = types.ModuleType("tradingSystem.broker_optimized")
+    broker.Broker = type("Broker", (), {})
+    broker.Fill = type("Fill", (), {})
+    monkeypatch.setitem(sys.modules, "tradingSystem.broker_optimized", broker)
+    monkeypatch.setitem(sys.modules, "base58", types.ModuleType("base58"))
+    monkeypatch.setattr(socket, "getaddrinfo", socket.getaddrinfo)  # undo the import-time DNS patch
+    for name in ("tradingSystem.cli_optimized", "tradingSystem.trader_optimized"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    module = importlib.import_module("tradingSystem.cli_optimized")
+    yield module
+    package = sys.modules["tradingSystem"]
+    for name in ("tradingSystem.cli_optimized", "tradingSystem.trader_optimized"):
+        sys.modules.pop(name, None)
+        if hasattr(package, name.rsplit(".", 1)[1]):
+            delattr(package, name.rsplit(".", 1)[1])
+
+
+class _Engine:
+    def __init__(self):
+        self.events = []
+
+    def _log(self, event, **fields):
+        self.events.append((event, fields))
+
+
+def test_exit_prices_fetched_concurrently(cli, monkeypatch):
+    def slow_price(token, use_cache=True):
+        time.sleep(0.2)
+        return 1.5 if token != "dead" else 0.0
+
+    monkeypatch.setattr(cli, "_get_last_price_usd", slow_price)
+    tokens = ["a", "b", "c", "d", "dead"]
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        started = time.time()
+        prices = cli._fetch_exit_prices(tokens, pool, timeout=5)
+        elapsed = time.time() - started
+
+    assert elapsed < 0.6
+    assert {t: p for t, (p, _) in prices.items()} == {"a": 1.5, "b": 1.5, "c": 1.5, "d": 1.5, "dead": 0.0}
+
+
+def test_exit_prices_sequential_without_pool(cli, monkeypatch):
+    monkeypatch.setattr(cli, "_get_last_price_usd", lambda token, use_cache=True: 2.0)
+    prices = cli._fetch_exit_prices(["a", "b"], None, timeout=5)
+    assert [p for p, _ in prices.values()] == [2.0, 2.0]
+    assert cli._fetch_exit_prices([], None, timeout=5) == {}
+
+
+def test_exit_prices_omit_stragglers_and_zero_failures(cli, monkeypatch):
+    def price(token, use_cache=True):
+        if token == "slow":
+            time.sleep(0.5)
+        if token == "boom":
+            raise RuntimeError("quote failed")
+        return 3.0
+
+    monkeypatch.setattr(cli, "_get_last_price_usd", price)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        prices = cli._fetch_exit_prices(["ok", "slow", "boom"], pool, timeout=0.2)
+    assert {t: p for t, (p, _) in prices.items()} == {"ok": 3.0, "boom": 0.0}
+
+
+def test_exit_tick_reported_every_twelfth_iteration_or_on_overrun(cli):
+    engine = _Engine()
+    now = time.time()
+    cli._report_exit_tick(engine, 5, now, now, 3, [0.1], interval=10)
+    assert engine.events == []  # quiet tick
+    cli._report_exit_tick(engine, 12, now - 0.5, now - 0.25, 3, [0.1, 0.3], interval=10)
+    event, fields = engine.events[-1]
+    assert event == "exit_tick" and fields["positions"] == 3 and fields["overrun"] is False
+    assert fields["max_staleness_ms"] == 300.0 and fields["avg_staleness_ms"] == 200.0
+    cli._report_exit_tick(engine, 7, now - 2, now - 1, 1, [], interval=1)
+    assert engine.events[-1][1]["overrun"] is True and engine.events[-1][1]["max_staleness_ms"] is None
+    cli._report_exit_tick(engine, 24, now - 2, now - 1, 0, [], interval=1)
+    assert len(engine.events) == 2  # no positions, nothing to report
+
+
+def test_slow_tier_deadlines_are_capped(cli):
+    # Tier 4 (4h) is still re-priced within the cap; Tier 1 keeps the base interval
+    assert cli._next_check_in(14400, 5.0, 2.0, 2.0, max_interval=60, drawdown_pct=10) == 60
+    assert cli._next_check_in(1.5, 5.0, 2.0, 2.0, max_interval=60, drawdown_pct=10) == 5.0
+    assert cli._next_check_in(1800, 5.0, 2.0, None, max_interval=0, drawdown_pct=10) == 1800
+    # A cap below the base interval never speeds up Tier 1 quoting
+    assert cli._next_check_in(7200, 5.0, 2.0, 2.0, max_interval=1, drawdown_pct=10) == 5.0
+
+
+def test_drawdown_since_last_check_returns_to_base_interval(cli):
+    assert cli._next_check_in(7200, 5.0, 8.9, 10.0, max_interval=60, drawdown_pct=10) == 5.0
+    assert cli._next_check_in(7200, 5.0, 9.5, 10.0, max_interval=60, drawdown_pct=10) == 60
+    assert cli._next_check_in(7200, 5.0, 1.0, 10.0, max_interval=60, drawdown_pct=0) == 60
@@ -0,0 +1,80 @@
+from app.feed_dedup import BloomFilter, RollingDedup, feed_dedup_key
+
+
+def test_bloom_filter_membership_and_fp_rate():
+    bf = BloomFilter(capacity=2000, fp_rate=0.01)
+    for i in range(2000):
+        bf.add(f"k{i}")
+    assert all(f"k{i}" in bf for i in range(2000))
+    false_positives = sum(1 for i in range(10000) if f"other{i}" in bf)
+    assert false_positives < 300  # ~1% expected
+
+
+def test_rolling_dedup_forgets_after_two_windows(monkeypatch):
+    import app.feed_dedup as fd
+
+    now = [1000.0]
+    monkeypatch.setattr(fd.time, "time", lambda: now[0])
+    d = RollingDedup(window_sec=60, capacity=100)
+    assert d.seen_or_add("sig:a") is False
+    assert d.seen_or_add("sig:a") is True
+    now[0] += 61  # first rotation: key moves to the previous filter
+    assert d.seen_or_add("sig:a") is True
+    now[0] += 61  # second rotation: filter holding the original insert was dropped
+    now[0] += 61
+    assert d.seen_or_add("sig:a") is False
+
+
+def test_feed_dedup_key_prefers_signature():
+    assert feed_dedup_key({"tx_hash": "abc", "token0_address": "T"}) == "sig:abc"
+    a = {"token0_address": "T", "wallet": "W", "usd_value": 10, "timestamp": 1}
+    assert feed_dedup_key(a) == feed_dedup_key(dict(a))
+    assert feed_dedup_key(a) != feed_dedup_key(dict(a, timestamp=2))
+    assert feed_dedup_key({"token0_address": "T"}) is None
+
+
+def test_rolling_dedup_contains_does_not_record():
+    d = RollingDedup(window_sec=60, capacity=100)
+    assert d.contains("sig:a") is False
+    assert d.contains("sig:a") is False
+    d.add("sig:a")
+    assert d.contains("sig:a") is True
+    assert d.duplicate_rate == 1 / 3
+
+
+def test_signal_processor_skips_repeated_swap(monkeypatch):
+    import app.signal_processor as sp
+
+    monkeypatch.setattr(sp, "has_been_alerted", lambda t: False)
+    proc = sp.SignalProcessor({})
+    tx = {"tx_hash": "dup1", "token0_address": "MintDup", "usd_value": 0}
+    proc.process_feed_item(tx, is_smart_cycle=False)
+    second = proc.process_feed_item(tx, is_smart_cycle=False)
+    assert second.status == "skipped" and second.error_message == "Duplicate feed item"
+
+
+def test_smart_cycle_reanalyses_swap_seen_on_general_cycle(monkeypatch):
+    import app.signal_processor as sp
+
+    monkeypatch.setattr(sp, "has_been_alerted", lambda t: False)
+    proc = sp.SignalProcessor({})
+    tx = {"tx_hash": "dup2", "token0_address": "MintDup", "usd_value": 0}
+    proc.process_feed_item(tx, is_smart_cycle=False)
+    smart = proc.process_feed_item(tx, is_smart_cycle=True)
+    assert smart.error_message != "Duplicate feed item"
+
+
+def test_failed_stats_fetch_is_retried(monkeypatch):
+    import app.signal_processor as sp
+
+    monkeypatch.setattr(sp, "has_been_alerted", lambda t: False)
+    monkeypatch.setattr(sp, "calculate_preliminary_score", lambda tx, smart_money_detected=False: 10)
+    monkeypatch.setattr(sp, "record_token_activity", lambda *a, **k: None)
+    monkeypatch.setattr(sp, "get_token_stats", lambda t: None)
+    proc = sp.SignalProcessor({})
+    tx = {"tx_hash": "flaky", "token0_address": "MintFlaky", "token0_amount_usd": 500, "usd_value": 500}
+    assert proc.process_feed_item(tx, is_smart_cycle=False).error_message == "Failed to fetch stats"
+    assert proc.process_feed_item(tx, is_smart_cycle=False).error_message == "Failed to fetch stats"
+
+    page = proc.process_feed_page([tx, dict(tx)], is_smart_cycle=False, max_workers=1)
+    assert [r.error_message for r in page] == ["Failed to fetch stats", "Duplicate feed item"]
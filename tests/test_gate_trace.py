@@ -0,0 +1,59 @@
+from app.gate_trace import GateTracer
+
+
+def _page_tx(token, usd=5000):
+    return {
+        "token0_address": "So11111111111111111111111111111111111111112",
+        "token1_address": token,
+        "usd_value": usd,
+    }
+
+
+def test_gate_tracer_counts_and_summary():
+    tr = GateTracer()
+    t = tr.clock()
+    t = tr.lap("screen", t)
+    tr.lap("screen", t)
+    assert tr.gate("prelim", True) is True
+    assert tr.gate("prelim", False) is False
+    summary = tr.summary(reset=True)
+    assert summary["gates"]["prelim"] == [1, 1]
+    assert summary["ms"]["screen"][0] == 2
+    assert tr.summary() == {"ms": {}, "gates": {}}
+
+    off = GateTracer(enabled=False)
+    assert off.gate("prelim", False) is False
+    off.lap("screen", off.clock())
+    assert off.summary() == {"ms": {}, "gates": {}}
+
+
+def test_signal_processor_traces_rejecting_gate(monkeypatch):
+    import app.signal_processor as sp
+
+    monkeypatch.setattr(sp, "has_been_alerted", lambda t: True)
+    proc = sp.SignalProcessor({})
+    res = proc.process_feed_item(_page_tx("TraceMint"), is_smart_cycle=False)
+    assert res.error_message == "Already alerted"
+    gates = proc.tracer.summary()["gates"]
+    assert gates["already_alerted"] == [0, 1]
+
+
+def test_liquidity_max_rejection_has_its_own_lap(monkeypatch):
+    import app.config_unified as config
+    import app.signal_processor as sp
+
+    monkeypatch.setattr(config, "USE_LIQUIDITY_FILTER", True)
+    monkeypatch.setattr(config, "MAX_LIQUIDITY_USD", 75000.0)
+    monkeypatch.setattr(sp, "has_been_alerted", lambda t: False)
+    monkeypatch.setattr(sp, "calculate_preliminary_score", lambda tx, smart_money_detected=False: 10)
+    monkeypatch.setattr(sp, "record_token_activity", lambda *a, **k: None)
+    monkeypatch.setattr(sp, "get_token_stats", lambda t: {"token_address": t, "liquidity_usd": 1e9})
+    proc = sp.SignalProcessor({})
+    monkeypatch.setattr(proc, "_check_liquidity", lambda *a: True)
+
+    res = proc.process_feed_item(_page_tx("DeepPool"), is_smart_cycle=False)
+    assert res.error_message == "Liquidity above max cap"
+    summary = proc.tracer.summary()
+    assert summary["gates"]["liquidity_max"] == [0, 1]
+    assert summary["ms"]["liquidity_max"][0] == 1
+    assert "market_cap" not in summary["ms"]
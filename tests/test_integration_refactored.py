@@ -283,6 +283,94 @@ def test_signal_processor_native_sol_filter():
     assert result.status == "skipped"
 
 
+def _page_tx(token, usd=5000):
+    return {
+        "token0_address": "So11111111111111111111111111111111111111112",
+        "token1_address": token,
+        "usd_value": usd,
+    }
+
+
+def test_signal_processor_page_dedupes_and_keeps_order(monkeypatch):
+    """Test process_feed_page fetches each mint once and returns results in feed order"""
+    import threading
+    from app import signal_processor as sp
+    
+    calls = []
+    lock = threading.Lock()
+    
+    def fake_stats(token):
+        with lock:
+            calls.append(token)
+        return {}
+    
+    monkeypatch.setattr(sp, "get_token_stats", fake_stats)
+    monkeypatch.setattr(sp, "has_been_alerted", lambda t: False)
+    monkeypatch.setattr(sp, "record_token_activity", lambda *a, **k: None)
+    
+    processor = sp.SignalProcessor({})
+    txs = [_page_tx("mintA"), _page_tx("mintB"), _page_tx("mintA"), {"usd_value": 0}]
+    try:
+        results = processor.process_feed_page(txs, is_smart_cycle=False, max_workers=4)
+    finally:
+        processor.shutdown()
+    
+    assert sorted(calls) == ["mintA", "mintB"]
+    assert [r.token_address for r in results] == ["mintA", "mintB", "mintA", None]
+    assert results[0].error_message == "Failed to fetch stats"
+    assert "No valid token" in results[3].error_message
+
+
+def test_signal_processor_page_deadline(monkeypatch):
+    """Test process_feed_page skips tokens whose stats miss the page deadline"""
+    import time
+    from app import signal_processor as sp
+    
+    def slow_stats(token):
+        if token == "slowMint":
+            time.sleep(0.5)
+        return {}
+    
+    monkeypatch.setattr(sp, "get_token_stats", slow_stats)
+    monkeypatch.setattr(sp, "has_been_alerted", lambda t: False)
+    monkeypatch.setattr(sp, "record_token_activity", lambda *a, **k: None)
+    monkeypatch.setattr(sp, "log_process", lambda *a, **k: None)
+    
+    processor = sp.SignalProcessor({})
+    try:
+        results = processor.process_feed_page(
+            [_page_tx("fastMint"), _page_tx("slowMint")],
+            is_smart_cycle=False,
+            max_workers=2,
+            deadline_sec=0.1,
+        )
+    finally:
+        processor.shutdown()
+    
+    assert results[0].error_message == "Failed to fetch stats"
+    assert results[1].error_message == "Stats fetch deadline exceeded"
+
+
+def test_signal_processor_serial_path_uses_page_scores(monkeypatch):
+    """Test process_feed_item takes the batch preliminary score instead of rescoring"""
+    from app import signal_processor as sp
+    
+    def no_scalar(*a, **k):
+        raise AssertionError("scalar preliminary scoring called")
+    
+    monkeypatch.setattr(sp, "calculate_preliminary_score", no_scalar)
+    monkeypatch.setattr(sp, "has_been_alerted", lambda t: False)
+    monkeypatch.setattr(sp, "record_token_activity", lambda *a, **k: None)
+    monkeypatch.setattr(sp, "get_token_stats", lambda t: {})
+    
+    processor = sp.SignalProcessor({})
+    txs = [_page_tx("serialA", usd=1), _page_tx("serialB", usd=2)]
+    scores = processor.score_feed_page(txs)
+    results = [processor.process_feed_item(tx, is_smart_cycle=False, preliminary_score=p) for tx, p in zip(txs, scores)]
+    
+    assert [r.preliminary_score for r in results] == scores
+
+
 # ============================================================================
 # CONTAINER/DI TESTS
 # ============================================================================
@@ -450,4 +538,3 @@ def test_end_to_end_alert_flow(temp_db):
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
-
@@ -0,0 +1,52 @@
+import time
+
+from app.latency_trace import BOT_POINTS, TRADER_POINTS, hop_durations, new_trace, stamp, summarize
+
+
+def test_bot_and_trader_record_disjoint_hops():
+    now = time.time()
+    trace = new_trace({"timestamp": int((now - 10) * 1000)}, seen_at=now - 8)
+    stamp(trace, "decided", now - 5)
+    stamp(trace, "published", now - 4.5)
+    bot = hop_durations(trace, BOT_POINTS)
+    assert set(bot) == {"feed", "analysis", "publish"}
+    assert abs(bot["feed"] - 2.0) < 0.01 and abs(bot["analysis"] - 3.0) < 0.01
+
+    stamp(trace, "dequeued", now - 4)
+    stamp(trace, "opening", now - 3)
+    stamp(trace, "filled", now)
+    trader = hop_durations(trace, TRADER_POINTS)
+    assert set(trader) == {"transport", "trader", "fill", "total"}
+    assert abs(trader["total"] - 10.0) < 0.01
+
+
+def test_bogus_swap_time_is_ignored():
+    trace = new_trace({"timestamp": "not a time"})
+    assert "swap" not in trace["ts"] and "seen" in trace["ts"]
+
+
+def test_summarize_percentiles():
+    records = [{"type": "signal_latency", "hops": {"fill": float(i)}} for i in range(1, 101)]
+    records.append({"type": "heartbeat"})
+    out = summarize(records)
+    assert out["fill"]["n"] == 100
+    assert out["fill"]["p50"] == 50.5 and out["fill"]["max"] == 100.0
+
+
+def test_trace_travels_in_signal_payload(monkeypatch):
+    import app.signal_processor as sp
+    from app.models import TokenStats
+    from tradingSystem.watcher import _normalize_signal
+
+    pushed = []
+    monkeypatch.setattr(sp, "push_signal_to_redis", lambda payload: pushed.append(payload) or True)
+    proc = sp.SignalProcessor({})
+    trace = new_trace(seen_at=time.time())
+    stamp(trace, "decided")
+    stats = TokenStats.from_api_response({"token_address": "TraceMint", "price_usd": 1.0})
+    proc._push_to_redis("TraceMint", stats, 8, 5, "High Confidence", True, trace)
+
+    payload = pushed[0]
+    assert payload["trace_id"] == trace["id"] and "published" in payload["trace"]["ts"]
+    ev = _normalize_signal(payload, set())
+    assert ev["trace_id"] == trace["id"] and "dequeued" in ev["trace"]["ts"]
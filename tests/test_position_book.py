@@ -0,0 +1,102 @@
+import sqlite3
+
+import pytest
+
+from tradingSystem import db
+from tradingSystem.position_book import PositionBook
+
+
+@pytest.fixture
+def book(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "trading.db"))
+    db.init()
+    b = PositionBook(flush_interval_sec=60)
+    yield b
+    b.stop()
+
+
+def _peak_in_db(pid):
+    con = sqlite3.connect(db.DB_PATH)
+    try:
+        return con.execute("SELECT peak_price FROM positions WHERE id=?", (pid,)).fetchone()[0]
+    finally:
+        con.close()
+
+
+def test_load_recovers_open_positions_with_qty(book):
+    pid = db.create_position("TokA", "default", 1.0, 100.0, 10.0, 20.0)
+    db.add_fill(pid, "buy", 1.0, 100.0, 100.0)
+    db.add_fill(pid, "sell", 1.2, 40.0, 48.0)
+    closed = db.create_position("TokB", "default", 1.0, 5.0, 5.0, 20.0)
+    db.close_position(closed)
+
+    entries = book.load()
+
+    assert [e["pid"] for e in entries] == [pid]
+    assert book.get_open_position_id_by_token("TokA") == pid
+    assert book.get_open_qty(pid) == pytest.approx(60.0)
+    assert book.get_open_qty_by_token("TokB") is None
+
+
+def test_fills_and_closes_write_through(book):
+    book.load()
+    pid = book.create_position("TokA", "default", 2.0, 50.0, 100.0, 20.0)
+    assert book.get_open_qty_by_token("TokA") == 0.0  # no buy fill yet
+
+    book.add_fill(pid, "buy", 2.0, 50.0, 100.0)
+    assert book.get_open_qty(pid) == pytest.approx(50.0)
+    assert db.get_open_qty(pid) == pytest.approx(50.0)
+
+    book.add_fill(pid, "sell", 3.0, 50.0, 150.0)
+    book.close_position(pid)
+    assert book.get_open_position_id_by_token("TokA") is None
+    assert db.get_open_position_id_by_token("TokA") is None
+
+
+def test_peaks_are_kept_in_memory_until_flush(book):
+    pid = db.create_position("TokA", "default", 1.0, 10.0, 10.0, 20.0)
+    book.load()
+
+    peak, trail = book.update_peak_and_trail(pid, 1.5, 1.0)
+    assert peak == 1.5
+    assert trail == db.compute_trail(1.5, 1.0, 20.0)
+    # A lower price never lowers the peak
+    assert book.update_peak_and_trail(pid, 1.1, 1.0)[0] == 1.5
+    assert _peak_in_db(pid) == 1.0
+
+    assert book.flush() == 1
+    assert _peak_in_db(pid) == 1.5
+    assert book.flush() == 0
+
+
+def test_trail_matches_db_implementation(book):
+    pid = db.create_position("TokA", "default", 1.0, 10.0, 10.0, 20.0)
+    book.load()
+    mem = book.update_peak_and_trail(pid, 4.0, 1.0)
+    assert mem == db.update_peak_and_trail(pid, 4.0, 1.0)
+
+
+def test_close_persists_pending_peak(book):
+    pid = db.create_position("TokA", "default", 1.0, 10.0, 10.0, 20.0)
+    book.load()
+    book.update_peak_and_trail(pid, 3.0, 1.0)
+    book.close_position(pid)
+    assert _peak_in_db(pid) == 3.0
+
+
+def test_unknown_pid_falls_back_to_db(book):
+    book.load()
+    # Opened by another process after the book was loaded
+    pid = db.create_position("TokA", "default", 1.0, 10.0, 10.0, 20.0)
+    db.add_fill(pid, "buy", 1.0, 10.0, 10.0)
+    assert book.get_open_qty(pid) == pytest.approx(10.0)
+    assert book.update_peak_and_trail(pid, 2.0, 1.0)[0] == 2.0
+    assert _peak_in_db(pid) == 2.0
+
+
+def test_stop_flushes_pending_peaks(book):
+    pid = db.create_position("TokA", "default", 1.0, 10.0, 10.0, 20.0)
+    book.load()
+    book.update_peak_and_trail(pid, 2.5, 1.0)
+    book.stop()
+    assert _peak_in_db(pid) == 2.5
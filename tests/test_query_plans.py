@@ -0,0 +1,171 @@
+"""
+EXPLAIN QUERY PLAN audit for the signals database.
+
+Every SQL statement passed as a literal (or a string constant named in the same
+file) to execute()/executemany() in AUDITED_FILES is planned against a fresh
+schema built by init_db() + migrations. A step that scans a large table fails
+the audit unless it is a bounded index walk (ORDER BY <indexed column> ... LIMIT)
+or the statement is a deliberate whole-table aggregate listed in KNOWN_FULL_SCANS
+(entries that no longer match a scanning statement fail too, so the list stays honest).
+
+Statements built at runtime (f-strings, joined lists, /api/sql input) and ones
+against other databases (trading positions, admin audit) are not planned here.
+"""
+import ast
+import contextlib
+import io
+import os
+import re
+import sqlite3
+from typing import Dict, Iterator, List, Tuple
+
+import pytest
+
+from app.sqlite_pool import ConnectionManager
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+AUDITED_FILES = ("app/storage.py", "src/api_enhanced.py", "src/server.py")
+
+# Tables that grow with every alert / observation
+LARGE_TABLES = frozenset({
+    "alerted_tokens", "alerted_token_stats", "token_activity",
+    "price_snapshots", "transaction_snapshots", "wallet_first_buys",
+})
+
+# (file, regex over the whitespace-normalised SQL): dashboard totals that must read every row
+KNOWN_FULL_SCANS = (
+    ("app/storage.py", r"FROM alerted_token_stats WHERE last_checked_at IS NOT NULL( GROUP BY conviction_type)?$"),
+    ("src/api_enhanced.py", r"^SELECT COUNT\(\*\) FROM alerted_tokens$"),
+    ("src/api_enhanced.py", r"^SELECT COUNT\(\*\) FROM alerted_token_stats$"),
+    ("src/api_enhanced.py", r"^SELECT COUNT\(\*\) FROM alerted_token_stats WHERE \(peak_price_usd / first_price_usd\) >= 2\.0"),
+    ("src/server.py", r"^SELECT COUNT\(1\) FROM alerted_tokens$"),
+    ("src/server.py", r" AS lt2x FROM alerted_token_stats$"),
+    ("src/server.py", r"^SELECT SUM\(CASE WHEN is_rug = 1 THEN 1 ELSE 0 END\), COUNT\(1\) FROM alerted_token_stats$"),
+    ("src/server.py", r"AS time_to_peak_price_s FROM alerted_token_stats WHERE peak_price_at IS NOT NULL"),
+    ("src/server.py", r"^SELECT AVG\(CASE WHEN first_price_usd>0 THEN peak_price_usd/first_price_usd END\) FROM alerted_token_stats$"),
+)
+
+_DML = re.compile(r"^\s*(SELECT|INSERT|REPLACE|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+_SQL_KEYWORDS = frozenset({
+    "WHERE", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "JOIN", "ON", "USING", "GROUP",
+    "ORDER", "LIMIT", "HAVING", "UNION", "SET", "VALUES", "AS", "NATURAL",
+})
+
+
+def _normalise(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def _statements(rel_path: str) -> Iterator[Tuple[int, str]]:
+    """(line, sql) for each execute()/executemany() whose SQL is a string constant"""
+    with open(os.path.join(ROOT, rel_path), "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    constants: Dict[str, List[str]] = {}
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+                and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)):
+            constants.setdefault(node.targets[0].id, []).append(node.value.value)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
+            constants.pop(node.target.id, None)  # completed at runtime
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr in ("execute", "executemany") and node.args):
+            continue
+        arg = node.args[0]
+        if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+            candidates = [arg.value]
+        elif isinstance(arg, ast.Name):
+            candidates = constants.get(arg.id, [])
+        else:
+            continue
+        for sql in candidates:
+            if _DML.match(sql):
+                yield node.lineno, sql
+
+
+def _aliases(sql: str) -> Dict[str, str]:
+    """alias (or table name) -> table for the FROM/JOIN/INTO/UPDATE targets in sql"""
+    out: Dict[str, str] = {}
+    for table, alias in re.findall(r"\b(?:FROM|JOIN|INTO|UPDATE)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", sql, re.IGNORECASE):
+        out[table] = table
+        if alias and alias.upper() not in _SQL_KEYWORDS:
+            out[alias] = table
+    return out
+
+
+def _bind(sql: str):
+    names = re.findall(r"(?<![:\w]):(\w+)", sql)
+    if names:
+        return {n: None for n in names}
+    return [None] * sql.count("?")
+
+
+def full_scans(conn: sqlite3.Connection, sql: str) -> List[str]:
+    """Plan steps of `sql` that read a whole large table"""
+    plan = [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, _bind(sql))]
+    sorts = any(step.startswith("USE TEMP B-TREE FOR") and "ORDER BY" in step for step in plan)
+    limited = re.search(r"\bLIMIT\b", sql, re.IGNORECASE) is not None
+    aliases = _aliases(sql)
+    bad = []
+    for step in plan:
+        m = re.match(r"SCAN (\w+)(?: AS \w+)?( USING (?:COVERING )?INDEX \w+)?", step)
+        if not m or aliases.get(m.group(1), m.group(1)) not in LARGE_TABLES:
+            continue
+        if m.group(2) and limited and not sorts:
+            continue  # index walk in ORDER BY order that stops at LIMIT
+        bad.append(step)
+    return bad
+
+
+@pytest.fixture(scope="module")
+def signals_db(tmp_path_factory):
+    from app import storage
+    from app.database_config import DatabasePaths
+
+    path = str(tmp_path_factory.mktemp("plans") / "alerted_tokens.db")
+    saved = (storage.DB_FILE, DatabasePaths.SIGNALS_DB, storage._connections)
+    storage.DB_FILE = DatabasePaths.SIGNALS_DB = path
+    storage._connections = ConnectionManager(pragmas=storage._connections.pragmas)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            storage.init_db()
+        storage.close_connections()
+    finally:
+        storage.DB_FILE, DatabasePaths.SIGNALS_DB, storage._connections = saved
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+
+
+def test_full_scan_detection(signals_db):
+    assert full_scans(signals_db, "SELECT * FROM token_activity WHERE usd_value > ?")
+    assert full_scans(signals_db, "SELECT COUNT(*) FROM alerted_tokens a")
+    assert not full_scans(signals_db, "SELECT token_address FROM alerted_tokens ORDER BY alerted_at DESC LIMIT 10")
+    assert full_scans(signals_db, "SELECT token_address FROM alerted_tokens ORDER BY final_score DESC LIMIT 10")
+
+
+@pytest.mark.parametrize("rel_path", AUDITED_FILES)
+def test_no_full_scans_of_large_tables(signals_db, rel_path):
+    allowed = [pattern for path, pattern in KNOWN_FULL_SCANS if path == rel_path]
+    used = set()
+    audited = 0
+    failures = []
+    for line, sql in _statements(rel_path):
+        try:
+            scans = full_scans(signals_db, sql)
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e) or "no such column" in str(e):
+                continue  # another database, or a fallback for an older schema
+            raise
+        audited += 1
+        if not scans:
+            continue
+        matched = [p for p in allowed if re.search(p, _normalise(sql))]
+        used.update(matched)
+        if not matched:
+            failures.append(f"{rel_path}:{line}: {scans}\n    {_normalise(sql)[:160]}")
+    assert audited, f"no statements audited in {rel_path}"
+    assert not failures, "full scans of large tables:\n" + "\n".join(failures)
+    assert used == set(allowed), f"stale KNOWN_FULL_SCANS entries: {sorted(set(allowed) - used)}"
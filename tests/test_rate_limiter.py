@@ -0,0 +1,107 @@
+import pytest
+
+from app import rate_limiter
+from app.rate_limiter import SharedRateLimiter, current_lane, rate_lane, take
+
+
+def test_take_consumes_and_refills():
+    state = (2.0, 100.0, 0.0)
+    state, wait = take(state, 100.0, capacity=2, rate=1.0, reserve=0.0, priority=False)
+    assert wait == 0.0 and state[0] == pytest.approx(1.0)
+    state, wait = take(state, 100.0, 2, 1.0, 0.0, False)
+    assert wait == 0.0 and state[0] == pytest.approx(0.0)
+    state, wait = take(state, 100.0, 2, 1.0, 0.0, False)
+    assert wait == pytest.approx(1.0)
+    state, wait = take(state, 101.0, 2, 1.0, 0.0, False)
+    assert wait == 0.0
+
+
+def test_low_lanes_leave_their_reserve():
+    state = (5.0, 0.0, 0.0)
+    # poll with a reserve of 4 can take exactly one token
+    state, wait = take(state, 0.0, 10, 1.0, reserve=4.0, priority=False)
+    assert wait == 0.0
+    state, wait = take(state, 0.0, 10, 1.0, reserve=4.0, priority=False)
+    assert wait > 0
+    # exit still gets the reserved tokens
+    state, wait = take(state, 0.0, 10, 1.0, reserve=0.0, priority=True)
+    assert wait == 0.0
+
+
+def test_waiting_exit_holds_off_lower_lanes():
+    state = (0.0, 0.0, 0.0)
+    state, wait = take(state, 0.0, 5, 2.0, reserve=0.0, priority=True)
+    assert wait == pytest.approx(0.5)
+    # A buy arriving before the exit is served must wait for the hold
+    state, wait = take(state, 0.4, 5, 2.0, reserve=0.0, priority=False)
+    assert wait == pytest.approx(0.1)
+    # The exit gets the refilled token first, then the hold has expired
+    state, wait = take(state, 0.5, 5, 2.0, reserve=0.0, priority=True)
+    assert wait == 0.0
+    state, wait = take(state, 1.0, 5, 2.0, reserve=0.0, priority=False)
+    assert wait == 0.0
+
+
+def test_file_bucket_is_shared_between_limiters(tmp_path):
+    path = str(tmp_path / "jup.bucket")
+    a = SharedRateLimiter("jup", rate_per_sec=0.01, capacity=2, path=path)
+    b = SharedRateLimiter("jup", rate_per_sec=0.01, capacity=2, path=path)
+    assert a.backend == "file"
+    assert a.try_acquire("trade") == 0.0
+    assert b.try_acquire("trade") == 0.0
+    # Both instances drew from the same two tokens
+    assert a.try_acquire("trade") > 0
+    assert b.acquire("trade", timeout=0.05) is False
+
+
+def test_rate_lane_sets_thread_default():
+    assert current_lane() == "trade"
+    with rate_lane("exit"):
+        assert current_lane() == "exit"
+        with rate_lane("poll"):
+            assert current_lane() == "poll"
+        assert current_lane() == "exit"
+    assert current_lane() == "trade"
+
+
+class _FakeScript:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class _FakeRedis:
+    def __init__(self, result):
+        self.script = _FakeScript(result)
+
+    def register_script(self, source):
+        assert "HMGET" in source
+        return self.script
+
+
+def test_redis_backend_passes_lane_parameters():
+    r = _FakeRedis(250000)
+    limiter = SharedRateLimiter("jupiter:free", rate_per_sec=1.0, capacity=8, redis_client=r)
+    assert limiter.backend == "redis"
+    assert limiter.try_acquire("poll") == pytest.approx(0.25)
+    keys, args = r.script.calls[0]
+    assert keys == ["ratelimit:jupiter:free"]
+    assert args == [8.0, 1.0, 2.0, 0]
+    limiter.try_acquire("exit")
+    assert r.script.calls[1][1][2:] == [0.0, 1]
+
+
+def test_redis_error_falls_back_to_local_bucket(monkeypatch):
+    logged = []
+    monkeypatch.setattr(rate_limiter, "log_process", logged.append)
+    r = _FakeRedis(ConnectionError("down"))
+    limiter = SharedRateLimiter("jup", rate_per_sec=1.0, capacity=1, redis_client=r)
+    assert limiter.try_acquire("trade") == 0.0
+    assert limiter.backend == "local"
+    assert logged and logged[0]["type"] == "rate_limiter_redis_error"
@@ -0,0 +1,154 @@
+import time
+
+from app.signal_stream import SignalStreamConsumer, publish_signal
+
+
+class _StreamRedis:
+    """In-memory stand-in for the Redis Streams commands the transport uses"""
+
+    def __init__(self):
+        self.streams = {}
+        self.groups = {}  # (stream, group) -> {"last": int, "pending": {id: [consumer, delivered_at]}}
+        self.now = 1000.0
+        self._seq = 0
+
+    def xadd(self, name, fields, maxlen=None, approximate=True):
+        self._seq += 1
+        entry_id = f"{self._seq}-0"
+        entries = self.streams.setdefault(name, [])
+        entries.append((entry_id, dict(fields)))
+        if maxlen and len(entries) > maxlen:
+            del entries[: len(entries) - maxlen]
+        return entry_id
+
+    def xgroup_create(self, name, groupname, id="$", mkstream=False):
+        if (name, groupname) in self.groups:
+            raise Exception("BUSYGROUP Consumer Group name already exists")
+        self.streams.setdefault(name, [])
+        self.groups[(name, groupname)] = {"last": self._seq if id == "$" else 0, "pending": {}}
+
+    def xreadgroup(self, groupname, consumername, streams, count=None, block=None):
+        out = []
+        for name in streams:
+            g = self.groups[(name, groupname)]
+            new = [e for e in self.streams[name] if int(e[0].split("-")[0]) > g["last"]][: count or None]
+            for entry_id, _ in new:
+                g["pending"][entry_id] = [consumername, self.now]
+                g["last"] = int(entry_id.split("-")[0])
+            if new:
+                out.append((name, new))
+        return out
+
+    def xack(self, name, groupname, *ids):
+        pending = self.groups[(name, groupname)]["pending"]
+        return sum(1 for i in ids if pending.pop(i, None) is not None)
+
+    def xautoclaim(self, name, groupname, consumername, min_idle_time, start_id="0-0", count=None):
+        g = self.groups[(name, groupname)]
+        by_id = dict(self.streams[name])
+        claimed = []
+        for entry_id, info in sorted(g["pending"].items()):
+            if (self.now - info[1]) * 1000 >= min_idle_time and entry_id in by_id:
+                g["pending"][entry_id] = [consumername, self.now]
+                claimed.append((entry_id, by_id[entry_id]))
+        return ["0-0", claimed, []]
+
+
+def _signal(token):
+    return {"token": token, "final_score": 8, "timestamp": time.time()}
+
+
+def test_groups_share_or_fan_out_signals():
+    r = _StreamRedis()
+    live_a = SignalStreamConsumer(r, "sig", "live", consumer="a", count=1)
+    live_b = SignalStreamConsumer(r, "sig", "live", consumer="b", count=1)
+    paper = SignalStreamConsumer(r, "sig", "paper", consumer="p")
+    for c in (live_a, live_b, paper):
+        c.ensure_group()
+    publish_signal(r, _signal("T1"), "sig")
+    publish_signal(r, _signal("T2"), "sig")
+
+    got_a = live_a.read()
+    got_b = live_b.read()
+    assert [s["token"] for _, s in got_a + got_b] == ["T1", "T2"]
+    assert [s["token"] for _, s in paper.read()] == ["T1", "T2"]
+
+
+def test_unacked_signal_is_reclaimed_after_crash():
+    r = _StreamRedis()
+    crashed = SignalStreamConsumer(r, "sig", "live", consumer="old", claim_idle_ms=30000)
+    crashed.ensure_group()
+    publish_signal(r, _signal("T1"), "sig")
+    (entry_id, _), = crashed.read()  # read but never acked
+
+    survivor = SignalStreamConsumer(r, "sig", "live", consumer="new", claim_idle_ms=30000, block_ms=0)
+    r.now += 10
+    assert survivor.read() == []
+    r.now += 30
+    reclaimed = survivor.read()
+    assert [e for e, _ in reclaimed] == [entry_id]
+    assert survivor.ack(entry_id) == 1
+    r.now += 60
+    assert survivor.read() == []
+
+
+def test_stream_is_trimmed_to_maxlen():
+    r = _StreamRedis()
+    for i in range(20):
+        publish_signal(r, _signal(f"T{i}"), "sig", maxlen=5)
+    assert len(r.streams["sig"]) == 5
+
+
+def test_follow_signals_stream_acks_after_consumer_resumes():
+    from tradingSystem.watcher import follow_signals_stream
+
+    r = _StreamRedis()
+    gen = follow_signals_stream(block_timeout=0, client=r, consumer="t")
+    SignalStreamConsumer(r, "trading_signals_stream", "trader").ensure_group()
+    publish_signal(r, _signal("Tok1111111111111111111111"), "trading_signals_stream")
+    r.xadd("trading_signals_stream", {"payload": "not json"})
+    publish_signal(r, _signal("Tok2222222222222222222222"), "trading_signals_stream")
+
+    first = next(gen)
+    assert first["ca"] == "Tok1111111111111111111111"
+    pending = r.groups[("trading_signals_stream", "trader")]["pending"]
+    assert "1-0" in pending  # still being handled by the caller
+    second = next(gen)
+    assert second["ca"] == "Tok2222222222222222222222"
+    assert "1-0" not in pending and "2-0" not in pending
+    gen.close()
+
+
+def test_push_signal_retries_only_the_failed_step(monkeypatch):
+    import app.notify as notify
+
+    class _BothRedis(_StreamRedis):
+        def __init__(self):
+            super().__init__()
+            self.lists = {}
+            self.xadd_failures = 1
+
+        def lpush(self, name, value):
+            self.lists.setdefault(name, []).insert(0, value)
+
+        def ltrim(self, name, start, end):
+            self.lists[name] = self.lists.get(name, [])[start:end + 1]
+
+        def ping(self):
+            return True
+
+        def xadd(self, *args, **kwargs):
+            if self.xadd_failures:
+                self.xadd_failures -= 1
+                raise ConnectionError("stream write failed")
+            return super().xadd(*args, **kwargs)
+
+    r = _BothRedis()
+    monkeypatch.setattr(notify, "SIGNAL_TRANSPORT", "both")
+    monkeypatch.setattr(notify, "SIGNAL_STREAM_KEY", "sig")
+    monkeypatch.setattr(notify, "_redis_client", r)
+    monkeypatch.setattr(notify, "_create_redis_client", lambda: r)
+
+    assert notify.push_signal_to_redis(_signal("T1"))
+    assert len(r.lists["trading_signals"]) == 1
+    assert len(r.streams["sig"]) == 1
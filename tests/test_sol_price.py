@@ -0,0 +1,73 @@
+import json
+import time
+
+from tradingSystem.sol_price import REDIS_KEY, SolPriceService
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+
+def _service(**kw):
+    kw.setdefault("refresh_interval_sec", 15)
+    kw.setdefault("max_age_sec", 300)
+    return SolPriceService(**kw)
+
+
+def test_no_price_before_first_refresh():
+    s = _service()
+    price, age = s.latest()
+    assert price == 0.0 and age == float("inf")
+    assert s.price(default=180.0) == 180.0
+    assert s.is_stale()
+
+
+def test_falls_back_across_sources(monkeypatch):
+    s = _service()
+    monkeypatch.setattr(s, "_fetch_coingecko", lambda: (_ for _ in ()).throw(RuntimeError("down")))
+    monkeypatch.setattr(s, "_fetch_jupiter", lambda: 151.5)
+    assert s.refresh() is True
+    price, age = s.latest()
+    assert price == 151.5 and age < 1
+    assert s._snapshot[2] == "jupiter"
+
+
+def test_failed_refresh_keeps_last_price(monkeypatch):
+    s = _service()
+    monkeypatch.setattr(s, "_fetch_coingecko", lambda: 150.0)
+    s.refresh()
+    monkeypatch.setattr(s, "_fetch_coingecko", lambda: 0.0)
+    monkeypatch.setattr(s, "_fetch_jupiter", lambda: 0.0)
+    assert s.refresh() is False
+    assert s.price() == 150.0
+
+
+def test_price_is_shared_through_redis(monkeypatch):
+    r = _FakeRedis()
+    writer = _service(redis_client=r)
+    monkeypatch.setattr(writer, "_fetch_coingecko", lambda: 149.0)
+    writer.refresh()
+    assert json.loads(r.store[REDIS_KEY])["price"] == 149.0
+
+    reader = _service(redis_client=r)
+    monkeypatch.setattr(reader, "_fetch_coingecko", lambda: (_ for _ in ()).throw(AssertionError("network")))
+    assert reader.refresh() is True
+    assert reader.price() == 149.0
+    assert reader._snapshot[2] == "redis"
+
+
+def test_stale_shared_price_triggers_fetch(monkeypatch):
+    r = _FakeRedis()
+    r.store[REDIS_KEY] = json.dumps({"price": 100.0, "ts": time.time() - 60})
+    s = _service(redis_client=r)
+    monkeypatch.setattr(s, "_fetch_coingecko", lambda: 152.0)
+    s.refresh()
+    assert s.price() == 152.0
+    assert json.loads(r.store[REDIS_KEY])["price"] == 152.0
@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from app.sqlite_pool import ConnectionManager
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "signals.db")
+
+
+def test_thread_reuses_one_connection(db_path):
+    m = ConnectionManager()
+    a = m.connect(db_path)
+    a.execute("CREATE TABLE t (x INTEGER)")
+    a.commit()
+    a.close()
+    b = m.connect(db_path)
+    assert b._conn is a._conn
+    assert b.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL, applied once
+    assert m.stats() == {"open": 1, "opened_total": 1}
+
+
+def test_close_discards_uncommitted_work(db_path):
+    m = ConnectionManager()
+    conn = m.connect(db_path)
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.close()
+    conn = m.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_threads_get_separate_connections_and_dead_ones_are_reaped(db_path):
+    m = ConnectionManager()
+    main_conn = m.connect(db_path)._conn
+    seen = []
+
+    def worker():
+        seen.append(m.connect(db_path)._conn)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert seen[0] is not main_conn
+    assert m.stats()["open"] == 2
+
+    # The next new connection sweeps the exited worker's
+    m.connect(str(db_path) + "-other")
+    assert m.stats()["open"] == 2
+
+
+def test_close_all(db_path):
+    m = ConnectionManager()
+    conn = m.connect(db_path)
+    assert m.close_all() == 1
+    conn.close()  # a caller finishing after shutdown must not raise
+    assert m.connect(db_path)._conn is not conn._conn
+
+
+def test_storage_uses_pooled_connections(tmp_path, monkeypatch):
+    from app import storage
+    from app.database_config import DatabasePaths
+
+    path = str(tmp_path / "alerted_tokens.db")
+    monkeypatch.setattr(storage, "DB_FILE", path)
+    monkeypatch.setattr(DatabasePaths, "SIGNALS_DB", path)
+    manager = ConnectionManager(pragmas=storage._connections.pragmas)
+    monkeypatch.setattr(storage, "_connections", manager)
+
+    storage.init_db()
+    for i in range(5):
+        storage.record_token_activity(f"Tok{i}", 100.0, 1, False, 3)
+        assert storage.has_been_alerted(f"Nope{i}") is False
+    assert len(storage.get_recent_token_signals("Tok1", 300)) == 1
+    assert manager.opened == 1
+    assert storage.close_connections() == 1
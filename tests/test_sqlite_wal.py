@@ -0,0 +1,115 @@
+import sqlite3
+
+import pytest
+
+from app.sqlite_pool import ConnectionManager, DEFAULT_PRAGMAS
+from app.sqlite_wal import (
+    WalCheckpointer,
+    filesystem_type,
+    journal_pragmas,
+    resolve_journal_mode,
+)
+
+
+MOUNTS = """\
+overlay / overlay rw,relatime 0 0
+/dev/sda1 /data ext4 rw,relatime 0 0
+grpcfuse /data/shared fuse.grpcfuse rw,nosuid 0 0
+server:/export /mnt/nfs nfs4 rw,relatime 0 0
+"""
+
+
+@pytest.fixture
+def mounts(tmp_path):
+    p = tmp_path / "mounts"
+    p.write_text(MOUNTS)
+    return str(p)
+
+
+def test_filesystem_type_uses_longest_mount_point(mounts):
+    assert filesystem_type("/data/alerted_tokens.db", mounts) == "ext4"
+    assert filesystem_type("/data/shared/var/alerted_tokens.db", mounts) == "fuse.grpcfuse"
+    assert filesystem_type("/data-other/x.db", mounts) == "overlay"
+
+
+def test_auto_falls_back_on_shared_volumes(mounts):
+    assert resolve_journal_mode("/data/alerted_tokens.db", "auto", mounts) == "wal"
+    assert resolve_journal_mode("/data/shared/alerted_tokens.db", "auto", mounts) == "delete"
+    assert resolve_journal_mode("/mnt/nfs/alerted_tokens.db", "auto", mounts) == "delete"
+    # Explicit modes are honoured; unknown values mean auto
+    assert resolve_journal_mode("/mnt/nfs/alerted_tokens.db", "wal", mounts) == "wal"
+    assert resolve_journal_mode("/data/alerted_tokens.db", "DELETE", mounts) == "delete"
+    assert resolve_journal_mode("/mnt/nfs/alerted_tokens.db", "bogus", mounts) == "delete"
+
+
+def test_unknown_filesystem_allows_wal(tmp_path):
+    assert resolve_journal_mode("/x/alerted_tokens.db", "auto", str(tmp_path / "missing")) == "wal"
+
+
+def _wal_db(tmp_path, autocheckpoint=0):
+    path = str(tmp_path / "signals.db")
+    manager = ConnectionManager(pragmas=journal_pragmas("wal", autocheckpoint) + DEFAULT_PRAGMAS)
+    conn = manager.connect(path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.execute("CREATE TABLE t (x BLOB)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(b"x" * 1000,) for _ in range(200)])
+    conn.commit()
+    conn.close()
+    return path, manager
+
+
+def test_checkpointer_truncates_oversized_wal(tmp_path):
+    path, manager = _wal_db(tmp_path)
+    cp = WalCheckpointer(lambda: manager.connect(path), path, interval_sec=3600, max_wal_bytes=64 * 1024)
+    assert cp.wal_size() > 64 * 1024
+    assert cp.maybe_checkpoint() == "TRUNCATE"
+    assert cp.wal_size() == 0
+    assert cp.maybe_checkpoint() is None
+    manager.close_all()
+
+
+def test_checkpointer_runs_passive_on_interval(tmp_path):
+    path, manager = _wal_db(tmp_path)
+    cp = WalCheckpointer(lambda: manager.connect(path), path, interval_sec=60, max_wal_bytes=0)
+    now = cp._last
+    assert cp.maybe_checkpoint(now + 1) is None
+    assert cp.maybe_checkpoint(now + 61) == "PASSIVE"
+    assert cp.stats["passive"] == 1
+    manager.close_all()
+
+
+def test_busy_truncate_backs_off_to_passive(tmp_path):
+    path, manager = _wal_db(tmp_path)
+    reader = sqlite3.connect(path)
+    reader.execute("BEGIN")
+    reader.execute("SELECT COUNT(*) FROM t").fetchone()  # pins the WAL
+    cp = WalCheckpointer(lambda: sqlite3.connect(path, timeout=0), path, interval_sec=60,
+                         max_wal_bytes=64 * 1024, busy_backoff_sec=5)
+    now = cp._last
+    assert cp.maybe_checkpoint(now) == "TRUNCATE"
+    assert cp.stats["busy"] == 1
+    # Writers are not stalled by another TRUNCATE until the backoff expires
+    assert cp.maybe_checkpoint(now + 1) == "PASSIVE"
+    assert cp.maybe_checkpoint(now + 6) == "TRUNCATE"
+    assert cp.maybe_checkpoint(now + 15) == "PASSIVE"  # backoff doubled to 10s
+    reader.rollback()
+    reader.close()
+    assert cp.maybe_checkpoint(now + 17) == "TRUNCATE"
+    assert cp.wal_size() == 0
+    assert cp._truncate_after == 0.0
+    manager.close_all()
+
+
+def test_wal_readers_do_not_block_writer(tmp_path):
+    path, manager = _wal_db(tmp_path)
+    reader = sqlite3.connect(path)
+    reader.execute("BEGIN")
+    reader.execute("SELECT COUNT(*) FROM t").fetchone()  # holds a read snapshot
+    writer = sqlite3.connect(path, timeout=0)
+    writer.execute("INSERT INTO t VALUES (x'00')")
+    writer.commit()
+    assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 200  # still its snapshot
+    reader.rollback()
+    reader.close()
+    writer.close()
+    manager.close_all()
@@ -0,0 +1,93 @@
+from app import telegram_sender
+from app.telegram_sender import TelegramSender
+
+
+class _Resp:
+    def __init__(self, status, body=None, headers=None):
+        self.status_code = status
+        self._body = body or {}
+        self.headers = headers or {}
+
+    def json(self):
+        return self._body
+
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.posts = []
+
+    def post(self, url, json=None, timeout=None):
+        self.posts.append(json)
+        return self.responses.pop(0) if self.responses else _Resp(200, {"ok": True})
+
+
+def test_429_honours_retry_after(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(telegram_sender.time, "sleep", lambda s: sleeps.append(s))
+    sess = _Session([_Resp(429, {"ok": False, "parameters": {"retry_after": 7}})])
+    sender = TelegramSender("tok", "chat", chat_interval_sec=0, session=sess)
+    assert sender.send_now("hello")
+    assert len(sess.posts) == 2
+    assert sleeps and 6.5 <= sleeps[0] <= 7.0
+
+
+def test_backlog_is_merged_per_chat():
+    sess = _Session([])
+    sender = TelegramSender("tok", "chat", chat_interval_sec=0, merge_threshold=3, max_merge=10, session=sess)
+    # Fill the queue before the worker starts so it sees a backlog
+    for i in range(5):
+        sender._queue.append(("chat", f"alert {i}", 0.0))
+    sender._queue.append(("other", "other chat", 0.0))
+    sender._ensure_worker()
+    assert sender.flush(timeout=5)
+    sender.stop()
+    assert [p["chat_id"] for p in sess.posts] == ["chat", "other"]
+    assert sess.posts[0]["text"].count("alert") == 5
+    assert sender.merged == 4
+
+
+def test_full_queue_rejects_without_blocking(monkeypatch):
+    sender = TelegramSender("tok", "chat", max_queue=1, session=_Session([]))
+    monkeypatch.setattr(sender, "_ensure_worker", lambda: None)
+    assert sender.enqueue("one")
+    assert not sender.enqueue("two")
+    # Rejected messages go back to the caller (sent inline), so nothing was dropped
+    assert sender.rejected == 1
+    assert sender.dropped == 0
+
+
+def test_stop_counts_undelivered_messages_as_dropped(monkeypatch):
+    sender = TelegramSender("tok", "chat", session=_Session([]))
+    monkeypatch.setattr(sender, "_ensure_worker", lambda: None)
+    assert sender.enqueue("one") and sender.enqueue("two")
+    sender.stop(timeout=0)
+    assert sender.dropped == 2
+    assert sender.pending() == 0
+
+
+def test_worker_and_send_now_share_chat_pacing():
+    import threading
+    import time
+
+    stamps = []
+    lock = threading.Lock()
+
+    class _Timed(_Session):
+        def post(self, url, json=None, timeout=None):
+            with lock:
+                stamps.append(time.time())
+            return _Resp(200, {"ok": True})
+
+    sender = TelegramSender("tok", "chat", chat_interval_sec=0.2, session=_Timed([]))
+    sender.enqueue("queued")
+    threads = [threading.Thread(target=sender.send_now, args=(f"inline {i}",)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    assert sender.flush(timeout=5)
+    sender.stop()
+    stamps.sort()
+    assert len(stamps) == 3
+    assert all(b - a >= 0.18 for a, b in zip(stamps, stamps[1:]))
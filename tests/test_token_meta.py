@@ -0,0 +1,64 @@
+from tradingSystem import token_meta
+from tradingSystem.token_meta import MintDecimalsIndex
+
+
+MINT = "7GCihgDB8fe6KNjn2MYtkzZcRjQy3t9GHdC8uHYmW2hr"
+
+
+def _index(tmp_path, **kw):
+    kw.setdefault("refresh_interval_sec", 0)
+    return MintDecimalsIndex(path=str(tmp_path / "meta.db"), **kw)
+
+
+def test_known_mints_need_no_lookup(tmp_path, monkeypatch):
+    idx = _index(tmp_path)
+    monkeypatch.setattr(idx, "_lookup", lambda mint: (_ for _ in ()).throw(AssertionError("network")))
+    assert idx.decimals("So11111111111111111111111111111111111111112") == 9
+
+
+def test_miss_is_resolved_once_and_persisted(tmp_path, monkeypatch):
+    idx = _index(tmp_path)
+    calls = []
+    monkeypatch.setattr(idx, "_lookup_rpc", lambda mint: calls.append(mint) or 9)
+    assert idx.decimals(MINT) == 9
+    assert idx.decimals(MINT) == 9
+    assert calls == [MINT]
+
+    # A new process loads it from disk without any lookup
+    fresh = _index(tmp_path)
+    assert fresh.get(MINT) == 9
+
+
+def test_rpc_failure_falls_back_to_jupiter_token_endpoint(tmp_path, monkeypatch):
+    idx = _index(tmp_path)
+    monkeypatch.setattr(idx, "_lookup_rpc", lambda mint: None)
+    monkeypatch.setattr(idx, "_lookup_jupiter", lambda mint: 8)
+    assert idx.decimals(MINT) == 8
+
+
+def test_unresolved_mint_uses_default_and_is_not_retried_immediately(tmp_path, monkeypatch):
+    idx = _index(tmp_path)
+    calls = []
+    monkeypatch.setattr(idx, "_lookup", lambda mint: calls.append(mint) or (None, ""))
+    assert idx.decimals(MINT) == token_meta.DEFAULT_DECIMALS
+    assert idx.decimals(MINT) == token_meta.DEFAULT_DECIMALS
+    assert len(calls) == 1
+    # Defaults are never persisted
+    assert _index(tmp_path).get(MINT) is None
+
+
+def test_refresh_all_bulk_loads_token_list(tmp_path, monkeypatch):
+    idx = _index(tmp_path)
+    payload = [
+        {"address": MINT, "decimals": 9},
+        {"address": "Other1111111111111111111111111111111111111", "decimals": 0},
+        {"address": "NoDecimals", "decimals": None},
+    ]
+    monkeypatch.setattr(token_meta, "request_json", lambda *a, **k: {"status_code": 200, "json": payload})
+    assert idx.refresh_all() == 2
+    assert idx.get(MINT) == 9
+    assert idx.last_refresh() > 0
+
+    fresh = _index(tmp_path)
+    assert fresh.get("Other1111111111111111111111111111111111111") == 0
+    assert fresh.get("NoDecimals") is None
@@ -0,0 +1,197 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from app.sqlite_pool import ConnectionManager
+from app.write_behind import WriteBehindWriter
+
+
+INSERT = "INSERT INTO t (x) VALUES (?)"
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "w.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (x INTEGER UNIQUE)")
+    conn.commit()
+    conn.close()
+    manager = ConnectionManager()
+    yield path, (lambda: manager.connect(path))
+    manager.close_all()
+
+
+def _count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_rows_are_group_committed(db):
+    path, connect = db
+    w = WriteBehindWriter(connect, batch_rows=50, batch_ms=5000)
+    for i in range(100):
+        w.submit(INSERT, (i,))
+    assert w.flush(timeout=5)
+    assert _count(path) == 100
+    assert w.stats["commits"] <= 3  # full batches, not one commit per row
+    w.stop()
+
+
+def test_time_bound_commits_partial_batch(db):
+    path, connect = db
+    w = WriteBehindWriter(connect, batch_rows=1000, batch_ms=20)
+    w.submit(INSERT, (1,))
+    assert w.flush(timeout=5)
+    assert _count(path) == 1
+    w.stop()
+
+
+def test_bad_row_does_not_lose_the_batch(db):
+    path, connect = db
+    w = WriteBehindWriter(connect, batch_rows=10, batch_ms=5000)
+    for x in (1, 2, 2, 3):  # the duplicate violates UNIQUE
+        w.submit(INSERT, (x,))
+    assert w.flush(timeout=5)
+    assert _count(path) == 3
+    w.stop()
+
+
+def test_full_queue_writes_inline(db):
+    path, connect = db
+    w = WriteBehindWriter(connect, batch_rows=1, batch_ms=1, max_queue=1, put_timeout=0)
+    for i in range(20):
+        w.submit(INSERT, (i,))
+    assert w.flush(timeout=5)
+    assert _count(path) == 20
+    w.stop()
+
+
+def test_spool_replays_uncommitted_rows(db, tmp_path):
+    path, connect = db
+    spool = str(tmp_path / "writes.spool")
+    crashed = WriteBehindWriter(connect, spool_path=spool)
+    crashed._ensure_worker = lambda: None  # simulate a process that dies before its writer runs
+    crashed._queue.put = lambda *a, **k: None
+    for i in range(5):
+        crashed.submit(INSERT, (i,))
+    crashed._spool({"c": [1, 2]})  # rows 1-2 (x=0, x=1) made it into a commit
+    crashed._spool_file.close()  # the process dies: its lock is released
+    with open(crashed.own_spool_path, "a") as f:
+        f.write('{"s": 6, "q": "INS')  # torn final line
+
+    assert _count(path) == 0
+    restarted = WriteBehindWriter(connect, spool_path=spool)
+    assert restarted.replay() == 3
+    assert _count(path) == 3
+    assert not os.path.exists(crashed.own_spool_path)
+    assert restarted.replay() == 0
+
+
+def test_spool_is_emptied_once_everything_commits(db, tmp_path):
+    path, connect = db
+    spool = tmp_path / "writes.spool"
+    w = WriteBehindWriter(connect, batch_ms=10, spool_path=str(spool))
+    for i in range(10):
+        w.submit(INSERT, (i,))
+    assert w.flush(timeout=5)
+    assert open(w.own_spool_path).read() == ""
+    w.stop()
+    assert not os.path.exists(w.own_spool_path)
+
+
+def _stalled_writer(connect, spool, pid):
+    """A writer whose worker never runs, spooling as process `pid`"""
+    w = WriteBehindWriter(connect, spool_path=spool)
+    w.own_spool_path = f"{spool}.{pid}"
+    w._ensure_worker = lambda: None
+    w._queue.put = lambda *a, **k: None
+    return w
+
+
+def test_processes_sharing_a_spool_path_keep_separate_spools(db, tmp_path):
+    path, connect = db
+    spool = str(tmp_path / "writes.spool")
+    bot = _stalled_writer(connect, spool, 101)
+    tracker = _stalled_writer(connect, spool, 202)
+    for i in range(3):
+        bot.submit(INSERT, (i,))
+        tracker.submit(INSERT, (100 + i,))
+    # Same sequence numbers in both processes; a commit in one says nothing about the other
+    tracker._mark_committed([1, 2, 3])
+    assert open(bot.own_spool_path).read().count('"s":') == 3
+
+    # A starting process leaves the live bot's spool alone...
+    restarted = WriteBehindWriter(connect, spool_path=spool)
+    assert restarted.replay() == 0
+    assert os.path.exists(bot.own_spool_path)
+    # ...and recovers it once the bot is gone
+    bot._spool_file.close()
+    assert restarted.replay() == 3
+    assert _count(path) == 3
+
+
+def test_spool_is_compacted_after_partial_commits(db, tmp_path):
+    path, connect = db
+    spool = str(tmp_path / "writes.spool")
+    w = _stalled_writer(connect, spool, 303)
+    for i in range(10):
+        w.submit(INSERT, (i,))
+    w._mark_committed(range(1, 9))
+    lines = open(w.own_spool_path).read().splitlines()
+    assert [json.loads(line)["s"] for line in lines] == [9, 10]
+    w.submit(INSERT, (10,))
+    w._spool_file.close()
+    restarted = WriteBehindWriter(connect, spool_path=spool)
+    assert restarted.replay() == 3
+    assert _count(path) == 3
+
+
+def test_read_with_pending_sees_each_row_once(db):
+    path, connect = db
+    w = WriteBehindWriter(connect, batch_rows=100, batch_ms=5000)
+    w.submit(INSERT, (1,))
+    w.submit(INSERT, (2,))
+    count, queued = w.read_with_pending(INSERT, lambda: _count(path))
+    assert count == 0 and sorted(queued) == [[1], [2]]
+    assert w.flush(timeout=5)
+    count, queued = w.read_with_pending(INSERT, lambda: _count(path))
+    assert count == 2 and queued == []
+    w.stop()
+
+
+def test_storage_write_behind(tmp_path, monkeypatch):
+    from app import storage
+    from app.database_config import DatabasePaths
+
+    path = str(tmp_path / "alerted_tokens.db")
+    monkeypatch.setattr(storage, "DB_FILE", path)
+    monkeypatch.setattr(DatabasePaths, "SIGNALS_DB", path)
+    monkeypatch.setattr(storage, "_connections", ConnectionManager(pragmas=storage._connections.pragmas))
+    monkeypatch.setattr(storage, "STORAGE_WRITE_BEHIND", True)
+    monkeypatch.setattr(storage, "STORAGE_WRITE_BATCH_MS", 5000)
+    monkeypatch.setattr(storage, "STORAGE_WRITE_SPOOL", str(tmp_path / "writes.spool"))
+    monkeypatch.setattr(storage, "_writer", None)
+
+    storage.init_db()
+    storage.record_token_activity("TokA", 100.0, 1, True, 4, "Trader1")
+    storage.record_transaction_snapshot("TokA", "sig1", 1700000000.0, amount_usd=50.0)
+    storage.record_wallet_first_buy("TokA", "Wallet1", 1700000000.0, amount_usd=50.0)
+    storage.record_price_snapshot("TokA", {"price_usd": 0.01, "market_cap_usd": 1e6})
+    assert storage._writer.pending() == 4
+
+    # Reads of token_activity see queued observations without forcing a flush
+    assert len(storage.get_recent_token_signals("TokA", 300)) == 1
+    assert storage.get_recent_token_signals("TokB", 300) == []
+    assert storage._writer.pending() == 4
+    assert storage.close_connections() >= 1
+    assert storage._writer is None
+
+    conn = sqlite3.connect(path)
+    for table in ("token_activity", "transaction_snapshots", "wallet_first_buys", "price_snapshots"):
+        assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 1, table
+    conn.close()
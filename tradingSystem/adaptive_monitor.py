@@ -7,8 +7,10 @@ KEY INSIGHT: Not all tokens are short-term pumps
 - Established moonshots need LESS checking (room to breathe for days-long pumps)
 - This saves API limits AND captures multi-day gains
 """
+import heapq
+import threading
 import time
-from typing import Dict, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 class AdaptiveMonitor:
@@ -24,65 +26,64 @@ class AdaptiveMonitor:
         # Track last check time per position
         self.last_check: Dict[str, float] = {}
     
-    def should_check_position(self, 
-                             token: str, 
-                             entry_time: float,
-                             current_profit_pct: float,
-                             peak_profit_pct: float = 0.0) -> Tuple[bool, str]:
+    def interval_for(self, entry_time: float, current_profit_pct: float, now: float = None) -> Tuple[float, str]:
         """
-        Determine if we should check this position for exit
+        Check interval for a position given its age and profit (the tier rules)
         
-        Returns: (should_check: bool, reason: str)
+        Returns: (interval_sec: float, tier: str)
         """
-        now = time.time()
+        now = now if now is not None else time.time()
         position_age_hours = (now - entry_time) / 3600
         
-        # First check is always immediate
-        if token not in self.last_check:
-            self.last_check[token] = now
-            return True, "Initial check"
-        
-        time_since_last_check = now - self.last_check[token]
-        
         # === TIER 1: NEW & VOLATILE (Fast checks - protect capital) ===
         # Age < 1 hour OR profit < 50%
         if position_age_hours < 1.0 or current_profit_pct < 50.0:
-            if time_since_last_check >= self.FAST_INTERVAL:
-                self.last_check[token] = now
-                return True, f"Tier 1: New/Volatile (age={position_age_hours:.1f}h, profit={current_profit_pct:.1f}%)"
-            return False, "Tier 1: Too soon"
+            return self.FAST_INTERVAL, "Tier 1: New/Volatile"
         
         # === TIER 2: ESTABLISHED (Medium checks - give room to grow) ===
         # Age 1-4 hours AND profit 50-200%
         if position_age_hours < 4.0 and 50.0 <= current_profit_pct < 200.0:
-            if time_since_last_check >= self.MEDIUM_INTERVAL:
-                self.last_check[token] = now
-                return True, f"Tier 2: Established (age={position_age_hours:.1f}h, profit={current_profit_pct:.1f}%)"
-            return False, "Tier 2: Too soon"
+            return self.MEDIUM_INTERVAL, "Tier 2: Established"
         
         # === TIER 3: CONFIRMED MOONSHOT (Slow checks - let it pump for days) ===
         # Profit 200-500% OR age > 4 hours with profit > 100%
         if (200.0 <= current_profit_pct < 500.0) or \
            (position_age_hours > 4.0 and current_profit_pct > 100.0):
-            if time_since_last_check >= self.SLOW_INTERVAL:
-                self.last_check[token] = now
-                return True, f"Tier 3: Moonshot (age={position_age_hours:.1f}h, profit={current_profit_pct:.1f}%)"
-            return False, "Tier 3: Too soon"
+            return self.SLOW_INTERVAL, "Tier 3: Moonshot"
         
         # === TIER 4: MEGA PUMPER (Ultra slow - multi-day hold) ===
         # Profit >= 500% - These are stable mooners, check every 4 hours
         if current_profit_pct >= 500.0:
-            if time_since_last_check >= self.ULTRA_SLOW_INTERVAL:
-                self.last_check[token] = now
-                return True, f"Tier 4: Mega Pumper (age={position_age_hours:.1f}h, profit={current_profit_pct:.1f}%)"
-            return False, "Tier 4: Too soon"
+            return self.ULTRA_SLOW_INTERVAL, "Tier 4: Mega Pumper"
         
         # Default: Use medium interval
-        if time_since_last_check >= self.MEDIUM_INTERVAL:
+        return self.MEDIUM_INTERVAL, "Default"
+    
+    def should_check_position(self, 
+                             token: str, 
+                             entry_time: float,
+                             current_profit_pct: float,
+                             peak_profit_pct: float = 0.0) -> Tuple[bool, str]:
+        """
+        Determine if we should check this position for exit
+        
+        Returns: (should_check: bool, reason: str)
+        """
+        now = time.time()
+        position_age_hours = (now - entry_time) / 3600
+        
+        # First check is always immediate
+        if token not in self.last_check:
             self.last_check[token] = now
-            return True, f"Default check (age={position_age_hours:.1f}h, profit={current_profit_pct:.1f}%)"
+            return True, "Initial check"
         
-        return False, "Default: Too soon"
+        time_since_last_check = now - self.last_check[token]
+        interval, tier = self.interval_for(entry_time, current_profit_pct, now)
+        if time_since_last_check >= interval:
+            self.last_check[token] = now
+            label = "Default check" if tier == "Default" else tier
+            return True, f"{label} (age={position_age_hours:.1f}h, profit={current_profit_pct:.1f}%)"
+        return False, f"{tier.split(':')[0]}: Too soon"
     
     def reset_position(self, token: str):
         """Remove position from tracking (after it's closed)"""
@@ -102,3 +103,88 @@ class AdaptiveMonitor:
         }
 
 
+class ExitScheduler:
+    """
+    Priority queue of next-due exit checks (earliest deadline first).
+    
+    The exit loop sleeps until the earliest deadline instead of scanning every
+    position on a fixed tick. `wake()` makes a position due immediately (a newly
+    opened position, or shutdown) and interrupts the sleep.
+    """
+    
+    def __init__(self):
+        self._heap: List[Tuple[float, int, str]] = []
+        self._due: Dict[str, float] = {}  # token -> current deadline (heap entries may be stale)
+        self._seq = 0
+        self._cond = threading.Condition()
+    
+    def schedule(self, token: str, due_at: float) -> None:
+        """Set (or move) a position's next check time"""
+        with self._cond:
+            self._push(token, due_at)
+            self._cond.notify()
+    
+    def wake(self, token: Optional[str] = None) -> None:
+        """Make `token` due now (or just interrupt the sleep when token is None)"""
+        with self._cond:
+            if token:
+                self._push(token, time.time())
+            self._cond.notify()
+    
+    def remove(self, token: str) -> None:
+        with self._cond:
+            self._due.pop(token, None)
+    
+    def sync(self, tokens: Iterable[str], now: Optional[float] = None) -> None:
+        """Schedule unknown positions immediately and forget closed ones"""
+        now = now if now is not None else time.time()
+        live = set(tokens)
+        with self._cond:
+            for token in live - set(self._due):
+                self._push(token, now)
+            for token in set(self._due) - live:
+                del self._due[token]
+    
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """Remove and return every position whose deadline has passed"""
+        now = now if now is not None else time.time()
+        due: List[str] = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                due_at, _, token = heapq.heappop(self._heap)
+                if self._due.get(token) == due_at:
+                    del self._due[token]
+                    due.append(token)
+        return due
+    
+    def next_due_in(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the earliest deadline (None when nothing is scheduled)"""
+        now = now if now is not None else time.time()
+        with self._cond:
+            self._drop_stale()
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - now)
+    
+    def wait(self, max_wait: float) -> None:
+        """Sleep until the earliest deadline, a wake(), or `max_wait` seconds"""
+        with self._cond:
+            self._drop_stale()
+            timeout = max_wait
+            if self._heap:
+                timeout = min(max_wait, self._heap[0][0] - time.time())
+            if timeout > 0:
+                self._cond.wait(timeout)
+    
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._due)
+    
+    def _push(self, token: str, due_at: float) -> None:
+        self._seq += 1
+        self._due[token] = due_at
+        heapq.heappush(self._heap, (due_at, self._seq, token))
+    
+    def _drop_stale(self) -> None:
+        while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
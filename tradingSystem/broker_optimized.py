@@ -13,11 +13,10 @@ import threading
 import json
 import os
 import time
-import requests
 from typing import Dict, Optional, Tuple
 
-from app.http_client import request_json
 from app.jupiter_client import get_jupiter_client
+from app.rate_limiter import rate_lane
 from solana.rpc.api import Client as SolanaClient
 from solana.rpc.types import TxOpts
 from solders.keypair import Keypair
@@ -25,6 +24,8 @@ from solders.transaction import VersionedTransaction
 from solders.signature import Signature
 import base58 as b58
 
+from .token_meta import get_decimals, get_decimals_index
+from .sol_price import get_sol_price_service
 from .config_optimized import (
     DRY_RUN,
     RPC_URL,
@@ -38,6 +39,7 @@ from .config_optimized import (
     USDC_MINT,
     MAX_PRICE_IMPACT_BUY_PCT,
     MAX_PRICE_IMPACT_SELL_PCT,
+    SOL_PRICE_MAX_AGE_SEC,
     # New: faster execution toggle
     _get_bool as _cfg_get_bool,
 )
@@ -71,7 +73,8 @@ class Broker:
         self._rpc = SolanaClient(RPC_URL)
         self._kp = self._load_keypair(WALLET_SECRET) if not self._dry else None
         self._pubkey = str(self._kp.pubkey()) if self._kp else None
-        self._token_meta: Dict[str, int] = {}
+        get_decimals_index()  # load the persisted mint index now, not on the first trade
+        get_sol_price_service()  # first SOL price fetch + background refresher
         self._error_count = 0
         self._last_error_time = 0.0
         # Fast execution mode via env TS_FAST_EXECUTION=true (default true)
@@ -100,64 +103,20 @@ class Broker:
             return False
     
     def _get_sol_price_fallback(self) -> float:
-        """Get SOL price from external oracle as fallback (no Jupiter dependency)"""
-        try:
-            # Try CoinGecko (free, no API key needed)
-            resp = requests.get(
-                "https://api.coingecko.com/api/v3/simple/price?ids=solana&vs_currencies=usd",
-                timeout=5
-            )
-            if resp.status_code == 200:
-                price = float(resp.json()["solana"]["usd"])
-                print(f"[BROKER] SOL price from CoinGecko: ${price:.2f}", flush=True)
-                return price
-        except Exception as e:
-            print(f"[BROKER] CoinGecko failed: {e}", flush=True)
+        """SOL price from the shared price service (background-refreshed, no HTTP here)"""
+        price, age = get_sol_price_service().latest()
+        if price > 0:
+            if age > SOL_PRICE_MAX_AGE_SEC:
+                print(f"[BROKER] ⚠️ SOL price is {age:.0f}s old: ${price:.2f}", flush=True)
+            return price
         
         # Ultimate fallback - conservative estimate
         print("[BROKER] Using conservative SOL price estimate: $180", flush=True)
         return 180.0
 
     def _get_decimals(self, mint: str) -> int:
-        """Get token decimals with retry"""
-        # Fast-path for common mints to avoid network and wrong defaults
-        HARDCODED: Dict[str, int] = {
-            # SOL (wSOL)
-            "So11111111111111111111111111111111111111112": 9,
-            # USDC
-            "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v": 6,
-            # USDT
-            "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB": 6,
-            # BONK
-            "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263": 5,
-        }
-        if mint in HARDCODED:
-            self._token_meta[mint] = HARDCODED[mint]
-            return HARDCODED[mint]
-
-        if mint in self._token_meta:
-            return self._token_meta[mint]
-        
-        for attempt in range(3):
-            try:
-                r = request_json("GET", "https://token.jup.ag/all", timeout=10.0)
-                if r.get("status_code") != 200:
-                    raise RuntimeError(f"token meta fetch failed: {r.get('status_code')}")
-                payload = r.get("json") or []
-                for item in payload:
-                    if item.get("address") == mint:
-                        dec = int(item.get("decimals") or 6)
-                        self._token_meta[mint] = dec
-                        return dec
-                self._token_meta[mint] = 6
-                return 6
-            except Exception:
-                if attempt < 2:
-                    time.sleep(1 * (attempt + 1))
-                continue
-        
-        self._token_meta[mint] = 6
-        return 6
+        """Get token decimals from the persistent mint index (one targeted lookup on a miss)"""
+        return get_decimals(mint)
 
     def _sign_and_send(self, swap_tx_b64: str, max_retries: int = 3) -> Tuple[Optional[str], Optional[str]]:
         """Sign and send with confirmation"""
@@ -404,27 +363,8 @@ class Broker:
             
             # Convert USD to SOL amount if using SOL as base
             if BASE_MINT == "So11111111111111111111111111111111111111112":
-                # Get SOL price (approximate - for exact, would need price oracle)
-                # For now, use Jupiter quote-api to get rough SOL price
+                # SOL price from the shared price service (kept fresh in the background)
                 sol_price_usd = self._get_sol_price_fallback()
-                try:
-                    # Get SOL/USDC quote to determine SOL price
-                    from app.jupiter_client import get_jupiter_client
-                    jup = get_jupiter_client()
-                    q = jup.get_quote(
-                        input_mint=BASE_MINT,
-                        output_mint="EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
-                        amount=1000000000,
-                        slippage_bps=50,
-                        timeout=5.0
-                    )
-                    if q.get("status_code") == 200 and q.get("json"):
-                        out_amount = float(q["json"].get("outAmount", 0)) / 1e6  # USDC has 6 decimals
-                        if out_amount > 0:
-                            sol_price_usd = out_amount
-                            print(f"[BROKER] SOL price from Jupiter: ${sol_price_usd:.2f}", flush=True)
-                except Exception as e:
-                    print(f"[BROKER] Could not fetch SOL price from Jupiter, using fallback ${sol_price_usd:.2f}", flush=True)
                 
                 # Convert USD to SOL
                 sol_amount = float(usd_size) / sol_price_usd
@@ -573,7 +513,8 @@ class Broker:
         # CRITICAL: Use global sell lock to prevent simultaneous sells
         # This prevents API burst load when multiple positions try to sell at once
         # Example: 2 positions selling = 8 API calls in <1s → exceeds 10 RPS
-        with self._sell_lock:
+        # Sell quotes/swaps take the priority rate-limit lane (preempt price polling)
+        with self._sell_lock, rate_lane("exit"):
             return self._execute_sell(token, qty)
     
     def _execute_sell(self, token: str, qty: float) -> Fill:
@@ -784,7 +725,8 @@ class Broker:
             in_amount = int(1 * (10 ** dec))  # 1 token
             
             # Get quote selling token for USDC
-            quote = self._quote(token, "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v", in_amount, slippage_bps_override=50)
+            with rate_lane("poll"):
+                quote = self._quote(token, "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v", in_amount, slippage_bps_override=50)
             if not quote:
                 return 0.0
             
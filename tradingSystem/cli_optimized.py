@@ -14,7 +14,8 @@ import json
 import os
 import threading
 import time
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from typing import Optional, Dict, Tuple
 
 import requests
 import base58 as b58
@@ -23,8 +24,11 @@ from .watcher import follow_decisions, follow_signals_redis
 from .strategy_optimized import decide_trade, get_expected_win_rate, get_expected_avg_gain
 from .trader_optimized import TradeEngine
 from app.toggles import trading_enabled
-from .db import get_open_position_id_by_token
-from .config_optimized import MAX_CONCURRENT, EXIT_CHECK_INTERVAL_SEC
+from .position_book import get_position_book
+from .config_optimized import (
+    MAX_CONCURRENT, EXIT_CHECK_INTERVAL_SEC, EXIT_PRICE_FANOUT, EXIT_PRICE_WORKERS,
+    EXIT_SCHEDULER, EXIT_SCHEDULER_MAX_INTERVAL_SEC, EXIT_SCHEDULER_DRAWDOWN_PCT,
+)
 from .portfolio_manager import get_portfolio_manager, should_use_portfolio_manager
 from .price_cache import get_price_cache
 
@@ -56,11 +60,10 @@ def _get_last_price_usd(token: str, use_cache: bool = True) -> float:
     - vs 9 RPS Jupiter Pro limit = 5.6x headroom
     """
     from .jupiter_price_oracle import get_jupiter_oracle
-    from .db import get_open_qty_by_token
     
-    # Get current holdings for this token
+    # Get current holdings for this token (in-memory position book)
     try:
-        holdings = get_open_qty_by_token(token)
+        holdings = get_position_book().get_open_qty_by_token(token)
         if holdings is None or holdings <= 0:
             print(f"[PRICE] No holdings found for {token[:8]}, cannot get price", flush=True)
             return 0.0
@@ -166,6 +169,28 @@ def _fetch_real_stats(token: str) -> Optional[Dict]:
         except Exception:
             pass
     
+    # Shared stats cache (L1/L2 written by the bot) before hitting DexScreener
+    if not stats.get("market_cap_usd") or not stats.get("liquidity_usd") or not stats.get("price"):
+        try:
+            from app.analyze_token import get_cached_token_stats
+            cached = get_cached_token_stats(token) or {}
+            if cached:
+                if not stats.get("market_cap_usd"):
+                    stats["market_cap_usd"] = float(cached.get("market_cap_usd") or 0)
+                if not stats.get("liquidity_usd"):
+                    stats["liquidity_usd"] = float(cached.get("liquidity_usd") or 0)
+                if not stats.get("price"):
+                    stats["price"] = float(cached.get("price_usd") or 0)
+                if "change_1h" not in stats:
+                    stats["change_1h"] = float((cached.get("change") or {}).get("1h") or 0)
+                if "vol24_usd" not in stats:
+                    vol24 = float(((cached.get("volume") or {}).get("24h") or {}).get("volume_usd") or 0)
+                    mcap = stats.get("market_cap_usd") or 1
+                    stats["ratio"] = vol24 / max(mcap, 1) if mcap > 0 else 0
+                    stats["vol24_usd"] = vol24
+        except Exception:
+            pass
+    
     # Validation (fallback to DexScreener for missing fields)
     if not stats.get("market_cap_usd") or not stats.get("liquidity_usd") or not stats.get("price"):
         try:
@@ -229,6 +254,77 @@ def _is_stale_signal(stats: Dict, current_price: Optional[float] = None, max_age
     return False
 
 
+def _fetch_exit_prices(tokens, pool: Optional[ThreadPoolExecutor], timeout: float) -> Dict[str, Tuple[float, float]]:
+    """Fetch exit prices for all tokens, concurrently when a pool is given.
+    
+    Every quote still goes through the shared Jupiter token bucket, so the pool
+    only overlaps request latency; it cannot exceed the RPS limit.
+    
+    Returns:
+        {token: (price_usd, fetched_at)}; tokens still in flight at `timeout` are omitted
+    """
+    prices: Dict[str, Tuple[float, float]] = {}
+    if not tokens:
+        return prices
+    if pool is None or len(tokens) == 1:
+        for token in tokens:
+            prices[token] = (_get_last_price_usd(token, use_cache=True), time.time())
+        return prices
+    futures = {pool.submit(_get_last_price_usd, token, True): token for token in tokens}
+    try:
+        for fut in as_completed(futures, timeout=timeout):
+            token = futures[fut]
+            try:
+                prices[token] = (float(fut.result() or 0.0), time.time())
+            except Exception as e:
+                print(f"[EXIT_LOOP] Price fetch error for {token[:8]}...: {e}", flush=True)
+                prices[token] = (0.0, time.time())
+    except FuturesTimeout:
+        pending = [futures[f][:8] for f in futures if not f.done()]
+        print(f"[EXIT_LOOP] ⚠️ Price fan-out deadline ({timeout:.0f}s) hit; pending: {pending}", flush=True)
+    return prices
+
+
+def _report_exit_tick(engine: TradeEngine, iteration: int, started: float, prices_ready: float,
+                      positions: int, staleness: list, interval: float) -> None:
+    """Log tick duration and price staleness (every minute, or whenever the tick overruns)"""
+    now = time.time()
+    tick_sec = now - started
+    overrun = tick_sec > interval
+    if not positions or not (overrun or iteration % 12 == 0):
+        return
+    fields = {
+        "positions": positions,
+        "tick_ms": round(tick_sec * 1000.0, 1),
+        "price_fetch_ms": round((prices_ready - started) * 1000.0, 1),
+        "checks": len(staleness),
+        "max_staleness_ms": round(max(staleness) * 1000.0, 1) if staleness else None,
+        "avg_staleness_ms": round(sum(staleness) * 1000.0 / len(staleness), 1) if staleness else None,
+        "overrun": overrun,
+    }
+    engine._log("exit_tick", **fields)
+    if overrun:
+        print(f"[EXIT_LOOP] ⚠️ Tick took {tick_sec:.2f}s for {positions} positions (interval {interval}s): {fields}", flush=True)
+
+
+def _next_check_in(tier_interval: float, base_interval: float, price: float, last_price: Optional[float],
+                   max_interval: float = EXIT_SCHEDULER_MAX_INTERVAL_SEC,
+                   drawdown_pct: float = EXIT_SCHEDULER_DRAWDOWN_PCT) -> float:
+    """Seconds until a position's next scheduled exit check.
+    
+    The adaptive tier sets the pace (floored at the base interval so Tier 1 quote
+    volume is unchanged), capped at `max_interval` so a crash in a slow-tier
+    position is seen within that poll. A drop of `drawdown_pct` since the previous
+    check falls back to the base interval until the price settles.
+    """
+    interval = max(tier_interval, base_interval)
+    if max_interval and max_interval > 0:
+        interval = min(interval, max(max_interval, base_interval))
+    if last_price and last_price > 0 and drawdown_pct > 0 and price < last_price * (1.0 - drawdown_pct / 100.0):
+        interval = base_interval
+    return interval
+
+
 def _exit_loop(engine: TradeEngine, stop_event: threading.Event) -> None:
     """Background thread to check exits and maintain portfolio"""
     print("[EXIT_LOOP] Starting exit monitoring thread...", flush=True)
@@ -237,7 +333,7 @@ def _exit_loop(engine: TradeEngine, stop_event: threading.Event) -> None:
     iteration = 0
     
     # Initialize adaptive monitoring (smart intervals based on position maturity)
-    from tradingSystem.adaptive_monitor import AdaptiveMonitor
+    from tradingSystem.adaptive_monitor import AdaptiveMonitor, ExitScheduler
     monitor = AdaptiveMonitor()
     
     # Base check interval (for loop sleep)
@@ -250,6 +346,19 @@ def _exit_loop(engine: TradeEngine, stop_event: threading.Event) -> None:
     print(f"[EXIT_LOOP] Inactivity exit: 6+ hours of <5% movement", flush=True)
     print(f"[EXIT_LOOP] Moonshot mode: High-profit (>200%) + active price = unlimited hold", flush=True)
     
+    # Concurrent price fan-out: all due positions priced together, then exits checked in one pass
+    price_pool = None
+    if EXIT_PRICE_FANOUT and EXIT_PRICE_WORKERS > 1:
+        price_pool = ThreadPoolExecutor(max_workers=EXIT_PRICE_WORKERS, thread_name_prefix="exit-price")
+    print(f"[EXIT_LOOP] Price fan-out: {'%d workers' % EXIT_PRICE_WORKERS if price_pool else 'sequential'}", flush=True)
+    
+    # Deadline scheduler: sleep until the earliest tier deadline and price only due positions
+    scheduler = ExitScheduler() if EXIT_SCHEDULER else None
+    checked_price: Dict[str, float] = {}  # price at each position's previous scheduled check
+    if scheduler is not None:
+        engine.exit_wakeup = scheduler.wake
+    print(f"[EXIT_LOOP] Scheduling: {f'deadline heap (max {EXIT_SCHEDULER_MAX_INTERVAL_SEC:.0f}s between checks)' if scheduler else f'scan every {check_interval}s'}", flush=True)
+    
     while not stop_event.is_set():
         try:
             iteration += 1
@@ -294,43 +403,74 @@ def _exit_loop(engine: TradeEngine, stop_event: threading.Event) -> None:
             # Pausing exits during cooldowns causes massive losses (-20% -> -37% bleeding)
             
             # Check exits for all open positions (prices are cached!)
-            for token in list(engine.live.keys()):
+            # Phase 1: pick positions with a real open quantity (position book, no I/O)
+            tick_started = time.time()
+            if scheduler is not None:
+                scheduler.sync(engine.live.keys())
+                candidates = scheduler.pop_due()
+            else:
+                candidates = list(engine.live.keys())
+            next_interval: Dict[str, float] = {}
+            eligible = []
+            for token in candidates:
                 try:
-                    pid = get_open_position_id_by_token(token)
+                    pid = engine.book.get_open_position_id_by_token(token)
                     if not pid:
                         continue
                     
                     # CRITICAL: Skip positions with quantity=0 (failed fills)
                     # These are ghost entries that spam Jupiter and trigger rate limits
-                    from tradingSystem.db import get_open_qty
-                    qty = get_open_qty(pid)
+                    qty = engine.book.get_open_qty(pid)
                     if iteration == 1:  # Debug on first iteration
                         print(f"[EXIT_LOOP] Position {token[:8]}... qty={qty} (type={type(qty).__name__})", flush=True)
                     if qty == 0 or qty == 0.0:
                         if iteration % 300 == 0 or iteration == 1:
                             print(f"[EXIT_LOOP] Skipping {token[:8]}... (quantity={qty}, failed fill)", flush=True)
                         continue
-                    
+                    eligible.append(token)
+                except Exception as e:
+                    engine._log("exit_check_error", token=token, error=str(e))
+                    print(f"[EXIT_LOOP] Exit check error for {token[:8]}...: {e}", flush=True)
+            
+            # Phase 2: every eligible position's price, fetched together before any exit check
+            prices = _fetch_exit_prices(eligible, price_pool, timeout=max(check_interval * 2, 10.0))
+            prices_ready = time.time()
+            
+            # Phase 3: exits, against prices that are all from this tick
+            staleness = []
+            for token in eligible:
+                if token not in prices:
+                    continue  # Fetch still running at the deadline; picked up next tick
+                try:
                     # Get position data for adaptive monitoring
                     pos_data = engine.live.get(token, {})
                     entry_time = pos_data.get("entry_time", time.time())
                     entry_price = pos_data.get("entry_price", 0)  # FIXED: was "entry" (wrong key!)
                     
-                    # Get current price (will use cache if available)
-                    price = _get_last_price_usd(token, use_cache=True)
+                    # Price fetched for this tick (concurrently, under the Jupiter limiter)
+                    price, fetched_at = prices[token]
                     
                     if price > 0:
                         # Calculate current profit
                         current_profit_pct = ((price - entry_price) / entry_price * 100) if entry_price > 0 else 0
                         
                         # ADAPTIVE MONITORING: Check if this position needs monitoring right now
-                        should_check, reason = monitor.should_check_position(
-                            token=token,
-                            entry_time=entry_time,
-                            current_profit_pct=current_profit_pct
-                        )
+                        if scheduler is not None:
+                            # Due by construction; the tier (capped, drawdown-aware) only sets the next deadline
+                            interval, reason = monitor.interval_for(entry_time, current_profit_pct)
+                            next_interval[token] = _next_check_in(interval, check_interval, price, checked_price.get(token))
+                            checked_price[token] = price
+                            monitor.last_check[token] = time.time()
+                            should_check = True
+                        else:
+                            should_check, reason = monitor.should_check_position(
+                                token=token,
+                                entry_time=entry_time,
+                                current_profit_pct=current_profit_pct
+                            )
                         
                         if should_check:
+                            staleness.append(time.time() - fetched_at)
                             if iteration % 300 == 0 or "Tier" in reason:
                                 print(f"[EXIT_LOOP] ✓ Checking {token[:8]}... ${price:.8f} ({reason})", flush=True)
                             engine.check_exits(token, price)
@@ -357,10 +497,9 @@ def _exit_loop(engine: TradeEngine, stop_event: threading.Event) -> None:
                                 
                                 # Force close in database and clear from live
                                 try:
-                                    from tradingSystem.db import close_position
                                     data = engine.live.get(token)
                                     if data and data.get("pid"):
-                                        close_position(data["pid"])
+                                        engine.book.close_position(data["pid"])
                                     engine.live.pop(token, None)
                                     monitor.reset_position(token)  # Clean up adaptive monitor
                                     engine.inactivity_monitor.reset_position(token)  # Clean up inactivity monitor
@@ -378,7 +517,19 @@ def _exit_loop(engine: TradeEngine, stop_event: threading.Event) -> None:
                     engine._log("exit_check_error", token=token, error=str(e))
                     print(f"[EXIT_LOOP] Exit check error for {token[:8]}...: {e}", flush=True)
             
-            time.sleep(check_interval)
+            _report_exit_tick(engine, iteration, tick_started, prices_ready, len(eligible), staleness, check_interval)
+            
+            if scheduler is not None:
+                now = time.time()
+                for token in candidates:
+                    if token in engine.live:
+                        scheduler.schedule(token, now + next_interval.get(token, check_interval))
+                    else:
+                        checked_price.pop(token, None)
+                # Sleep until the earliest deadline, or until a new position (or shutdown) wakes us
+                scheduler.wait(max_wait=30.0)
+            else:
+                time.sleep(check_interval)
             
         except Exception as e:
             engine._log("exit_loop_error", error=str(e))
@@ -386,6 +537,9 @@ def _exit_loop(engine: TradeEngine, stop_event: threading.Event) -> None:
             import traceback
             traceback.print_exc()
             time.sleep(5)
+    
+    if price_pool is not None:
+        price_pool.shutdown(wait=False)
 
 
 def run() -> None:
@@ -741,6 +895,10 @@ def run() -> None:
                 print(f"[DEBUG] Trade decision logged, attempting to open position for {token_norm[:8]}...", flush=True)
                 print(f"[DEBUG] Plan details: {plan}", flush=True)
                 
+                # Latency trace from the bot (feed item -> signal); open_position stamps the fill
+                if ev.get("trace"):
+                    plan["trace"] = ev.get("trace")
+                
                 try:
                     print(f"[DEBUG] Calling engine.open_position({token_norm[:8]}, plan)...", flush=True)
                     pid = engine.open_position(token_norm, plan)
@@ -775,7 +933,9 @@ def run() -> None:
         engine._log("trading_system_error", error=str(e))
     finally:
         stop_event.set()
+        engine.request_exit_check()  # Interrupt the exit scheduler's sleep
         exit_thread.join(timeout=5)
+        engine.book.stop()  # Persist pending peak updates
         engine._log("trading_system_stopped")
 
 
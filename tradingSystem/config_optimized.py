@@ -176,6 +176,34 @@ EXIT_CHECK_INTERVAL_SEC = _get_float("TS_EXIT_CHECK_INTERVAL", 3.0 if os.getenv(
 # Signal detection still uses Cielo+DexScreener (proven 33% WR, 7.9x avg)
 JUPITER_PRICE_CACHE_TTL = _get_int("TS_JUPITER_PRICE_CACHE_TTL", 10)
 
+# Exit loop price fan-out: quote all open positions concurrently each tick (bounded
+# pool, still under the shared Jupiter token bucket), then run check_exits in one pass
+EXIT_PRICE_FANOUT = _get_bool("TS_EXIT_PRICE_FANOUT", True)
+EXIT_PRICE_WORKERS = _get_int("TS_EXIT_PRICE_WORKERS", 8)
+
+# Exit scheduling: deadline heap keyed by each position's adaptive-tier interval
+# (False = legacy scan of every position every TS_EXIT_CHECK_INTERVAL seconds)
+EXIT_SCHEDULER = _get_bool("TS_EXIT_SCHEDULER", True)
+# Slow tiers (30m/2h/4h) are capped so every position is still re-priced at least
+# this often; trailing stops and stop losses are evaluated on each of those polls
+EXIT_SCHEDULER_MAX_INTERVAL_SEC = _get_float("TS_EXIT_SCHEDULER_MAX_INTERVAL", 60.0)
+# A drop of this many percent since a position's previous check puts it back on the base interval
+EXIT_SCHEDULER_DRAWDOWN_PCT = _get_float("TS_EXIT_SCHEDULER_DRAWDOWN_PCT", 10.0)
+
+# Position book: open positions live in memory; peak updates are written to the
+# DB in batches every TS_BOOK_FLUSH_SEC seconds (fills and closes write through)
+BOOK_FLUSH_SEC = _get_float("TS_BOOK_FLUSH_SEC", 5.0)
+
+# Mint decimals index: misses are resolved per mint; the full Jupiter token list
+# is re-downloaded in the background every TS_TOKEN_LIST_REFRESH_SEC (0 = never)
+TOKEN_LIST_URL = os.getenv("TS_TOKEN_LIST_URL", "https://token.jup.ag/all")
+TOKEN_LIST_REFRESH_SEC = _get_float("TS_TOKEN_LIST_REFRESH_SEC", 86400.0)
+
+# SOL/USD price service: refreshed in the background (shared via Redis when
+# REDIS_URL is set); readers use the last value and treat it as stale after MAX_AGE
+SOL_PRICE_REFRESH_SEC = _get_float("TS_SOL_PRICE_REFRESH_SEC", 15.0)
+SOL_PRICE_MAX_AGE_SEC = _get_float("TS_SOL_PRICE_MAX_AGE_SEC", 300.0)
+
 # ==================== CIRCUIT BREAKERS ====================
 # DISABLED: Let the bot trade freely (Jupiter oracle will protect with proper stop losses)
 MAX_DAILY_LOSS_PCT = _get_float("TS_MAX_DAILY_LOSS_PCT", 999999.0)  # Effectively disabled
@@ -190,6 +218,7 @@ MIN_VOLUME_RATIO = _get_float("TS_MIN_VOLUME_RATIO", 0.1)  # Vol/MC ratio min
 
 # ==================== PATHS ====================
 DB_PATH = os.getenv("TS_DB_PATH", "var/trading.db")
+TOKEN_META_DB_PATH = os.getenv("TS_TOKEN_META_DB", "var/token_meta.db")  # mint -> decimals index
 LOG_JSON_PATH = os.getenv("TS_LOG_JSON", "data/logs/trading.jsonl")
 LOG_TEXT_PATH = os.getenv("TS_LOG_TEXT", "data/logs/trading.log")
 
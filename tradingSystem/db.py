@@ -1,6 +1,6 @@
 import os
 import sqlite3
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from .config_optimized import DB_PATH
 
 
@@ -131,6 +131,11 @@ def update_peak_and_trail(position_id: int, price: float, entry_price: float = 0
 		peak = price
 	conn.close()
 	
+	return peak or 0.0, compute_trail(peak or 0.0, entry, trail_static)
+
+
+def compute_trail(peak: float, entry: float, trail_static: Optional[float]) -> float:
+	"""Profit-based trailing stop % for a position at `peak` (static trail when adaptive trailing is off)"""
 	# Calculate profit-based trail (MOONSHOT MODE - AUDIT OPTIMIZED!)
 	from tradingSystem.config_optimized import (
 		ADAPTIVE_TRAILING_ENABLED,
@@ -161,7 +166,7 @@ def update_peak_and_trail(position_id: int, price: float, entry_price: float = 0
 		# Fall back to static trail from position creation
 		trail = trail_static or 10.0
 	
-	return peak or 0.0, trail or 10.0
+	return trail or 10.0
 
 
 def close_position(position_id: int) -> None:
@@ -217,3 +222,40 @@ def get_open_qty_by_token(token_address: str) -> Optional[float]:
 	except Exception:
 		return None
 
+
+def load_open_positions() -> List[Tuple]:
+	"""
+	All open positions with their open quantity in one query:
+	(id, token_address, strategy, entry_price, peak_price, trail_pct, open_at, open_qty)
+	"""
+	conn = _conn()
+	c = conn.cursor()
+	c.execute(
+		"""
+		SELECT p.id, p.token_address, p.strategy, p.entry_price, p.peak_price, p.trail_pct, p.open_at,
+			COALESCE(SUM(CASE WHEN f.side='buy' THEN COALESCE(f.qty,0) ELSE 0 END), 0)
+				- COALESCE(SUM(CASE WHEN f.side='sell' THEN COALESCE(f.qty,0) ELSE 0 END), 0)
+		FROM positions p LEFT JOIN fills f ON f.position_id = p.id
+		WHERE p.status='open'
+		GROUP BY p.id
+		ORDER BY p.id
+		"""
+	)
+	rows = c.fetchall()
+	conn.close()
+	return rows
+
+
+def update_peaks(peaks: List[Tuple[int, float]]) -> None:
+	"""Batch-persist peak prices [(position_id, peak)] in one transaction (never lowers a stored peak)"""
+	if not peaks:
+		return
+	conn = _conn()
+	try:
+		conn.executemany(
+			"UPDATE positions SET peak_price=? WHERE id=? AND (peak_price IS NULL OR peak_price < ?)",
+			[(peak, pid, peak) for pid, peak in peaks],
+		)
+		conn.commit()
+	finally:
+		conn.close()
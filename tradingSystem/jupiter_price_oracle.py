@@ -83,7 +83,8 @@ class JupiterPriceOracle:
                 amount=in_amount,
                 slippage_bps=2000,  # 20% slippage for quote
                 timeout=5.0,
-                only_direct_routes=False  # Allow multi-hop routes for low-liq tokens
+                only_direct_routes=False,  # Allow multi-hop routes for low-liq tokens
+                lane="exit"  # exit-monitoring quote: preempts polling and health checks
             )
             
             if result["status_code"] != 200 or not result.get("json"):
@@ -124,79 +125,23 @@ class JupiterPriceOracle:
             return 0.0
     
     def _get_token_decimals(self, token: str) -> Optional[int]:
-        """Get token decimals (cached internally by Jupiter client)"""
+        """Get token decimals from the persistent mint index shared with the broker"""
         try:
-            from app.jupiter_client import get_jupiter_client
-            jupiter = get_jupiter_client()
-            # Use the broker's _get_decimals if available, or default to 6 for most tokens
-            try:
-                from tradingSystem.broker_optimized import Broker
-                broker = Broker()
-                return broker._get_decimals(token)
-            except:
-                # Fallback: most pump.fun tokens are 6 decimals
-                return 6
+            from tradingSystem.token_meta import get_decimals
+            return get_decimals(token)
         except Exception as e:
             logger.error(f"Error getting decimals for {token[:8]}: {e}")
             return None
     
     def _get_sol_price_usd(self) -> float:
-        """Get current SOL price in USD (with caching)"""
-        cache_key = "SOL_PRICE"
-        
-        # Check cache (use 30s TTL for SOL price)
-        with self._lock:
-            if cache_key in self._cache:
-                cached_price, cached_time = self._cache[cache_key]
-                age = time.time() - cached_time
-                if age < 30:  # 30 second cache for SOL price
-                    return cached_price
-        
+        """Get current SOL price in USD from the shared price service (memory read, no HTTP)"""
         try:
-            import requests
-            
-            # Try CoinGecko first (no API key needed)
-            resp = requests.get(
-                "https://api.coingecko.com/api/v3/simple/price",
-                params={"ids": "solana", "vs_currencies": "usd"},
-                timeout=3
-            )
-            
-            if resp.status_code == 200:
-                data = resp.json()
-                sol_price = float(data.get("solana", {}).get("usd", 0))
-                
-                if sol_price > 0:
-                    # Cache it
-                    with self._lock:
-                        self._cache[cache_key] = (sol_price, time.time())
-                    return sol_price
-            
-            # Fallback to Jupiter's SOL/USDC quote
-            from app.jupiter_client import get_jupiter_client
-            from tradingSystem.config_optimized import USDC_MINT, SOL_MINT
-            
-            jupiter = get_jupiter_client()
-            result = jupiter.get_quote(
-                input_mint=SOL_MINT,
-                output_mint=USDC_MINT,
-                amount=1000000000,  # 1 SOL
-                slippage_bps=50,
-                timeout=3.0
-            )
-            
-            if result["status_code"] == 200 and result.get("json"):
-                quote = result["json"]
-                usdc_out = float(quote.get("outAmount", 0)) / 1e6  # USDC has 6 decimals
-                
-                if usdc_out > 0:
-                    with self._lock:
-                        self._cache[cache_key] = (usdc_out, time.time())
-                    return usdc_out
-            
-            logger.warning("Could not fetch SOL price from any source")
-            return 0.0
-            
+            from tradingSystem.sol_price import get_sol_price_service
+            service = get_sol_price_service()
+            price, age = service.latest()
+            if price > 0 and service.is_stale():
+                logger.warning(f"SOL price is {age:.0f}s old")
+            return price
         except Exception as e:
             logger.error(f"Error getting SOL price: {e}")
             return 0.0
@@ -0,0 +1,203 @@
+"""
+In-memory book of open positions (qty, pid, entry, peak, trail per token).
+
+Loaded once from the trading DB on startup and authoritative afterwards, so the
+exit loop's per-tick reads never touch SQLite. Position opens, fills and closes
+are written through to the DB synchronously; peak updates only change memory
+and are persisted in batches by a background flusher (and on close/stop).
+"""
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from . import db
+from .config_optimized import BOOK_FLUSH_SEC
+
+
+class PositionBook:
+	"""Open positions by pid and token, with write-behind peak persistence"""
+
+	def __init__(self, flush_interval_sec: float = BOOK_FLUSH_SEC):
+		self.flush_interval_sec = max(0.1, float(flush_interval_sec))
+		self._lock = threading.RLock()
+		self._by_pid: Dict[int, Dict[str, object]] = {}
+		self._by_token: Dict[str, int] = {}
+		self._dirty_peaks: Dict[int, float] = {}
+		self._loaded = False
+		self._stop = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+
+	# ---- loading ----
+
+	def load(self) -> List[Dict[str, object]]:
+		"""(Re)load open positions from the DB; returns the entries in pid order"""
+		rows = db.load_open_positions()
+		with self._lock:
+			self._by_pid.clear()
+			self._by_token.clear()
+			for pid, token, strategy, entry_price, peak_price, trail_pct, open_at, qty in rows:
+				self._put(int(pid), str(token), str(strategy), float(entry_price or 0),
+					float(peak_price or entry_price or 0), trail_pct, open_at, float(qty or 0))
+			self._loaded = True
+			return [dict(e) for e in self._by_pid.values()]
+
+	def _ensure_loaded(self) -> None:
+		if not self._loaded:
+			self.load()
+
+	def _put(self, pid: int, token: str, strategy: str, entry_price: float, peak_price: float,
+			trail_pct: Optional[float], open_at: object, qty: float) -> None:
+		self._by_pid[pid] = {
+			"pid": pid,
+			"token": token,
+			"strategy": strategy,
+			"entry_price": entry_price,
+			"peak_price": peak_price,
+			"trail_pct": trail_pct,
+			"open_at": open_at,
+			"qty": qty,
+		}
+		# Newest open position wins, matching get_open_position_id_by_token's ORDER BY id DESC
+		if pid >= self._by_token.get(token, 0):
+			self._by_token[token] = pid
+
+	# ---- write-through ----
+
+	def create_position(self, token: str, strategy: str, entry_price: float, qty: float, usd_size: float, trail_pct: float) -> int:
+		pid = db.create_position(token, strategy, entry_price, qty, usd_size, trail_pct)
+		with self._lock:
+			self._ensure_loaded()
+			# Open qty comes from fills, so it starts at zero until the buy fill is recorded
+			self._put(int(pid), token, strategy, float(entry_price or 0), float(entry_price or 0), trail_pct, None, 0.0)
+		return pid
+
+	def add_fill(self, position_id: int, side: str, price: float, qty: float, usd: float) -> None:
+		db.add_fill(position_id, side, price, qty, usd)
+		with self._lock:
+			entry = self._by_pid.get(int(position_id))
+			if entry is not None:
+				delta = float(qty or 0)
+				entry["qty"] = float(entry["qty"]) + (delta if side == "buy" else -delta if side == "sell" else 0.0)
+
+	def close_position(self, position_id: int) -> None:
+		pid = int(position_id)
+		with self._lock:
+			peak = self._dirty_peaks.pop(pid, None)
+		if peak is not None:
+			try:
+				db.update_peaks([(pid, peak)])
+			except Exception:
+				pass
+		db.close_position(pid)
+		with self._lock:
+			entry = self._by_pid.pop(pid, None)
+			if entry is not None and self._by_token.get(str(entry["token"])) == pid:
+				del self._by_token[str(entry["token"])]
+				# Fall back to an older open position for the same token, if any
+				older = [p for p, e in self._by_pid.items() if e["token"] == entry["token"]]
+				if older:
+					self._by_token[str(entry["token"])] = max(older)
+
+	# ---- per-tick reads (memory only) ----
+
+	def update_peak_and_trail(self, position_id: int, price: float, entry_price: float = 0.0) -> Tuple[float, float]:
+		"""Same contract as db.update_peak_and_trail; the new peak is persisted by the flusher"""
+		pid = int(position_id)
+		with self._lock:
+			self._ensure_loaded()
+			entry = self._by_pid.get(pid)
+			if entry is None:
+				return db.update_peak_and_trail(pid, price, entry_price)
+			peak = float(entry["peak_price"] or 0)
+			if price > peak:
+				peak = float(price)
+				entry["peak_price"] = peak
+				self._dirty_peaks[pid] = peak
+			entry_px = entry_price if entry_price > 0 else float(entry["entry_price"] or 0)
+			trail_static = entry["trail_pct"]
+		self.start()
+		return peak or 0.0, db.compute_trail(peak or 0.0, entry_px, trail_static)
+
+	def get_open_qty(self, position_id: int) -> float:
+		with self._lock:
+			self._ensure_loaded()
+			entry = self._by_pid.get(int(position_id))
+			if entry is not None:
+				return float(entry["qty"])
+		# Not an open position we know about (closed, or opened by another process)
+		return db.get_open_qty(int(position_id))
+
+	def get_open_position_id_by_token(self, token: str) -> Optional[int]:
+		with self._lock:
+			self._ensure_loaded()
+			return self._by_token.get(token)
+
+	def get_open_qty_by_token(self, token_address: str) -> Optional[float]:
+		with self._lock:
+			self._ensure_loaded()
+			pid = self._by_token.get(token_address)
+			if pid is None:
+				return None
+			return float(self._by_pid[pid]["qty"])
+
+	def __len__(self) -> int:
+		with self._lock:
+			return len(self._by_pid)
+
+	# ---- write-behind ----
+
+	def flush(self) -> int:
+		"""Persist pending peak updates in one transaction; returns how many were written"""
+		with self._lock:
+			pending = list(self._dirty_peaks.items())
+			self._dirty_peaks.clear()
+		if not pending:
+			return 0
+		try:
+			db.update_peaks(pending)
+		except Exception as e:
+			# Put them back (keeping any newer peak) so the next flush retries
+			with self._lock:
+				for pid, peak in pending:
+					if pid in self._by_pid and peak > self._dirty_peaks.get(pid, 0.0):
+						self._dirty_peaks[pid] = peak
+			print(f"[BOOK] ⚠️ Peak flush failed ({len(pending)} pending): {e}", flush=True)
+			return 0
+		return len(pending)
+
+	def start(self) -> None:
+		"""Start the background flusher (idempotent)"""
+		if self._thread is not None and self._thread.is_alive():
+			return
+		with self._lock:
+			if self._thread is not None and self._thread.is_alive():
+				return
+			self._stop.clear()
+			self._thread = threading.Thread(target=self._run, name="position-book-flush", daemon=True)
+			self._thread.start()
+
+	def stop(self, timeout: float = 5.0) -> None:
+		"""Stop the flusher and write any pending peaks"""
+		self._stop.set()
+		thread = self._thread
+		if thread is not None and thread.is_alive():
+			thread.join(timeout)
+		self._thread = None
+		self.flush()
+
+	def _run(self) -> None:
+		while not self._stop.wait(self.flush_interval_sec):
+			self.flush()
+
+
+_position_book: Optional[PositionBook] = None
+_position_book_lock = threading.Lock()
+
+
+def get_position_book() -> PositionBook:
+	"""Get or create the process-wide position book"""
+	global _position_book
+	if _position_book is None:
+		with _position_book_lock:
+			if _position_book is None:
+				_position_book = PositionBook()
+	return _position_book
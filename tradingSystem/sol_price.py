@@ -0,0 +1,180 @@
+"""
+SOL/USD price service shared by the price oracle, broker and wallet balance.
+
+A background thread keeps the latest price fresh; readers get it from memory
+(a single tuple swap, no lock) together with its age, so converting quotes to
+USD never waits on the network. Sources are tried in order: the value another
+process shared in Redis (when fresh), CoinGecko, then a Jupiter SOL/USDC quote.
+"""
+import json
+import os
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+import requests
+
+from .config_optimized import SOL_MINT, USDC_MINT, SOL_PRICE_REFRESH_SEC, SOL_PRICE_MAX_AGE_SEC
+
+
+REDIS_KEY = "sol_price_usd"
+COINGECKO_URL = "https://api.coingecko.com/api/v3/simple/price"
+
+
+def _redis_client() -> Any:
+    url = os.getenv("REDIS_URL") or os.getenv("CALLSBOT_REDIS_URL") or ""
+    if not url:
+        return None
+    try:
+        import redis  # type: ignore
+        client = redis.from_url(url, decode_responses=True, socket_timeout=2, socket_connect_timeout=2)
+        client.ping()
+        return client
+    except Exception as e:
+        print(f"[SOL_PRICE] Redis unavailable ({e}); price is per-process", flush=True)
+        return None
+
+
+class SolPriceService:
+    """Latest SOL/USD price with a background refresher"""
+
+    def __init__(self, refresh_interval_sec: float = SOL_PRICE_REFRESH_SEC,
+                 max_age_sec: float = SOL_PRICE_MAX_AGE_SEC, redis_client: Any = None):
+        self.refresh_interval_sec = max(1.0, float(refresh_interval_sec))
+        self.max_age_sec = float(max_age_sec)
+        self.redis = redis_client
+        # (price, updated_at, source); replaced as a whole so reads need no lock
+        self._snapshot: Tuple[float, float, str] = (0.0, 0.0, "")
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- reads (memory only) ----
+
+    def latest(self) -> Tuple[float, float]:
+        """(price, age_sec); price is 0.0 and age is inf before the first refresh"""
+        price, updated_at, _ = self._snapshot
+        if price <= 0:
+            return 0.0, float("inf")
+        return price, max(0.0, time.time() - updated_at)
+
+    def price(self, default: float = 0.0) -> float:
+        """Latest price, or `default` when none has been fetched yet"""
+        price, _ = self.latest()
+        return price if price > 0 else default
+
+    def is_stale(self) -> bool:
+        return self.latest()[1] > self.max_age_sec
+
+    # ---- refresh ----
+
+    def _set(self, price: float, source: str, updated_at: Optional[float] = None) -> None:
+        self._snapshot = (float(price), updated_at if updated_at is not None else time.time(), source)
+
+    def refresh(self) -> bool:
+        """Fetch a new price from the first source that answers; returns True on success"""
+        with self._refresh_lock:
+            shared = self._read_shared()
+            if shared is not None:
+                price, ts = shared
+                if price > 0 and time.time() - ts < self.refresh_interval_sec:
+                    if ts > self._snapshot[1]:
+                        self._set(price, "redis", ts)
+                    return True
+            for source, fetch in (("coingecko", self._fetch_coingecko), ("jupiter", self._fetch_jupiter)):
+                try:
+                    price = fetch()
+                except Exception:
+                    price = 0.0
+                if price and price > 0:
+                    self._set(price, source)
+                    self._write_shared(price)
+                    return True
+            print("[SOL_PRICE] ⚠️ Could not refresh SOL price from any source", flush=True)
+            return False
+
+    def _fetch_coingecko(self) -> float:
+        resp = requests.get(COINGECKO_URL, params={"ids": "solana", "vs_currencies": "usd"}, timeout=3)
+        if resp.status_code != 200:
+            return 0.0
+        return float((resp.json().get("solana") or {}).get("usd") or 0)
+
+    def _fetch_jupiter(self) -> float:
+        from app.jupiter_client import get_jupiter_client
+        result = get_jupiter_client().get_quote(
+            input_mint=SOL_MINT,
+            output_mint=USDC_MINT,
+            amount=1000000000,  # 1 SOL
+            slippage_bps=50,
+            timeout=3.0,
+            lane="poll",
+        )
+        if result.get("status_code") != 200 or not result.get("json"):
+            return 0.0
+        return float(result["json"].get("outAmount", 0)) / 1e6  # USDC has 6 decimals
+
+    def _read_shared(self) -> Optional[Tuple[float, float]]:
+        if self.redis is None:
+            return None
+        try:
+            raw = self.redis.get(REDIS_KEY)
+            if not raw:
+                return None
+            data = json.loads(raw)
+            return float(data["price"]), float(data["ts"])
+        except Exception:
+            return None
+
+    def _write_shared(self, price: float) -> None:
+        if self.redis is None:
+            return
+        try:
+            ttl = max(int(self.max_age_sec), int(self.refresh_interval_sec) * 2, 1)
+            self.redis.set(REDIS_KEY, json.dumps({"price": price, "ts": time.time()}), ex=ttl)
+        except Exception:
+            pass
+
+    # ---- background thread ----
+
+    def start(self) -> None:
+        """Start the refresher (idempotent); the first refresh runs synchronously if no price is known"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self._snapshot[0] <= 0:
+            self.refresh()
+        with self._refresh_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sol-price-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval_sec):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[SOL_PRICE] ⚠️ Refresh error: {e}", flush=True)
+
+
+_service: Optional[SolPriceService] = None
+_service_lock = threading.Lock()
+
+
+def get_sol_price_service() -> SolPriceService:
+    """Get or create the process-wide SOL price service (started on first use)"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = SolPriceService(redis_client=_redis_client())
+    _service.start()
+    return _service
+
+
+def get_sol_price(default: float = 0.0) -> float:
+    """Latest SOL/USD price from memory (`default` if the service never got one)"""
+    return get_sol_price_service().price(default)
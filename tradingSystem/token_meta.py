@@ -0,0 +1,245 @@
+"""
+Persistent mint -> decimals index shared by the broker and the price oracle.
+
+Decimals never change for a mint, so they are kept in a small SQLite table and
+loaded into memory at startup. A miss is resolved with one targeted lookup
+(RPC getTokenSupply, then Jupiter's single-token endpoint) and written back;
+the full Jupiter token list is only downloaded by a background refresh.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import requests
+
+from app.http_client import request_json
+from .config_optimized import (
+    RPC_URL,
+    TOKEN_META_DB_PATH,
+    TOKEN_LIST_URL,
+    TOKEN_LIST_REFRESH_SEC,
+)
+
+
+DEFAULT_DECIMALS = 6  # pump.fun and most SPL memecoins
+# Fast-path for common mints to avoid network and wrong defaults
+KNOWN_DECIMALS: Dict[str, int] = {
+    # SOL (wSOL)
+    "So11111111111111111111111111111111111111112": 9,
+    # USDC
+    "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v": 6,
+    # USDT
+    "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB": 6,
+    # BONK
+    "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263": 5,
+}
+TOKEN_LOOKUP_URL = "https://tokens.jup.ag/token/{mint}"
+MISS_RETRY_SEC = 300.0  # how long an unresolved mint keeps the default before we ask again
+
+
+class MintDecimalsIndex:
+    """In-memory decimals map backed by a SQLite table"""
+
+    def __init__(self, path: str = TOKEN_META_DB_PATH, rpc_url: str = RPC_URL,
+                 list_url: str = TOKEN_LIST_URL, refresh_interval_sec: float = TOKEN_LIST_REFRESH_SEC):
+        self.path = path
+        self.rpc_url = rpc_url
+        self.list_url = list_url
+        self.refresh_interval_sec = float(refresh_interval_sec)
+        self._lock = threading.Lock()
+        self._decimals: Dict[str, int] = dict(KNOWN_DECIMALS)
+        self._misses: Dict[str, float] = {}  # mint -> time of the failed lookup
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._load()
+
+    # ---- storage ----
+
+    def _conn(self) -> sqlite3.Connection:
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS mint_decimals ("
+            "mint TEXT PRIMARY KEY, decimals INTEGER NOT NULL, source TEXT, updated_at REAL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        return conn
+
+    def _load(self) -> None:
+        try:
+            conn = self._conn()
+            try:
+                rows = conn.execute("SELECT mint, decimals FROM mint_decimals").fetchall()
+            finally:
+                conn.close()
+            with self._lock:
+                for mint, dec in rows:
+                    self._decimals.setdefault(str(mint), int(dec))
+        except Exception as e:
+            print(f"[TOKEN_META] ⚠️ Could not load decimals index {self.path}: {e}", flush=True)
+
+    def _store(self, rows: Iterable[Tuple[str, int]], source: str, mark_refreshed: bool = False) -> int:
+        now = time.time()
+        batch = [(mint, int(dec), source, now) for mint, dec in rows]
+        conn = self._conn()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO mint_decimals(mint, decimals, source, updated_at) VALUES (?,?,?,?)",
+                batch,
+            )
+            if mark_refreshed:
+                conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('list_refreshed_at', ?)", (str(now),))
+            conn.commit()
+        finally:
+            conn.close()
+        return len(batch)
+
+    def last_refresh(self) -> float:
+        try:
+            conn = self._conn()
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE key='list_refreshed_at'").fetchone()
+            finally:
+                conn.close()
+            return float(row[0]) if row else 0.0
+        except Exception:
+            return 0.0
+
+    # ---- lookups ----
+
+    def get(self, mint: str) -> Optional[int]:
+        """Decimals from the index only (no network)"""
+        with self._lock:
+            return self._decimals.get(mint)
+
+    def decimals(self, mint: str, default: int = DEFAULT_DECIMALS) -> int:
+        """Decimals for `mint`, resolving a miss with one targeted lookup"""
+        with self._lock:
+            dec = self._decimals.get(mint)
+            if dec is not None:
+                return dec
+            missed_at = self._misses.get(mint)
+        if missed_at is not None and time.time() - missed_at < MISS_RETRY_SEC:
+            return default
+
+        dec, source = self._lookup(mint)
+        if dec is None:
+            with self._lock:
+                self._misses[mint] = time.time()
+            return default
+        with self._lock:
+            self._decimals[mint] = dec
+            self._misses.pop(mint, None)
+        try:
+            self._store([(mint, dec)], source)
+        except Exception as e:
+            print(f"[TOKEN_META] ⚠️ Failed to persist decimals for {mint[:8]}: {e}", flush=True)
+        return dec
+
+    def _lookup(self, mint: str) -> Tuple[Optional[int], str]:
+        dec = self._lookup_rpc(mint)
+        if dec is not None:
+            return dec, "rpc"
+        dec = self._lookup_jupiter(mint)
+        if dec is not None:
+            return dec, "jupiter"
+        return None, ""
+
+    def _lookup_rpc(self, mint: str) -> Optional[int]:
+        """getTokenSupply carries the mint's decimals and works for brand-new mints"""
+        if not self.rpc_url:
+            return None
+        try:
+            resp = requests.post(
+                self.rpc_url,
+                json={"jsonrpc": "2.0", "id": 1, "method": "getTokenSupply", "params": [mint]},
+                timeout=5,
+            )
+            if resp.status_code != 200:
+                return None
+            value = ((resp.json() or {}).get("result") or {}).get("value") or {}
+            dec = value.get("decimals")
+            return int(dec) if dec is not None else None
+        except Exception:
+            return None
+
+    def _lookup_jupiter(self, mint: str) -> Optional[int]:
+        try:
+            r = request_json("GET", TOKEN_LOOKUP_URL.format(mint=mint), timeout=5.0)
+            if r.get("status_code") != 200:
+                return None
+            dec = (r.get("json") or {}).get("decimals")
+            return int(dec) if dec is not None else None
+        except Exception:
+            return None
+
+    # ---- bulk refresh (background only) ----
+
+    def refresh_all(self) -> int:
+        """Download the full token list and upsert every mint; returns rows written"""
+        r = request_json("GET", self.list_url, timeout=60.0)
+        if r.get("status_code") != 200:
+            raise RuntimeError(f"token list fetch failed: {r.get('status_code') or r.get('error')}")
+        rows = {}
+        for item in r.get("json") or []:
+            try:
+                mint = item.get("address")
+                dec = item.get("decimals")
+                if mint and dec is not None:
+                    rows[str(mint)] = int(dec)
+            except Exception:
+                continue
+        written = self._store(rows.items(), "list", mark_refreshed=True)
+        with self._lock:
+            self._decimals.update(rows)
+            self._decimals.update(KNOWN_DECIMALS)
+        print(f"[TOKEN_META] Refreshed decimals index: {written} mints", flush=True)
+        return written
+
+    def start_background_refresh(self) -> None:
+        """Refresh the full list in a daemon thread whenever it is older than the refresh interval"""
+        if self.refresh_interval_sec <= 0:
+            return
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh_loop, name="token-meta-refresh", daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            wait = self.refresh_interval_sec - (time.time() - self.last_refresh())
+            if wait <= 0:
+                try:
+                    self.refresh_all()
+                    wait = self.refresh_interval_sec
+                except Exception as e:
+                    print(f"[TOKEN_META] ⚠️ Token list refresh failed: {e}", flush=True)
+                    wait = min(self.refresh_interval_sec, 600.0)
+            time.sleep(max(1.0, wait))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._decimals)
+
+
+_index: Optional[MintDecimalsIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_decimals_index() -> MintDecimalsIndex:
+    """Get or create the process-wide decimals index (starts the background list refresh)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = MintDecimalsIndex()
+                _index.start_background_refresh()
+    return _index
+
+
+def get_decimals(mint: str, default: int = DEFAULT_DECIMALS) -> int:
+    return get_decimals_index().decimals(mint, default)
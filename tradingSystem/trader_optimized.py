@@ -10,18 +10,17 @@ import os
 import time
 import threading
 from datetime import datetime, date
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 
-from .db import (
-    init as db_init, create_position, add_fill, update_peak_and_trail,
-    close_position, get_open_qty
-)
+from .db import init as db_init
+from .position_book import get_position_book
 from .config_optimized import (
     STOP_LOSS_PCT, LOG_JSON_PATH, LOG_TEXT_PATH,
-    MAX_CONCURRENT, BANKROLL_USD, DB_PATH, MAX_HOLD_TIME_SECONDS,
+    MAX_CONCURRENT, BANKROLL_USD, MAX_HOLD_TIME_SECONDS,
     EMERGENCY_HARD_STOP_PCT
 )
 from .broker_optimized import Broker
+from app.latency_trace import TRADER_POINTS, record_hops, stamp
 from .portfolio_manager import get_portfolio_manager, should_use_portfolio_manager
 from .inactivity_monitor import InactivityMonitor
 
@@ -45,6 +44,8 @@ class TradeEngine:
     def __init__(self) -> None:
         db_init()
         self.broker = Broker()
+        # Authoritative open-position state; the exit path reads it instead of SQLite
+        self.book = get_position_book()
         self.live: Dict[str, Dict[str, object]] = {}
         self._position_locks = PositionLock()
         
@@ -56,6 +57,9 @@ class TradeEngine:
         self._cooldown_lock = threading.Lock()
         self._cooldown_seconds = float(os.getenv("TS_REBUY_COOLDOWN_SEC", "14400"))  # Default: 4 hours
         
+        # Exit loop wake-up hook (set by the exit scheduler): makes a position due now
+        self.exit_wakeup: Optional[Callable[[Optional[str]], None]] = None
+        
         os.makedirs(os.path.dirname(LOG_JSON_PATH), exist_ok=True)
         os.makedirs(os.path.dirname(LOG_TEXT_PATH), exist_ok=True)
         
@@ -64,36 +68,28 @@ class TradeEngine:
     def _recover_positions(self):
         """Recover open positions from database"""
         try:
-            import sqlite3
             from datetime import datetime
-            con = sqlite3.connect(DB_PATH)
-            cur = con.execute("""
-                SELECT id, token_address, strategy, entry_price, peak_price, open_at 
-                FROM positions 
-                WHERE status='open'
-            """)
-            rows = cur.fetchall()
-            
-            for pid, ca, strategy, entry_price, peak_price, open_at in rows:
+            for pos in self.book.load():
+                open_at = pos.get("open_at")
                 # Parse open_at timestamp for entry_time
                 try:
                     if open_at:
                         # Try parsing as ISO format first
-                        entry_time = datetime.fromisoformat(open_at.replace('Z', '+00:00')).timestamp()
+                        entry_time = datetime.fromisoformat(str(open_at).replace('Z', '+00:00')).timestamp()
                     else:
                         entry_time = time.time()
                 except:
                     entry_time = time.time()  # Fallback to now if parsing fails
                 
-                self.live[str(ca)] = {
-                    "pid": int(pid),
-                    "strategy": str(strategy),
-                    "entry_price": float(entry_price or 0),
-                    "peak_price": float(peak_price or entry_price or 0),
+                self.live[str(pos["token"])] = {
+                    "pid": int(pos["pid"]),
+                    "strategy": str(pos["strategy"]),
+                    "entry_price": float(pos["entry_price"] or 0),
+                    "peak_price": float(pos["peak_price"] or pos["entry_price"] or 0),
                     "entry_time": entry_time,  # For adaptive monitoring
                     "open_at": entry_time,     # For time-based exits
                 }
-            con.close()
+            self.book.start()
             if self.live:
                 self._log("recovery_loaded", open_positions=len(self.live), positions=list(self.live.keys()))
         except Exception as e:
@@ -115,8 +111,19 @@ class TradeEngine:
         except Exception:
             pass
 
+    def request_exit_check(self, token: Optional[str] = None) -> None:
+        """Ask the exit loop to check `token` now (e.g. a new position); None just wakes it"""
+        hook = self.exit_wakeup
+        if hook is not None:
+            try:
+                hook(token)
+            except Exception:
+                pass
+
     def open_position(self, token: str, plan: Dict) -> Optional[int]:
         """Open position with comprehensive safety"""
+        trace = plan.get("trace")
+        stamp(trace, "opening")
         try:
             print(f"[TRADER] open_position called for {token[:8]}...", flush=True)
             
@@ -145,6 +152,11 @@ class TradeEngine:
                 # Execute buy
                 fill = self.broker.market_buy(token, usd)
                 print(f"[TRADER] market_buy returned: success={fill.success}", flush=True)
+                if fill.success and trace:
+                    stamp(trace, "filled")
+                    hops = record_hops(trace, TRADER_POINTS, "trader", token=token)
+                    if hops:
+                        self._log("signal_latency", token=token, trace_id=trace.get("id"), hops=hops)
                 
                 if not fill.success:
                     self._log("open_failed_buy", token=token, error=fill.error)
@@ -154,11 +166,11 @@ class TradeEngine:
                 # If DB write fails, we log it prominently but the transaction already happened
                 try:
                     print(f"[TRADER] Creating position record in database...", flush=True)
-                    pid = create_position(token, strategy, fill.price, fill.qty, usd, trail_pct)
+                    pid = self.book.create_position(token, strategy, fill.price, fill.qty, usd, trail_pct)
                     print(f"[TRADER] ✅ Position #{pid} created", flush=True)
                     
                     print(f"[TRADER] Adding fill record...", flush=True)
-                    add_fill(pid, "buy", fill.price, fill.qty, fill.usd)
+                    self.book.add_fill(pid, "buy", fill.price, fill.qty, fill.usd)
                     print(f"[TRADER] ✅ Fill recorded", flush=True)
                     
                 except Exception as db_error:
@@ -187,6 +199,7 @@ class TradeEngine:
                 }
                 
                 print(f"[TRADER] ✅ Position fully tracked and ready for monitoring", flush=True)
+                self.request_exit_check(token)
                 self._log("open_position", 
                          token=token, strategy=strategy, pid=pid, 
                          price=fill.price, qty=fill.qty, usd=usd, 
@@ -296,7 +309,7 @@ class TradeEngine:
                 entry_price = float(entry_price)
                 
                 # Update peak and get PROFIT-BASED trail stop (MOONSHOT MODE!)
-                peak, trail = update_peak_and_trail(pid, price, entry_price)
+                peak, trail = self.book.update_peak_and_trail(pid, price, entry_price)
                 
                 # Validate database returns
                 if peak <= 0 or trail <= 0:
@@ -394,11 +407,11 @@ class TradeEngine:
                     return False
                 
                 # Execute sell
-                qty_open = get_open_qty(int(pid))
+                qty_open = self.book.get_open_qty(int(pid))
                 if qty_open <= 0:
                     self._log("exit_zero_qty", token=token, pid=pid)
                     self.live.pop(token, None)
-                    close_position(pid)
+                    self.book.close_position(pid)
                     return False
                 
                 # Update last attempt time
@@ -416,7 +429,7 @@ class TradeEngine:
                     if "RUG_DETECTED" in str(fill.error) or "No liquidity" in str(fill.error):
                         print(f"[TRADER] 🚨 RUGGED TOKEN DETECTED: {token[:8]} - force closing", flush=True)
                         # Close position in DB (can't sell, but remove from tracking)
-                        close_position(pid)
+                        self.book.close_position(pid)
                         self.live.pop(token, None)
                         self._log("rugged_token_closed", token=token, pid=pid, error=fill.error)
                         return True  # Return True so position is removed
@@ -437,7 +450,7 @@ class TradeEngine:
                         
                         if sell_failures + 1 >= max_failures:
                             print(f"[TRADER] 🚨 FORCE CLOSING: {token[:8]} after {sell_failures + 1} failures (profit: {profit_pct:.1f}%)", flush=True)
-                            close_position(pid)
+                            self.book.close_position(pid)
                             self.live.pop(token, None)
                             self.inactivity_monitor.reset_position(token)
                             self._log("force_closed_stuck_position", token=token, pid=pid, failures=sell_failures + 1, profit_pct=profit_pct, error=fill.error)
@@ -463,8 +476,8 @@ class TradeEngine:
                 pnl_pct = (pnl_usd / entry_usd * 100) if entry_usd > 0 else 0
                 
                 # Update database
-                add_fill(int(pid), "sell", float(fill.price), float(fill.qty), float(fill.usd))
-                close_position(pid)
+                self.book.add_fill(int(pid), "sell", float(fill.price), float(fill.qty), float(fill.usd))
+                self.book.close_position(pid)
                 
                 # Remove from live and clean up monitors
                 self.live.pop(token, None)
@@ -499,19 +512,19 @@ class TradeEngine:
             if not pid:
                 return False
             
-            qty_open = get_open_qty(int(pid))
+            qty_open = self.book.get_open_qty(int(pid))
             
             if qty_open <= 0:
                 self.live.pop(token, None)
-                close_position(pid)
+                self.book.close_position(pid)
                 return False
             
             # Try to sell at market (any price)
             fill = self.broker.market_sell(token, float(qty_open))
             
             if fill.success:
-                add_fill(int(pid), "sell", float(fill.price), float(fill.qty), float(fill.usd))
-                close_position(pid)
+                self.book.add_fill(int(pid), "sell", float(fill.price), float(fill.qty), float(fill.usd))
+                self.book.close_position(pid)
                 self.live.pop(token, None)
                 self._add_cooldown(token)
                 self._log("emergency_exit", token=token, reason=reason, pid=pid, usd=fill.usd)
@@ -519,7 +532,7 @@ class TradeEngine:
                 return True
             else:
                 # Even sell failed - close in DB anyway to prevent infinite loop
-                close_position(pid)
+                self.book.close_position(pid)
                 self.live.pop(token, None)
                 self._log("emergency_exit_failed", token=token, reason=reason, error=fill.error)
                 print(f"[TRADER] ⚠️ EMERGENCY EXIT FAILED: {token[:8]} - {fill.error}", flush=True)
@@ -580,8 +593,7 @@ class TradeEngine:
                     return False
                 
                 # Get quantity and sell directly
-                from .db import get_open_qty, add_fill, close_position
-                qty_open = get_open_qty(int(pid))
+                qty_open = self.book.get_open_qty(int(pid))
                 if qty_open <= 0:
                     self._log("rebalance_failed", reason="zero_qty", token=token_to_sell)
                     return False
@@ -593,8 +605,8 @@ class TradeEngine:
                     return False
                 
                 # Update database
-                add_fill(int(pid), "sell", float(fill.price), float(fill.qty), float(fill.usd))
-                close_position(pid)
+                self.book.add_fill(int(pid), "sell", float(fill.price), float(fill.qty), float(fill.usd))
+                self.book.close_position(pid)
                 
                 # Remove from live
                 self.live.pop(token_to_sell, None)
@@ -631,7 +643,7 @@ class TradeEngine:
             pm.add_position(
                 token_address=new_token,
                 entry_price=self.live[new_token]["entry_price"],
-                quantity=get_open_qty(new_token) or 0,
+                quantity=self.book.get_open_qty_by_token(new_token) or 0,
                 signal_score=new_plan.get("score", 5),
                 conviction_score=new_plan.get("conviction_score", 0),
                 name=new_plan.get("name", ""),
@@ -661,7 +673,7 @@ class TradeEngine:
                         continue
                     
                     # Get the actual quantity from the database
-                    qty = get_open_qty(pid)
+                    qty = self.book.get_open_qty(pid)
                     
                     pm.add_position(
                         token_address=token,
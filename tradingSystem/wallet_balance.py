@@ -9,7 +9,6 @@ import base58 as b58
 from solana.rpc.api import Client as SolanaClient
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
-import requests
 from typing import Optional
 
 
@@ -76,15 +75,11 @@ def get_wallet_balance_usd(rpc_url: str, wallet_secret: str, usdc_mint: str) ->
 
 
 def get_sol_price_usd() -> float:
-    """Get current SOL price in USD"""
+    """Get current SOL price in USD (shared price service)"""
     try:
-        # Try CoinGecko (free, no API key)
-        resp = requests.get(
-            "https://api.coingecko.com/api/v3/simple/price?ids=solana&vs_currencies=usd",
-            timeout=5
-        )
-        if resp.status_code == 200:
-            price = float(resp.json()["solana"]["usd"])
+        from .sol_price import get_sol_price
+        price = get_sol_price()
+        if price > 0:
             return price
     except Exception:
         pass
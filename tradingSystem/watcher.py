@@ -2,7 +2,7 @@ import re
 import time
 import json
 import os
-from typing import Iterator, Dict
+from typing import Iterator, Dict, Optional
 
 # Legacy stdout log path (deprecated - use Redis instead)
 BOT_STDOUT_LOG = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "logs", "stdout.log")
@@ -34,11 +34,74 @@ def _valid_ca(ca: str) -> bool:
 	return bool(_BASE58_RE.match(ca))
 
 
+def _normalize_signal(signal: Dict, processed_tokens: set) -> Optional[Dict]:
+	"""Apply staleness/duplicate filters and map a bot signal to the trader format.
+	
+	Returns None when the signal should be skipped.
+	"""
+	# Get token and timestamp
+	token = signal.get("token", "unknown")
+	# Try both 'timestamp' and 'ts' fields, parse ISO format if needed
+	signal_time = signal.get("timestamp") or signal.get("ts")
+	if signal_time and isinstance(signal_time, str):
+		try:
+			from datetime import datetime
+			dt = datetime.fromisoformat(signal_time.replace('Z', '+00:00'))
+			signal_time = dt.timestamp()
+		except:
+			signal_time = time.time()  # Assume fresh if parse fails
+	elif not signal_time:
+		signal_time = time.time()  # Assume fresh if no timestamp
+	age_seconds = time.time() - signal_time
+	
+	# Skip if this signal is too old (>10 minutes) to prevent stale trades
+	if age_seconds > 600:  # 10 minutes
+		print(f"[DEBUG] Skipping stale signal: {token[:8]}... (age: {age_seconds/60:.1f} minutes)", flush=True)
+		return None
+	
+	# Skip true duplicates (same token seen recently)
+	if token in processed_tokens:
+		print(f"[DEBUG] Skipping duplicate signal: {token[:8]}...", flush=True)
+		return None
+	
+	# Add to processed set (keep last 1000 to prevent memory bloat)
+	processed_tokens.add(token)
+	if len(processed_tokens) > 1000:
+		processed_tokens.pop()  # Remove oldest
+	
+	print(f"[DEBUG] Processing fresh signal: {token[:8]}... (age: {age_seconds:.0f}s)", flush=True)
+	
+	# Carry the bot's latency trace forward and stamp when the trader read it
+	trace = signal.get("trace") if isinstance(signal.get("trace"), dict) else None
+	if trace is not None:
+		trace.setdefault("ts", {})["dequeued"] = time.time()
+	
+	# Normalize to format expected by paper trader
+	return {
+		"type": "signal",
+		"ca": signal.get("token"),
+		"score": signal.get("final_score"),  # Use final_score from worker
+		"final_score": signal.get("final_score"),  # Also include as final_score
+		"conviction_type": signal.get("conviction_type"),
+		"price": signal.get("price"),
+		"market_cap": signal.get("market_cap"),
+		"liquidity": signal.get("liquidity"),
+		"volume_24h": signal.get("volume_24h"),
+		"change_1h": signal.get("change_1h"),
+		"smart_money_detected": signal.get("smart_money_detected"),
+		"timestamp": signal_time,
+		"trace_id": signal.get("trace_id"),
+		"trace": trace,
+	}
+
+
 def follow_signals_redis(block_timeout: int = 5) -> Iterator[Dict]:
 	"""Yield trading signals from Redis in real-time (BLOCKING).
 	
 	This is the preferred method for paper/live trading as it receives
-	signals immediately when the worker bot finds them.
+	signals immediately when the worker bot finds them. With
+	SIGNAL_TRANSPORT=stream|both this reads the Redis Stream through a
+	consumer group (see follow_signals_stream); otherwise it BRPOPs the list.
 	
 	Args:
 		block_timeout: Seconds to wait for new signals (default: 5s)
@@ -49,6 +112,11 @@ def follow_signals_redis(block_timeout: int = 5) -> Iterator[Dict]:
 	if _redis_client is None:
 		raise RuntimeError("Redis not available. Cannot follow signals.")
 	
+	from app.config_unified import SIGNAL_TRANSPORT
+	if SIGNAL_TRANSPORT in ("stream", "both"):
+		yield from follow_signals_stream(block_timeout=block_timeout)
+		return
+	
 	print(f"📡 Watching Redis for trading signals (blocking mode, timeout={block_timeout}s)...")
 	
 	# Track processed signals to avoid true duplicates
@@ -67,55 +135,9 @@ def follow_signals_redis(block_timeout: int = 5) -> Iterator[Dict]:
 			_, payload = result
 			signal = json.loads(payload)
 			
-			# Get token and timestamp
-			token = signal.get("token", "unknown")
-			# Try both 'timestamp' and 'ts' fields, parse ISO format if needed
-			signal_time = signal.get("timestamp") or signal.get("ts")
-			if signal_time and isinstance(signal_time, str):
-				try:
-					from datetime import datetime
-					dt = datetime.fromisoformat(signal_time.replace('Z', '+00:00'))
-					signal_time = dt.timestamp()
-				except:
-					signal_time = time.time()  # Assume fresh if parse fails
-			elif not signal_time:
-				signal_time = time.time()  # Assume fresh if no timestamp
-			age_seconds = time.time() - signal_time
-			
-			# Skip if this signal is too old (>10 minutes) to prevent stale trades
-			if age_seconds > 600:  # 10 minutes
-				print(f"[DEBUG] Skipping stale signal: {token[:8]}... (age: {age_seconds/60:.1f} minutes)", flush=True)
-				continue
-			
-			# Skip true duplicates (same token seen recently)
-			if token in processed_tokens:
-				print(f"[DEBUG] Skipping duplicate signal: {token[:8]}...", flush=True)
-				continue
-			
-			# Add to processed set (keep last 1000 to prevent memory bloat)
-			processed_tokens.add(token)
-			if len(processed_tokens) > 1000:
-				processed_tokens.pop()  # Remove oldest
-			
-			print(f"[DEBUG] Processing fresh signal: {token[:8]}... (age: {age_seconds:.0f}s)", flush=True)
-			
-			# Normalize to format expected by paper trader
-			normalized = {
-				"type": "signal",
-				"ca": signal.get("token"),
-				"score": signal.get("final_score"),  # Use final_score from worker
-				"final_score": signal.get("final_score"),  # Also include as final_score
-				"conviction_type": signal.get("conviction_type"),
-				"price": signal.get("price"),
-				"market_cap": signal.get("market_cap"),
-				"liquidity": signal.get("liquidity"),
-				"volume_24h": signal.get("volume_24h"),
-				"change_1h": signal.get("change_1h"),
-				"smart_money_detected": signal.get("smart_money_detected"),
-				"timestamp": signal_time,
-			}
-			
-			yield normalized
+			normalized = _normalize_signal(signal, processed_tokens)
+			if normalized is not None:
+				yield normalized
 			
 		except json.JSONDecodeError as e:
 			print(f"⚠️ Invalid JSON signal in Redis: {e}")
@@ -126,6 +148,54 @@ def follow_signals_redis(block_timeout: int = 5) -> Iterator[Dict]:
 			continue
 
 
+def follow_signals_stream(block_timeout: int = 5, client=None, consumer: Optional[str] = None) -> Iterator[Dict]:
+	"""Yield trading signals from the Redis Stream via a consumer group (BLOCKING).
+	
+	Each entry is acked only once the caller has finished with it, i.e. when
+	the generator is resumed for the next signal. A trader that crashes
+	mid-signal leaves it pending, and the next consumer in the group reclaims it
+	after SIGNAL_STREAM_CLAIM_IDLE_MS. Skipped (stale/duplicate/invalid) entries
+	are acked immediately.
+	"""
+	from app.config_unified import (
+		SIGNAL_STREAM_KEY, SIGNAL_STREAM_GROUP, SIGNAL_STREAM_CONSUMER, SIGNAL_STREAM_CLAIM_IDLE_MS,
+	)
+	from app.signal_stream import SignalStreamConsumer
+	
+	client = client if client is not None else _redis_client
+	if client is None:
+		raise RuntimeError("Redis not available. Cannot follow signals.")
+	reader = SignalStreamConsumer(
+		client,
+		SIGNAL_STREAM_KEY,
+		SIGNAL_STREAM_GROUP,
+		consumer=consumer or SIGNAL_STREAM_CONSUMER or None,
+		block_ms=int(block_timeout * 1000),
+		claim_idle_ms=SIGNAL_STREAM_CLAIM_IDLE_MS,
+	)
+	print(f"📡 Watching Redis stream {SIGNAL_STREAM_KEY} (group={reader.group}, consumer={reader.consumer})...")
+	
+	processed_tokens = set()
+	
+	while True:
+		try:
+			entries = reader.read()
+		except Exception as e:
+			print(f"⚠️ Redis stream read error: {e}")
+			time.sleep(2)
+			continue
+		for entry_id, signal in entries:
+			normalized = _normalize_signal(signal, processed_tokens) if signal is not None else None
+			if signal is None:
+				print(f"⚠️ Invalid signal payload in stream entry {entry_id}")
+			if normalized is not None:
+				yield normalized
+			try:
+				reader.ack(entry_id)
+			except Exception as e:
+				print(f"⚠️ Redis stream ack failed for {entry_id}: {e}")
+
+
 def follow_decisions(start_at_end: bool = True) -> Iterator[Dict[str, str]]:
 	"""Yield normalized events from stdout.log in near-real-time (LEGACY).
 	